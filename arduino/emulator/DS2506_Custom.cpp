@@ -8,13 +8,30 @@
   static inline void    eeUpdate(uint16_t a, uint8_t v) { eeprom_update_byte((uint8_t*)a, v); }
 #endif
 
-// ---- Page-Mapping (wie gehabt) ----
-struct PageMapEntry { uint8_t logical; uint8_t physical; };
-static const PageMapEntry pageMap[DS2506_Custom::PHYS_PAGES] PROGMEM = {
-    {  0, 0 }, { 16, 1 }, { 30, 2 }, { 38, 3 },
-    { 48, 4 }, { 56, 5 }, { 63, 6 }, { 64, 7 },
+// ---- 0xFF-Block für leere Pages (READ MEMORY) ----
+static const uint8_t ffPage[DS2506_Custom::PAGE_SIZE] = {
+    0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF, 0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
+    0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF, 0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
 };
 
+// ---- Page aus image_blob entpacken (Kodierung siehe ds2506_image.h) ----
+static void decodePage(uint16_t off, uint8_t* dst)
+{
+    uint8_t n = 0;
+    while (n < DS2506_Custom::PAGE_SIZE) {
+        const uint8_t c = pgm_read_byte(&image_blob[off++]);
+        uint8_t len = (c & 0x7F) + 1;
+        if (len > DS2506_Custom::PAGE_SIZE - n) len = DS2506_Custom::PAGE_SIZE - n;
+        if (c & 0x80) {
+            memset(dst + n, 0xFF, len);
+        } else {
+            memcpy_P(dst + n, &image_blob[off], len);
+            off += len;
+        }
+        n += len;
+    }
+}
+
 // ---- CRC (invertiert) senden, ohne CRC-Akkumulator zu beeinflussen ----
 void DS2506_Custom::sendCrc16Raw(OneWireHub* hub, uint16_t crc)
 {
@@ -35,49 +52,85 @@ DS2506_Custom::DS2506_Custom(uint8_t ID1, uint8_t ID2, uint8_t ID3,
 #if DS2506_USE_EEPROM
     // Boot: möglichst flott präsent sein
     if (eepromLooksBlank()) {
-        // Werksabbild (aus Flash) direkt in den RAM spiegeln
-        memcpy_P(&memory[0 * PAGE_SIZE], page_0000, PAGE_SIZE);
-        memcpy_P(&memory[1 * PAGE_SIZE], page_0200, PAGE_SIZE);
-        memcpy_P(&memory[2 * PAGE_SIZE], page_03C0, PAGE_SIZE);
-        memcpy_P(&memory[3 * PAGE_SIZE], page_04C0, PAGE_SIZE);
-        memcpy_P(&memory[4 * PAGE_SIZE], page_0600, PAGE_SIZE);
-        memcpy_P(&memory[5 * PAGE_SIZE], page_0700, PAGE_SIZE);
-        memcpy_P(&memory[6 * PAGE_SIZE], page_07E0, PAGE_SIZE);
-        memcpy_P(&memory[7 * PAGE_SIZE], page_0800, PAGE_SIZE);
-        memcpy_P(status_ram, status_mem, STATUS_SIZE_EMU);
+        // Werkszustand (aus Flash), Daten liest duty() ohnehin von dort
+        loadImageToRAM();
     } else {
         loadFromEEPROMToRAM();
     }
 #else
-    memcpy_P(&memory[0 * PAGE_SIZE], page_0000, PAGE_SIZE);
-    memcpy_P(&memory[1 * PAGE_SIZE], page_0200, PAGE_SIZE);
-    memcpy_P(&memory[2 * PAGE_SIZE], page_03C0, PAGE_SIZE);
-    memcpy_P(&memory[3 * PAGE_SIZE], page_04C0, PAGE_SIZE);
-    memcpy_P(&memory[4 * PAGE_SIZE], page_0600, PAGE_SIZE);
-    memcpy_P(&memory[5 * PAGE_SIZE], page_0700, PAGE_SIZE);
-    memcpy_P(&memory[6 * PAGE_SIZE], page_07E0, PAGE_SIZE);
-    memcpy_P(&memory[7 * PAGE_SIZE], page_0800, PAGE_SIZE);
-    memcpy_P(status_ram, status_mem, STATUS_SIZE_EMU);
+    loadImageToRAM();
 #endif
 }
 
-// ---- Mapping ----
-int8_t DS2506_Custom::logicalToPhysicalPage(uint8_t logicalPage)
+// ---- Werkszustand: Status PROGMEM -> RAM, nichts beschrieben ----
+void DS2506_Custom::loadImageToRAM()
 {
-    for (uint8_t i=0;i<PHYS_PAGES;i++) {
-        PageMapEntry e; memcpy_P(&e, &pageMap[i], sizeof(e));
-        if (e.logical == logicalPage) return (int8_t)e.physical;
-    }
+    memcpy_P(status_ram, status_mem, STATUS_SIZE_EMU);
+    ovlCount_ = 0;
+}
+
+// ---- Seiteninhalt ----
+int8_t DS2506_Custom::overlaySlot(uint8_t page) const
+{
+    for (uint8_t i=0;i<ovlCount_;i++) if (ovlPage_[i] == page) return int8_t(i);
     return -1;
 }
-uint16_t DS2506_Custom::mapAddressToPhysical(uint16_t dsAddr) const
+const uint8_t* DS2506_Custom::pageData(uint8_t page, uint8_t* buf) const
+{
+    const int8_t slot = overlaySlot(page);
+    if (slot >= 0) return ovlData_[slot];
+    const uint16_t off = pgm_read_word(&page_index[page]);
+    if (off == BLANK_PAGE) return ffPage;
+    decodePage(off, buf);
+    return buf;
+}
+
+#if DS2506_ENABLE_WRITE
+// ---- OTP-Write: Page beim ersten echten Brennen ins Overlay kopieren ----
+bool DS2506_Custom::programDataByte(uint16_t dsAddr, uint8_t newVal)
+{
+    const uint8_t page = uint8_t(dsAddr >> 5);
+    const uint8_t off  = uint8_t(dsAddr & PAGE_MASK);
+    if (!pageWritable(page)) return false;
+
+    uint8_t buf[PAGE_SIZE];
+    const uint8_t* cur    = pageData(page, buf);
+    const uint8_t  burned = cur[off] & newVal;
+    if (burned == cur[off]) return true;        // nichts zu brennen
+
+    int8_t slot = overlaySlot(page);
+    if (slot < 0) {
+        if (ovlCount_ >= OVERLAY_PAGES) return false;
+        slot = int8_t(ovlCount_++);
+        ovlPage_[slot] = page;
+        memcpy(ovlData_[slot], cur, PAGE_SIZE);
+#if DS2506_USE_EEPROM
+        markDataDirty(0);                                   // Anzahl
+        markDataDirty(1 + slot);                            // Page-Nummer
+        markDataDirty(ovlDataIndex(slot, PAGE_SIZE - 1));   // ganze Kopie
+#endif
+    }
+    ovlData_[slot][off] = burned;                // RAM sofort
+#if DS2506_USE_EEPROM
+    markDataDirty(ovlDataIndex(slot, off));      // EEPROM später
+#endif
+    return true;
+}
+
+bool DS2506_Custom::programStatusByte(uint16_t dsAddr, uint8_t newVal)
 {
-    const uint8_t logical = uint8_t(dsAddr >> 5);
-    const uint8_t off     = uint8_t(dsAddr & PAGE_MASK);
-    const int8_t phys     = logicalToPhysicalPage(logical);
-    if (phys < 0) return 0xFFFF;
-    return uint16_t(phys) * PAGE_SIZE + off;
+    if (dsAddr >= STATUS_SIZE_EMU) return false;
+    const uint8_t old    = status_ram[dsAddr];
+    const uint8_t burned = old & newVal;
+    if (burned != old) {
+        status_ram[dsAddr] = burned;             // RAM sofort
+#if DS2506_USE_EEPROM
+        markStatDirty(dsAddr);                   // EEPROM später
+#endif
+    }
+    return true;
 }
+#endif // DS2506_ENABLE_WRITE
 
 // ---- Hauptdienst ----
 void DS2506_Custom::duty(OneWireHub * const hub)
@@ -96,19 +149,16 @@ void DS2506_Custom::duty(OneWireHub * const hub)
         // -------- 0xF0 : READ MEMORY --------
         case 0xF0:
         {
+            // pro send() der Rest der Page: aus dem Overlay, als
+            // 0xFF-Block oder aus dem Flash entpackt
+            uint8_t buf[PAGE_SIZE];
             while (reg_TA < DEVICE_TOTAL_SIZE)
             {
-                uint8_t  pageRemain = PAGE_SIZE - uint8_t(reg_TA & PAGE_MASK);
-                uint16_t devRemain  = DEVICE_TOTAL_SIZE - reg_TA;
-                uint8_t  chunk      = (pageRemain > devRemain) ? uint8_t(devRemain) : pageRemain;
-
-                while (chunk--) {
-                    const uint16_t phys = mapAddressToPhysical(reg_TA);
-                    const uint8_t  data = (phys != 0xFFFF) ? memory[phys] : 0xFF;
-                    if (hub->send(&data, 1, crc)) return;
-                    reg_TA++;
-                    markBusUse();
-                }
+                const uint8_t off   = uint8_t(reg_TA & PAGE_MASK);
+                const uint8_t chunk = PAGE_SIZE - off;
+                if (hub->send(pageData(uint8_t(reg_TA >> 5), buf) + off, chunk, crc)) return;
+                reg_TA += chunk;
+                markBusUse();
             }
             sendCrc16Raw(hub, crc);
             markBusUse();
@@ -119,14 +169,12 @@ void DS2506_Custom::duty(OneWireHub * const hub)
         {
             while (reg_TA < STATUS_SIZE_EMU)
             {
-                reg_RA = reg_TA & uint8_t(7);
-                while (reg_RA < 8 && reg_TA < STATUS_SIZE_EMU)
-                {
-                    const uint8_t data = readStatusByte(reg_TA);
-                    if (hub->send(&data, 1, crc)) return;
-                    reg_RA++; reg_TA++;
-                    markBusUse();
-                }
+                // Rest des 8-Byte-Blocks am Stück (STATUS_SIZE_EMU ist ein
+                // Vielfaches von 8, der Block endet nie hinter status_ram)
+                reg_RA = 8 - (reg_TA & uint8_t(7));
+                if (hub->send(&status_ram[reg_TA], uint8_t(reg_RA), crc)) return;
+                reg_TA += reg_RA;
+                markBusUse();
                 sendCrc16Raw(hub, crc);
                 crc = 0;
                 markBusUse();
@@ -140,20 +188,10 @@ void DS2506_Custom::duty(OneWireHub * const hub)
             while (true) {
                 uint8_t incoming;
                 if (hub->recv(&incoming, 1, crc)) break; // Ende → CRC zurück
-                const uint16_t phys = mapAddressToPhysical(reg_TA);
-                if (phys == 0xFFFF) {
+                if (!programDataByte(reg_TA, incoming)) {
 #if DS2506_STRICT_ADDR_CHECK
                     hub->raiseSlaveError(0x0F); return;
 #endif
-                } else {
-                    const uint8_t old = memory[phys];
-                    const uint8_t burned = old & incoming;
-                    if (burned != old) {
-                        memory[phys] = burned;       // RAM sofort
-#if DS2506_USE_EEPROM
-                        markDataDirty(phys);         // EEPROM später
-#endif
-                    }
                 }
                 reg_TA++;
                 markBusUse();
@@ -170,17 +208,7 @@ void DS2506_Custom::duty(OneWireHub * const hub)
             while (true) {
                 uint8_t incoming;
                 if (hub->recv(&incoming, 1, crc)) break; // Ende → CRC zurück
-
-                if (reg_TA < STATUS_SIZE_EMU) {
-                    const uint8_t old = status_ram[reg_TA];
-                    const uint8_t burned = old & incoming;
-                    if (burned != old) {
-                        status_ram[reg_TA] = burned;   // RAM sofort
-#if DS2506_USE_EEPROM
-                        markStatDirty(reg_TA);         // EEPROM später
-#endif
-                    }
-                } else {
+                if (!programStatusByte(reg_TA, incoming)) {
 #if DS2506_STRICT_ADDR_CHECK
                     hub->raiseSlaveError(0x55); return;
 #endif
@@ -204,15 +232,9 @@ void DS2506_Custom::duty(OneWireHub * const hub)
 // ---- Werksreset (blocking) ----
 void DS2506_Custom::eepromFactoryReset()
 {
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 0*32 + i, pgm_read_byte(&page_0000[i]));
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 1*32 + i, pgm_read_byte(&page_0200[i]));
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 2*32 + i, pgm_read_byte(&page_03C0[i]));
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 3*32 + i, pgm_read_byte(&page_04C0[i]));
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 4*32 + i, pgm_read_byte(&page_0600[i]));
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 5*32 + i, pgm_read_byte(&page_0700[i]));
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 6*32 + i, pgm_read_byte(&page_07E0[i]));
-    for (uint8_t i=0;i<PAGE_SIZE;i++) eeUpdate(EEPROM_MEM_BASE + 7*32 + i, pgm_read_byte(&page_0800[i]));
     for (uint16_t i=0;i<STATUS_SIZE_EMU;i++) eeUpdate(EEPROM_STAT_BASE + i, pgm_read_byte(&status_mem[i]));
+    eeUpdate(EEPROM_OVL_BASE, 0);                   // Overlay leer
+    eeUpdate(EEPROM_MAGIC_ADDR, EEPROM_MAGIC);      // zuletzt: Reset vollständig
     loadFromEEPROMToRAM();
 
     // nach einem harten Reset ist nichts dirty
@@ -225,16 +247,28 @@ void DS2506_Custom::eepromFactoryReset()
 // ---- Laden EEPROM -> RAM (schnell) ----
 void DS2506_Custom::loadFromEEPROMToRAM()
 {
-    for (uint16_t i=0;i<MEM_SIZE;i++)         memory[i]     = eeRead(EEPROM_MEM_BASE + i);
     for (uint16_t i=0;i<STATUS_SIZE_EMU;i++)  status_ram[i] = eeRead(EEPROM_STAT_BASE + i);
+    ovlCount_ = eeRead(EEPROM_OVL_BASE);
+    if (ovlCount_ > OVERLAY_PAGES) ovlCount_ = 0;
+    for (uint8_t s=0;s<ovlCount_;s++) {
+        ovlPage_[s] = eeRead(EEPROM_OVL_BASE + 1 + s);
+        for (uint8_t i=0;i<PAGE_SIZE;i++) ovlData_[s][i] = eeRead(EEPROM_OVL_BASE + ovlDataIndex(s, i));
+    }
 }
 
-// ---- „Blank“-Heuristik ----
-bool DS2506_Custom::eepromLooksBlank(uint8_t sample) const
+// ---- gültiger Inhalt? Kennung + plausible Overlay-Anzahl ----
+bool DS2506_Custom::eepromLooksBlank() const
 {
-    for (uint8_t i=0;i<sample;i++) if (eeRead(EEPROM_MEM_BASE  + i) != 0xFF) return false;
-    for (uint8_t i=0;i<sample;i++) if (eeRead(EEPROM_STAT_BASE + i) != 0xFF) return false;
-    return true;
+    return eeRead(EEPROM_MAGIC_ADDR) != EEPROM_MAGIC || eeRead(EEPROM_OVL_BASE) > OVERLAY_PAGES;
+}
+
+// ---- Overlay-Block byteweise (Anzahl | Page-Nummern | Daten) ----
+uint8_t DS2506_Custom::overlayBlockByte(uint16_t i) const
+{
+    if (i == 0) return ovlCount_;
+    if (i <= OVERLAY_PAGES) return ovlPage_[i - 1];
+    i -= 1 + OVERLAY_PAGES;
+    return ovlData_[i / PAGE_SIZE][i % PAGE_SIZE];
 }
 
 // ---- Hintergrundservice: erst wenn Bus idle, ein paar Bytes committen ----
@@ -253,9 +287,9 @@ void DS2506_Custom::commitStep_(uint16_t budget)
     if (commitWhichIsData_) {
         uint16_t end = dataDirtyHi_;
         while (budget && commitPos_ <= end) {
-            uint8_t v = memory[commitPos_];
-            uint8_t old = eeRead(EEPROM_MEM_BASE + commitPos_);
-            if (old != v) eeUpdate(EEPROM_MEM_BASE + commitPos_, v);
+            uint8_t v = overlayBlockByte(commitPos_);
+            uint8_t old = eeRead(EEPROM_OVL_BASE + commitPos_);
+            if (old != v) eeUpdate(EEPROM_OVL_BASE + commitPos_, v);
             commitPos_++; budget--;
         }
         if (commitPos_ > end) {
@@ -2,7 +2,11 @@
 #include <Arduino.h>
 #include "OneWireItem.h"
 #include "OneWireHub.h"
-#include "ds2506_image.h"   // page_0000..page_0800 + status_mem (PROGMEM)
+#include "ds2506_image.h"   // image_blob, page_index, status_mem (PROGMEM)
+
+#ifndef DS2506_IMAGE_BLOB_SIZE
+#error "ds2506_image.h im alten Format - mit read_ds2506.py neu erzeugen"
+#endif
 
 // =================== Konfiguration ===================
 
@@ -16,6 +20,11 @@
 #define DS2506_STRICT_ADDR_CHECK 0
 #endif
 
+// Overlay: so viele Pages können beschrieben werden (RAM-Kopie à 32 B)
+#ifndef DS2506_OVERLAY_PAGES
+#define DS2506_OVERLAY_PAGES 8
+#endif
+
 // EEPROM-Persistenz: 1 = RAM + (hintergründiges) EEPROM, 0 = nur RAM
 #ifndef DS2506_USE_EEPROM
 #define DS2506_USE_EEPROM 1
@@ -45,17 +54,27 @@ public:
     static constexpr uint8_t  PAGE_SIZE  = 32;
     static constexpr uint8_t  PAGE_MASK  = 0x1F;
 
-    // emulierte Datenmenge (8 belegte Pages à 32 B)
-    static constexpr uint16_t MEM_SIZE   = 256;
-    static constexpr uint8_t  PHYS_PAGES = MEM_SIZE / PAGE_SIZE;
+    // Data Memory: alle 8 KB kommen aus dem Flash (image_blob über
+    // page_index), beschriebene Pages aus dem Overlay im RAM
+    static constexpr uint16_t BLANK_PAGE    = 0xFFFF;   // page_index: Page nur 0xFF
+    static constexpr uint8_t  OVERLAY_PAGES = DS2506_OVERLAY_PAGES;
+    static_assert(OVERLAY_PAGES >= 1 && OVERLAY_PAGES <= 127, "DS2506_OVERLAY_PAGES: 1..127");
 
     // Statusbereich (dump) = 256 B
     static constexpr uint16_t STATUS_SIZE_EMU = 256;
 
 #if DS2506_USE_EEPROM
-    // EEPROM-Layout (Tiny85: 512 B → passt genau)
-    static constexpr uint16_t EEPROM_MEM_BASE  = 0;     // 0..255  : Daten
-    static constexpr uint16_t EEPROM_STAT_BASE = 256;   // 256..511: Status
+    // EEPROM-Layout (UNO/Nano: 1 KB; Tiny85 mit 512 B: höchstens 7 Overlay-Pages)
+    //   Kennung | Status 256 B | Overlay: Anzahl, Page-Nummern, Daten
+    static constexpr uint16_t EEPROM_MAGIC_ADDR = 0;
+    static constexpr uint8_t  EEPROM_MAGIC      = 0xA6;
+    static constexpr uint16_t EEPROM_STAT_BASE  = 1;
+    static constexpr uint16_t EEPROM_OVL_BASE   = EEPROM_STAT_BASE + STATUS_SIZE_EMU;
+    static constexpr uint16_t OVL_BLOCK_SIZE    = 1 + OVERLAY_PAGES + uint16_t(OVERLAY_PAGES) * PAGE_SIZE;
+  #ifdef E2END
+    static_assert(EEPROM_OVL_BASE + OVL_BLOCK_SIZE <= E2END + 1,
+                  "Overlay zu groß fürs EEPROM - DS2506_OVERLAY_PAGES verkleinern oder DS2506_USE_EEPROM 0");
+  #endif
 #endif
 
     // 7-Byte-ROM-ID (Family + 6x SN) kommt aus dem Sketch
@@ -73,37 +92,45 @@ public:
     // Laden (schnell, presence-sicher): EEPROM -> RAM
     void loadFromEEPROMToRAM();
 
-    // Heuristik: wirkt EEPROM (Daten+Status) „blank“ (0xFF)?
-    bool eepromLooksBlank(uint8_t sample = 16) const;
+    // EEPROM ohne gültigen Inhalt (leer, halber Werksreset oder altes Layout)?
+    bool eepromLooksBlank() const;
 
     // Hintergrundservice: bei Bus-Idle einige Dirty-Bytes in EEPROM committen
     void serviceBackground();
 #endif
 
 private:
-    // -------- RAM-Spiegel (immer) --------
-    uint8_t memory[MEM_SIZE];                 // 256 B Daten
+    // -------- RAM (immer) --------
     uint8_t status_ram[STATUS_SIZE_EMU];      // 256 B Status
 
-    // -------- Mapping & Utils --------
-    // logische Page -> physische (0..7), -1 wenn nicht gemappt
-    static int8_t  logicalToPhysicalPage(uint8_t logicalPage);
+    // Overlay: beschriebene Pages (Kopie aus dem Flash, dann 1->0 gebrannt)
+    uint8_t ovlCount_ = 0;
+    uint8_t ovlPage_[OVERLAY_PAGES];          // logische Page je Platz
+    uint8_t ovlData_[OVERLAY_PAGES][PAGE_SIZE];
 
-    // DS-Adressraum (0..0x1FFF) -> Index 0..255 (unser Fenster), 0xFFFF wenn leer
-    uint16_t       mapAddressToPhysical(uint16_t dsAddr) const;
+    // -------- Seiteninhalt & Utils --------
+    // Overlay-Platz der Page, -1 wenn (noch) nicht beschrieben
+    int8_t         overlaySlot(uint8_t page) const;
 
-    // Status-Byte aus RAM (Bounds-check inline)
-    inline uint8_t readStatusByte(uint16_t a) const {
-        return (a < STATUS_SIZE_EMU) ? status_ram[a] : 0xFF;
+    // 32 Bytes der Page: Overlay, 0xFF-Page oder aus dem Flash nach buf entpackt
+    const uint8_t* pageData(uint8_t page, uint8_t* buf) const;
+
+    // Write-Protect-Bit der Page im Status (Bit = 0 => gesperrt)
+    inline bool    pageWritable(uint8_t page) const {
+        return status_ram[page >> 3] & uint8_t(1 << (page & 7));
     }
 
+    // Werkszustand: Status PROGMEM -> RAM, Overlay leer
+    void loadImageToRAM();
+
     // invertierte CRC16 senden, ohne den laufenden CRC-Akkumulator zu verändern
     static void    sendCrc16Raw(OneWireHub* hub, uint16_t crc);
 
 #if DS2506_ENABLE_WRITE
-    // OTP-Write in die RAM-Spiegel (Persistenz ggf. separat)
-    void programDataByte(uint16_t dsAddr, uint8_t newVal);
-    void programStatusByte(uint16_t dsAddr, uint8_t newVal);
+    // OTP-Write ins RAM (Persistenz ggf. separat); false = nicht
+    // beschreibbar (geschützt, außerhalb oder Overlay voll)
+    bool programDataByte(uint16_t dsAddr, uint8_t newVal);
+    bool programStatusByte(uint16_t dsAddr, uint8_t newVal);
 #endif
 
     // -------- Bus-Idle-Tracking: immer vorhanden (bei USE_EEPROM=0 als No-Op) --------
@@ -124,6 +151,7 @@ private:
 
 #if DS2506_USE_EEPROM
     // -------- Commit-Tracking (kompakt; ohne große Bitmaps) --------
+    // "Daten" = Overlay-Block wie im EEPROM: Anzahl, Page-Nummern, Daten
     bool     dataDirty_     = false;
     uint16_t dataDirtyLo_   = 0xFFFF, dataDirtyHi_ = 0;
     bool     statDirty_     = false;
@@ -141,6 +169,12 @@ private:
     void startCommitIfNeeded_();
     void commitStep_(uint16_t budgetBytes);
 
+    // Byte i des Overlay-Blocks (Layout wie im EEPROM ab EEPROM_OVL_BASE)
+    uint8_t overlayBlockByte(uint16_t i) const;
+    static inline uint16_t ovlDataIndex(uint8_t slot, uint8_t off) {
+        return 1 + OVERLAY_PAGES + uint16_t(slot) * PAGE_SIZE + off;
+    }
+
     // Dirty-Markierungen setzen
     inline void markDataDirty(uint16_t idx) {
         dataDirty_ = true;
@@ -6,68 +6,71 @@
 #include <Arduino.h>
 #include <avr/pgmspace.h>
 
-// Page @ 0x0000 - 0x001F
-const uint8_t page_0000[32] PROGMEM = {
-  0x1D,0x54,0x11,0x00,0x00,0x42,0x41,0x4C,
-  0x4C,0x59,0x20,0x57,0x55,0x4C,0x46,0x46,
-  0x20,0x47,0x4D,0x42,0x48,0x09,0x59,0x00,
-  0x00,0x44,0x56,0x32,0x39,0x39,0xC2,0x9E,
-};
-
-// Page @ 0x0200 - 0x021F
-const uint8_t page_0200[32] PROGMEM = {
-  0x00,0x00,0x00,0x00,0x08,0x00,0x00,0x40,
-  0x00,0x0F,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-};
-
-// Page @ 0x03C0 - 0x03DF
-const uint8_t page_03C0[32] PROGMEM = {
-  0x04,0x0B,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-};
-
-// Page @ 0x04C0 - 0x04DF
-const uint8_t page_04C0[32] PROGMEM = {
-  0x00,0x02,0x00,0x00,0x05,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-};
-
-// Page @ 0x0600 - 0x061F
-const uint8_t page_0600[32] PROGMEM = {
-  0x3F,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-};
-
-// Page @ 0x0700 - 0x071F
-const uint8_t page_0700[32] PROGMEM = {
-  0x3F,0xFF,0x16,0x03,0x02,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-};
+// ROM Code: 8B 52 EB 00 00 70 5E B9
+// Family Code: 0x8B
+// CRC Chip:    0xB9
+// CRC Calc:    0xB9 (OK)
+#define DS2506_ROM_ID 0x8B,0x52,0xEB,0x00,0x00,0x70,0x5E
 
-// Page @ 0x07E0 - 0x07FF
-const uint8_t page_07E0[32] PROGMEM = {
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0x47,0x30,0x33,0x35,
-  0xFF,0xFF,0x06,0x57,0xB0,0x14,0x28,0x02,
-  0x04,0xFF,0xF9,0xA8,0x4F,0xEB,0xFF,0xFF,
+// Data Memory: 8 belegte Pages, 91 Bytes kodiert
+// pro Page Steuerbytes c: c < 0x80 -> c+1 Bytes folgen, c >= 0x80 -> (c & 0x7F)+1 mal 0xFF
+#define DS2506_IMAGE_BLOB_SIZE 91
+const uint8_t image_blob[91] PROGMEM = {
+  // Page 0 @ 0x0000
+  0x1F,0x1D,0x54,0x11,0x00,0x00,0x42,0x41,0x4C,0x4C,0x59,0x20,0x57,0x55,0x4C,0x46,
+  0x46,0x20,0x47,0x4D,0x42,0x48,0x09,0x59,0x00,0x00,0x44,0x56,0x32,0x39,0x39,0xC2,
+  0x9E,
+  // Page 16 @ 0x0200
+  0x09,0x00,0x00,0x00,0x00,0x08,0x00,0x00,0x40,0x00,0x0F,0x95,
+  // Page 30 @ 0x03C0
+  0x01,0x04,0x0B,0x9D,
+  // Page 38 @ 0x04C0
+  0x04,0x00,0x02,0x00,0x00,0x05,0x9A,
+  // Page 48 @ 0x0600
+  0x00,0x3F,0x9E,
+  // Page 56 @ 0x0700
+  0x04,0x3F,0xFF,0x16,0x03,0x02,0x9A,
+  // Page 63 @ 0x07E0
+  0x8B,0x03,0x47,0x30,0x33,0x35,0x81,0x0B,0x06,0x57,0xB0,0x14,0x28,0x02,0x04,0xFF,
+  0xF9,0xA8,0x4F,0xEB,0x81,
+  // Page 64 @ 0x0800
+  0x01,0x36,0x79,0x9D,
 };
 
-// Page @ 0x0800 - 0x081F
-const uint8_t page_0800[32] PROGMEM = {
-  0x36,0x79,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
-  0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,0xFF,
+// Page -> Offset in image_blob (0xFFFF = Page nur 0xFF)
+const uint16_t page_index[256] PROGMEM = {
+  // Page   0
+  0x0000,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page  16
+  0x0021,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0x002D,0xFFFF,
+  // Page  32
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0x0031,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page  48
+  0x0038,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0x003B,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0x0042,
+  // Page  64
+  0x0057,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page  80
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page  96
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 112
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 128
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 144
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 160
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 176
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 192
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 208
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 224
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
+  // Page 240
+  0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,0xFFFF,
 };
 
 // Status Memory (256 Bytes)
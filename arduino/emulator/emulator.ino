@@ -10,12 +10,13 @@
 OneWireHub hub(OW_PIN);
 
 // Virtueller DS2506-Chip
-// ROM Code Original: 8B 52 EB 00 00 70 5E B9
-// -> Wir übergeben Family + Seriennummer ohne die CRC (B9),
-//    also sieben Bytes: 0x8B,0x52,0xEB,0x00,0x00,0x70,0x5E
-DS2506_Custom chip(
-    0x8B, 0x52, 0xEB, 0x00, 0x00, 0x70, 0x5E
-);
+// ROM-ID kommt aus ds2506_image.h (DS2506_ROM_ID = Family + Seriennummer
+// ohne die CRC, die rechnet der Hub). Header ohne ROM (Dump ohne ROM-Info):
+// Original 8B 52 EB 00 00 70 5E B9 als Vorgabe.
+#ifndef DS2506_ROM_ID
+#define DS2506_ROM_ID 0x8B, 0x52, 0xEB, 0x00, 0x00, 0x70, 0x5E
+#endif
+DS2506_Custom chip(DS2506_ROM_ID);
 
 static bool factoryPressedAtBoot() {
   pinMode(FACTORY_PIN, INPUT_PULLUP);
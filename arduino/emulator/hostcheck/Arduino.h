@@ -0,0 +1,12 @@
+// Host-Stub: nur das, was DS2506_Custom braucht (siehe hostcheck.cpp)
+#pragma once
+#include <stdint.h>
+#include <string.h>
+#include <avr/pgmspace.h>
+
+#ifndef E2END
+#define E2END 1023                      // 1 KB EEPROM wie UNO/Nano
+#endif
+
+extern uint32_t host_millis;
+static inline uint32_t millis() { return host_millis; }
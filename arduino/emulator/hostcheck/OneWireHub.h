@@ -0,0 +1,48 @@
+// Host-Stub: ein "Bus" aus zwei Puffern
+//
+// recv() liefert die Bytes, die der Master schickt (in), send() sammelt
+// die Antwort (out). Beide geben wie im Original true zurück, wenn der
+// Master abbricht: recv() am Ende von in, send() ab limit gesendeten
+// Bytes (limit < 0: nie).
+#pragma once
+#include <stdint.h>
+#include <vector>
+#include "OneWireItem.h"
+
+class OneWireHub
+{
+public:
+    std::vector<uint8_t> in;
+    std::vector<uint8_t> out;
+    size_t pos   = 0;
+    long   limit = -1;
+    int    error = -1;                  // raiseSlaveError(), -1 = keiner
+
+    bool send(const uint8_t* address, uint8_t n, uint16_t& crc)
+    {
+        for (uint8_t i = 0; i < n; i++) {
+            if (limit >= 0 && long(out.size()) >= limit) return true;
+            out.push_back(address[i]);
+            crc = OneWireItem::crc16(address[i], crc);
+        }
+        return false;
+    }
+
+    bool send(const uint8_t* address, uint8_t n)
+    {
+        uint16_t crc = 0;
+        return send(address, n, crc);
+    }
+
+    bool recv(uint8_t* address, uint8_t n, uint16_t& crc)
+    {
+        for (uint8_t i = 0; i < n; i++) {
+            if (pos >= in.size()) return true;
+            address[i] = in[pos++];
+            crc = OneWireItem::crc16(address[i], crc);
+        }
+        return false;
+    }
+
+    void raiseSlaveError(uint8_t cmd) { error = cmd; }
+};
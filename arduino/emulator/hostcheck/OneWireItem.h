@@ -0,0 +1,25 @@
+// Host-Stub: Basisklasse wie in OneWireHub, nur ID und crc16()
+#pragma once
+#include <stdint.h>
+
+class OneWireHub;
+
+class OneWireItem
+{
+public:
+    OneWireItem(uint8_t ID1, uint8_t ID2, uint8_t ID3, uint8_t ID4,
+                uint8_t ID5, uint8_t ID6, uint8_t ID7)
+    : ID{ID1, ID2, ID3, ID4, ID5, ID6, ID7, 0} {}
+    virtual ~OneWireItem() = default;
+
+    virtual void duty(OneWireHub* hub) = 0;
+
+    uint8_t ID[8];
+
+    static uint16_t crc16(uint8_t data, uint16_t crc)
+    {
+        crc ^= data;
+        for (uint8_t i = 0; i < 8; i++) crc = (crc & 1) ? (crc >> 1) ^ 0xA001 : crc >> 1;
+        return crc;
+    }
+};
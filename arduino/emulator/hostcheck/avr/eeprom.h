@@ -0,0 +1,7 @@
+// Host-Stub: EEPROM als Array, anfangs gelöscht (0xFF)
+#pragma once
+#include <stdint.h>
+
+extern uint8_t host_eeprom[E2END + 1];
+static inline uint8_t eeprom_read_byte(const uint8_t* a)     { return host_eeprom[(uintptr_t)a]; }
+static inline void    eeprom_update_byte(uint8_t* a, uint8_t v) { host_eeprom[(uintptr_t)a] = v; }
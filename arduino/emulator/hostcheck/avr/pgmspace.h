@@ -0,0 +1,9 @@
+// Host-Stub: PROGMEM liegt auf dem PC im normalen Speicher
+#pragma once
+#include <stdint.h>
+#include <string.h>
+
+#define PROGMEM
+#define pgm_read_byte(p) (*(const uint8_t*)(p))
+#define pgm_read_word(p) (*(const uint16_t*)(p))
+#define memcpy_P memcpy
@@ -0,0 +1,69 @@
+// DS2506_Custom auf dem PC: Bus-Transaktionen von stdin, Antworten auf stdout
+//
+// Übersetzen (aus arduino/emulator/hostcheck, siehe hostcheck.py):
+//   g++ -std=gnu++17 -I. -I.. -o hostcheck hostcheck.cpp ../DS2506_Custom.cpp
+//
+// Eingabe, eine Transaktion je Zeile (alles hex):
+//   <kommando> <adresse> <schreibdaten oder -> [<limit>]
+//   limit = nach so vielen Antwortbytes bricht der Master ab (Reset)
+// Ausgabe je Zeile:
+//   <antwort oder -> <slave-fehler, -1 = keiner>
+//
+// Der Chip bleibt über alle Zeilen derselbe (Overlay, Status); zwischen
+// den Transaktionen vergehen 100 ms Bus-Ruhe, in denen serviceBackground()
+// ins (simulierte) EEPROM schreiben darf.
+#include <cstdio>
+#include <cstdlib>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include "DS2506_Custom.h"
+
+uint32_t host_millis = 0;
+#if DS2506_USE_EEPROM
+uint8_t host_eeprom[E2END + 1];
+#endif
+
+int main()
+{
+#if DS2506_USE_EEPROM
+    memset(host_eeprom, 0xFF, sizeof(host_eeprom));
+#endif
+    DS2506_Custom chip(DS2506_ROM_ID);
+
+    std::string line;
+    while (std::getline(std::cin, line)) {
+        std::istringstream fields(line);
+        std::string cmd, addr, payload = "-";
+        long limit = -1;
+        if (!(fields >> cmd >> addr)) continue;
+        fields >> payload >> std::hex >> limit;
+
+        OneWireHub hub;
+        const unsigned long c = strtoul(cmd.c_str(), nullptr, 16);
+        const unsigned long a = strtoul(addr.c_str(), nullptr, 16);
+        hub.in.push_back(uint8_t(c));
+        hub.in.push_back(uint8_t(a & 0xFF));
+        hub.in.push_back(uint8_t(a >> 8));
+        if (payload != "-") {
+            for (size_t i = 0; i + 1 < payload.size(); i += 2) {
+                hub.in.push_back(uint8_t(strtoul(payload.substr(i, 2).c_str(), nullptr, 16)));
+            }
+        }
+        hub.limit = limit;
+
+        chip.duty(&hub);
+
+        if (hub.out.empty()) printf("-");
+        for (uint8_t b : hub.out) printf("%02x", b);
+        printf(" %d\n", hub.error);
+
+#if DS2506_USE_EEPROM
+        for (int i = 0; i < 10; i++) {
+            host_millis += 10;
+            chip.serviceBackground();
+        }
+#endif
+    }
+    return 0;
+}
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# DS2506_Custom.cpp auf dem PC gegen das Referenzmodell prüfen
+#
+# Übersetzt hostcheck.cpp zusammen mit ../DS2506_Custom.cpp und dem
+# ds2506_image.h daneben (Stubs für Arduino/OneWireHub in diesem Ordner)
+# und schickt dieselben zufälligen Transaktionen an das Programm und an
+# python/ds2506_model.DS2506Model:
+#   0xF0 READ MEMORY, 0xAA READ STATUS  - ganz oder mit Abbruch durch den
+#                                          Master nach einigen Bytes
+#   0x0F WRITE MEMORY, 0x55 WRITE STATUS - der Zustand läuft weiter, auch
+#                                          über volle Overlays hinaus
+#   unbekannte Kommandos                 - raiseSlaveError(kommando)
+# Jede Abweichung wird mit Eingabe, Antwort und Erwartung gemeldet.
+#
+# Beispiel:
+#   python hostcheck.py                       # 2000 Transaktionen, Seed 1
+#   python hostcheck.py --count 20000 --seed 7 --strict
+# --strict übersetzt mit DS2506_STRICT_ADDR_CHECK=1, --no-eeprom mit
+# DS2506_USE_EEPROM=0. Braucht g++ (oder CXX=...).
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EMULATOR_DIR = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(EMULATOR_DIR, "..", "..", "python"))
+
+from ds2506_model import DS2506Model  # noqa: E402
+
+UNKNOWN_COMMANDS = (0x00, 0x33, 0x3C, 0xA5, 0xC3, 0xFF)
+
+
+def build(path, defines=()):
+    cxx = os.environ.get("CXX", "g++")
+    cmd = [
+        cxx, "-std=gnu++17", "-O1", "-Wall", "-Wextra", "-Wno-int-to-pointer-cast",
+        "-I" + HERE, "-I" + EMULATOR_DIR,
+        *(f"-D{d}" for d in defines),
+        "-o", path,
+        os.path.join(HERE, "hostcheck.cpp"),
+        os.path.join(EMULATOR_DIR, "DS2506_Custom.cpp"),
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def random_transactions(count, seed):
+    # (kommando, adresse, schreibdaten, limit); limit = None: ganz lesen
+    rng = random.Random(seed)
+    for _ in range(count):
+        r = rng.random()
+        limit = None
+        payload = b""
+        if r < 0.3:
+            cmd = 0xF0
+            addr = rng.choice((0, 0x1FE0, 0x1FFF, rng.randrange(0x2000), rng.randrange(0x10000)))
+            if rng.random() < 0.3:
+                limit = rng.randrange(80)
+        elif r < 0.45:
+            cmd = 0xAA
+            addr = rng.choice((0, 0xF8, 0xFF, rng.randrange(0x110), rng.randrange(0x10000)))
+            if rng.random() < 0.3:
+                limit = rng.randrange(40)
+        elif r < 0.8:
+            cmd = 0x0F
+            page = rng.choice((rng.randrange(256), rng.randrange(64), 0, 255))
+            addr = page * 32 + rng.randrange(32)
+            if rng.random() < 0.05:
+                addr = rng.randrange(0x10000)
+            payload = bytes(rng.choice((rng.randrange(256), 0xFF, 0xFE))
+                            for _ in range(rng.randrange(1, 40)))
+        elif r < 0.95:
+            cmd = 0x55
+            addr = rng.choice((rng.randrange(0x20), rng.randrange(0x110), rng.randrange(0x10000)))
+            payload = bytes(rng.choice((0xFF, 0xFF, 0xFF, rng.randrange(256)))
+                            for _ in range(rng.randrange(1, 8)))
+        else:
+            cmd = rng.choice(UNKNOWN_COMMANDS)
+            addr = rng.randrange(0x10000)
+        yield cmd, addr, payload, limit
+
+
+def expected(model, cmd, addr, payload, limit):
+    # Antwort des Modells im Ausgabeformat von hostcheck.cpp
+    try:
+        out = model.transaction(cmd, addr, payload)
+    except ValueError:
+        # unbekanntes Kommando bzw. (strict) nicht beschreibbare Adresse
+        return "ERR"
+    if limit is not None:
+        out = out[:limit]
+    return f"{out.hex() or '-'} -1"
+
+
+def run(count=2000, seed=1, strict=False, eeprom=True):
+    defines = [f"DS2506_STRICT_ADDR_CHECK={int(strict)}", f"DS2506_USE_EEPROM={int(eeprom)}"]
+    model = DS2506Model.from_header(
+        os.path.join(EMULATOR_DIR, "ds2506_image.h"), strict_addr_check=strict
+    )
+    transactions = list(random_transactions(count, seed))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exe = os.path.join(tmp, "hostcheck")
+        build(exe, defines)
+        lines = [
+            f"{cmd:02x} {addr:x} {payload.hex() or '-'}" + ("" if limit is None else f" {limit:x}")
+            for cmd, addr, payload, limit in transactions
+        ]
+        result = subprocess.run(
+            [exe], input="\n".join(lines) + "\n", capture_output=True, text=True, check=True
+        )
+    got_lines = result.stdout.splitlines()
+
+    mismatches = 0
+    for line, got, (cmd, addr, payload, limit) in zip(lines, got_lines, transactions):
+        want = expected(model, cmd, addr, payload, limit)
+        if want == "ERR":
+            ok = got.split()[-1] != "-1"
+        else:
+            ok = got == want
+        if not ok:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"ABWEICHUNG bei '{line}':\n  Emulator: {got[:120]}\n  Modell:   {want[:120]}")
+    if len(got_lines) != len(lines):
+        print(f"FEHLER: {len(got_lines)} Antworten auf {len(lines)} Transaktionen")
+        mismatches += 1
+
+    counts = {}
+    for cmd, *_ in transactions:
+        name = f"0x{cmd:02X}" if cmd in (0xF0, 0xAA, 0x0F, 0x55) else "unbekannt"
+        counts[name] = counts.get(name, 0) + 1
+    print(
+        f"{len(transactions)} Transaktionen (Seed {seed}, strict={int(strict)}, "
+        f"eeprom={int(eeprom)}): "
+        + ", ".join(f"{k} {v}" for k, v in sorted(counts.items()))
+        + f" - Overlay-Pages {sorted(model.overlay)}"
+    )
+    print("OK" if not mismatches else f"{mismatches} Abweichung(en)")
+    return mismatches == 0
+
+
+def main(args):
+    count, seed, strict, eeprom = 2000, 1, False, True
+    it = iter(args)
+    for arg in it:
+        if arg == "--count":
+            count = int(next(it))
+        elif arg == "--seed":
+            seed = int(next(it))
+        elif arg == "--strict":
+            strict = True
+        elif arg == "--no-eeprom":
+            eeprom = False
+        else:
+            print("Nutzung: python hostcheck.py [--count N] [--seed N] [--strict] [--no-eeprom]")
+            return 2
+    return 0 if run(count, seed, strict, eeprom) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
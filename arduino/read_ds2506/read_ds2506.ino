@@ -8,6 +8,9 @@
 OneWire ds(4);
 byte romCode[8];
 
+// Start-Baudrate; höhere Raten nur nach Aushandlung per 'baud <rate>'
+const unsigned long DEFAULT_BAUD = 115200;
+
 // -----------------------------------------------------
 void printHexByte(byte b) {
   if (b < 0x10) Serial.print('0');
@@ -346,6 +349,30 @@ void hexdump() {
   Serial.println("=== HEX DUMP END ===");
 }
 
+// -----------------------------------------------------
+// Seitenweise gepuffert senden
+//
+// Eine Page (bzw. ein Status-Block) wird komplett vom Bus gelesen und
+// mit einem Serial.write() in den Sendepuffer gegeben. Den leert der
+// UART per Interrupt, während schon die nächste Page vom Bus kommt -
+// 1-Wire und Leitung laufen so nebeneinander statt nacheinander.
+// Serial.write() wartet selbst, wenn der Puffer voll ist; eine Pause
+// zum "Nachkommen lassen" braucht es nicht.
+const uint16_t PAGE_SIZE        = 32;
+const uint16_t PAGE_RECORD_SIZE = PAGE_SIZE + 2;
+
+const uint16_t STATUS_BLOCK_SIZE = 8 + 2;
+
+void streamStatusBlocks(bool withCrc) {
+  // 0xAA: 32 Blöcke à 8 Statusbytes + 2 CRC-Bytes; die CRC-Bytes gehen
+  // nur bei withCrc mit raus ('dumpall'), 'sendstatus' verwirft sie
+  byte block[STATUS_BLOCK_SIZE];
+  for (uint8_t b = 0; b < 32; b++) {
+    ds.read_bytes(block, sizeof(block));
+    Serial.write(block, withCrc ? STATUS_BLOCK_SIZE : 8);
+  }
+}
+
 // -----------------------------------------------------
 void sendBinary() {
   Serial.println("BINARY_START");
@@ -360,13 +387,24 @@ void sendBinary() {
   ds.write(0x00);
   ds.write(0x00);
   
-  for (uint16_t i = 0; i < 8192; i++) {
-    Serial.write(ds.read());
-    if ((i + 1) % 64 == 0) delay(10);
+  byte page[PAGE_SIZE];
+  for (uint16_t addr = 0; addr < 8192; addr += PAGE_SIZE) {
+    ds.read_bytes(page, PAGE_SIZE);
+    Serial.write(page, PAGE_SIZE);
   }
-  
+
+  // Am Speicherende liefert der Chip die (invertierte) CRC16 über
+  // Kommando, Adresse und alle Daten - der PC prüft sie mitlaufend.
+  byte crcLo = ds.read();
+  byte crcHi = ds.read();
+
   delay(100);
-  Serial.println("\nBINARY_END");
+  Serial.println();
+  Serial.print("CRC16=");
+  printHexByte(crcHi);
+  printHexByte(crcLo);
+  Serial.println();
+  Serial.println("BINARY_END");
 }
 
 // -----------------------------------------------------
@@ -384,24 +422,200 @@ void sendStatus() {
   ds.write(0x00);
   ds.write(0x00);
 
-  // 256 echte Bytes sammeln/senden
-  for (uint8_t block = 0; block < 32; block++) {
-    // 8 echte Statusbytes
-    for (uint8_t i = 0; i < 8; i++) {
-      byte b = ds.read();
-      Serial.write(b);
-    }
-    // 2 CRC Bytes wegwerfen
-    byte crcLo = ds.read();
-    byte crcHi = ds.read();
-    (void)crcLo;
-    (void)crcHi;
-  }
+  streamStatusBlocks(false);
 
   delay(50);
   Serial.println("\nSTATUS_END");
 }
 
+// -----------------------------------------------------
+// Pages per EXTENDED READ MEMORY (A5h) senden
+//
+// Je Page: 32 Datenbytes + die vom Chip gelieferte CRC16 über diese
+// Page (invertiert, LSB zuerst) = 34 Bytes. Das Redirection-Byte und
+// seine CRC werden gelesen und verworfen. Der PC prüft die CRC und
+// fordert fehlerhafte Pages gezielt mit 'crcpages' neu an.
+
+void streamPagesWithCrc(uint16_t firstPage, uint16_t count) {
+  uint16_t addr = firstPage * PAGE_SIZE;
+  ds.write(0xCC);
+  ds.write(0xA5);
+  ds.write(addr & 0xFF);
+  ds.write((addr >> 8) & 0xFF);
+
+  byte record[PAGE_RECORD_SIZE];
+  for (uint16_t p = 0; p < count; p++) {
+    // Redirection-Byte + CRC16
+    ds.read();
+    ds.read();
+    ds.read();
+
+    // 32 Datenbytes + CRC low/high
+    ds.read_bytes(record, PAGE_RECORD_SIZE);
+    Serial.write(record, PAGE_RECORD_SIZE);
+  }
+}
+
+// -----------------------------------------------------
+// Einzelne Pages mit CRC senden ('crcpages <erste> <anzahl>', dezimal)
+//
+//   PAGES_START
+//   <Frame-Länge uint16 LE = anzahl * 34>
+//   <Page-Records>
+//   PAGES_END
+void sendPages(uint16_t firstPage, uint16_t count) {
+  if (firstPage >= 256 || count == 0 || count > 256 - firstPage) {
+    Serial.println("ERROR_RANGE");
+    return;
+  }
+  if (!ds.reset()) {
+    Serial.println("ERROR_NO_DEVICE");
+    return;
+  }
+
+  const uint16_t frameLen = count * PAGE_RECORD_SIZE;
+  Serial.println("PAGES_START");
+  Serial.write(frameLen & 0xFF);
+  Serial.write((frameLen >> 8) & 0xFF);
+  streamPagesWithCrc(firstPage, count);
+  Serial.println();
+  Serial.println("PAGES_END");
+}
+
+// -----------------------------------------------------
+// Adressbereich binär senden ('readrange <adresse> <länge>', beides hex)
+//
+//   RANGE_START
+//   <Länge uint16 LE>
+//   <Daten per READ MEMORY (F0h)>
+//   RANGE_END
+void sendRange(uint16_t addr, uint16_t len) {
+  if (addr >= 8192 || len == 0 || len > 8192 - addr) {
+    Serial.println("ERROR_RANGE");
+    return;
+  }
+  if (!ds.reset()) {
+    Serial.println("ERROR_NO_DEVICE");
+    return;
+  }
+
+  Serial.println("RANGE_START");
+  Serial.write(len & 0xFF);
+  Serial.write((len >> 8) & 0xFF);
+
+  ds.write(0xCC);
+  ds.write(0xF0);
+  ds.write(addr & 0xFF);
+  ds.write((addr >> 8) & 0xFF);
+
+  // gepuffert wie sendBinary: höchstens eine Page je Serial.write()
+  byte page[PAGE_SIZE];
+  for (uint16_t sent = 0; sent < len; ) {
+    uint16_t chunk = len - sent < PAGE_SIZE ? len - sent : PAGE_SIZE;
+    ds.read_bytes(page, chunk);
+    Serial.write(page, chunk);
+    sent += chunk;
+  }
+
+  Serial.println();
+  Serial.println("RANGE_END");
+}
+
+// -----------------------------------------------------
+// ROM + Data Memory + Status Memory in einem Frame
+//
+//   DUMPALL_START
+//   <Frame-Länge, uint16 little endian>
+//   <8 Byte ROM><256 Page-Records à 34 Byte><32 Status-Blöcke à 10 Byte>
+//   DUMPALL_END   (oder DUMPALL_ERROR, dann Frame mit 0xFF aufgefüllt)
+//
+// Ein Status-Block sind 8 Bytes + die CRC16 des Chips (wie bei 0xAA).
+// Das Ende erkennt der PC an der Frame-Länge, ohne Timeout.
+void sendDumpAll() {
+  const uint16_t PAGE_COUNT  = 256;
+  const uint16_t STATUS_SIZE = 32 * STATUS_BLOCK_SIZE;
+  const uint16_t FRAME_LEN   = 8 + PAGE_COUNT * PAGE_RECORD_SIZE + STATUS_SIZE;
+
+  if (!ds.reset()) {
+    Serial.println("ERROR_NO_DEVICE");
+    return;
+  }
+
+  Serial.println("DUMPALL_START");
+  Serial.write(FRAME_LEN & 0xFF);
+  Serial.write((FRAME_LEN >> 8) & 0xFF);
+  Serial.write(romCode, 8);
+
+  bool ok = true;
+
+  // Data Memory, pageweise mit CRC
+  streamPagesWithCrc(0, PAGE_COUNT);
+
+  // Status Memory (je 8 Bytes + 2 CRC-Bytes, die CRC prüft der Host)
+  if (ds.reset()) {
+    ds.write(0xCC);
+    ds.write(0xAA);
+    ds.write(0x00);
+    ds.write(0x00);
+    streamStatusBlocks(true);
+  } else {
+    // Frame-Länge trotzdem einhalten
+    ok = false;
+    for (uint16_t i = 0; i < STATUS_SIZE; i++) Serial.write(0xFF);
+  }
+
+  Serial.println();
+  Serial.println(ok ? "DUMPALL_END" : "DUMPALL_ERROR");
+}
+
+
+// -----------------------------------------------------
+// Baudrate umschalten ('baud <rate>')
+//
+// BAUD_OK <rate> geht noch mit der alten Rate raus, danach wird
+// umgeschaltet. Der PC bestätigt mit 'ping' in der neuen Rate und
+// bekommt PONG. Kommt innerhalb von 2 s kein ping an (Kabel/USB-Wandler
+// schafft die Rate nicht), geht der Reader zurück auf DEFAULT_BAUD.
+bool isSupportedBaud(unsigned long rate) {
+  return rate == 115200 || rate == 250000 || rate == 500000 ||
+         rate == 1000000 || rate == 2000000;
+}
+
+void switchBaud(unsigned long rate) {
+  if (!isSupportedBaud(rate)) {
+    Serial.println("ERROR_BAUD");
+    return;
+  }
+
+  Serial.print("BAUD_OK ");
+  Serial.println(rate);
+  Serial.flush();
+  Serial.end();
+  Serial.begin(rate);
+
+  String line = "";
+  unsigned long start = millis();
+  while (millis() - start < 2000) {
+    while (Serial.available() > 0) {
+      char c = Serial.read();
+      if (c == '\n') {
+        if (line.endsWith("ping")) {
+          Serial.println("PONG");
+          return;
+        }
+        line = "";
+      } else if (c != '\r' && line.length() < 32) {
+        line += c;
+      }
+    }
+  }
+
+  // keine Bestätigung -> zurück zur Standardrate
+  Serial.flush();
+  Serial.end();
+  Serial.begin(DEFAULT_BAUD);
+}
+
 
 // -----------------------------------------------------
 void printHelp() {
@@ -412,7 +626,12 @@ void printHelp() {
   Serial.println("binary    - Binaerdaten senden (fuer Python-Script)");
   Serial.println("status    - Liest Status Memory");
   Serial.println("sendstatus- Status Memory binaer senden");
+  Serial.println("dumpall   - ROM + Data + Status als ein Binaerframe");
+  Serial.println("crcpages N M - M Pages ab Page N mit Chip-CRC16 senden");
+  Serial.println("readrange A L - L Bytes ab Adresse A binaer senden (hex)");
   Serial.println("rom       - Zeigt ROM Code");
+  Serial.println("ping      - Antwortet mit PONG (Bereitschaftstest)");
+  Serial.println("baud RATE - Baudrate umschalten (115200..2000000)");
   Serial.println("help      - Zeigt diese Hilfe");
   Serial.println("[ADRESSE] - Liest 64 Bytes ab Adresse (hex)");
   Serial.println();
@@ -426,7 +645,7 @@ void printHelp() {
 
 // -----------------------------------------------------
 void setup() {
-  Serial.begin(115200);
+  Serial.begin(DEFAULT_BAUD);
   delay(1000);
   
   // Serial Buffer leeren
@@ -493,12 +712,37 @@ void loop() {
         
       } else if (input == "sendstatus") {
         sendStatus();
+
+      } else if (input == "dumpall") {
+        sendDumpAll();
+
+      } else if (input.startsWith("crcpages")) {
+        unsigned int firstPage = 0, count = 0;
+        if (sscanf(input.c_str(), "crcpages %u %u", &firstPage, &count) == 2) {
+          sendPages(firstPage, count);
+        } else {
+          Serial.println("ERROR_SYNTAX (crcpages <erste> <anzahl>)");
+        }
+
+      } else if (input.startsWith("readrange")) {
+        unsigned int addr = 0, len = 0;
+        if (sscanf(input.c_str(), "readrange %x %x", &addr, &len) == 2) {
+          sendRange(addr, len);
+        } else {
+          Serial.println("ERROR_SYNTAX (readrange <adresse> <laenge>)");
+        }
         
       } else if (input == "status") {
         readStatusMemory();
         
       } else if (input == "rom") {
         printROM();
+
+      } else if (input == "ping") {
+        Serial.println("PONG");
+
+      } else if (input.startsWith("baud ")) {
+        switchBaud(strtoul(input.c_str() + 5, NULL, 10));
         
       } else if (input == "help" || input == "?") {
         printHelp();
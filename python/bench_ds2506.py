@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# Mikro-Benchmarks für die Auswertung
+#
+#   python bench_ds2506.py analysis [N]   Page-Belegung + Status-Bitmaps:
+#                                         Python-Schleifen vs. NumPy
+#   python bench_ds2506.py crc [N]        CRC16 über N Dumps: Bit-Schleife
+#                                         vs. Tabelle (ds2506_crc)
+#   python bench_ds2506.py hexdump [N]    Hexdump von N Dumps: Byte-Schleife
+#                                         vs. ds2506_hexdump
+#   python bench_ds2506.py jaccard [N]    Ähnlichkeit aller Paare: Mengen-
+#                                         Schnitt je Paar vs. ds2506_diff
+#
+# Ende-zu-Ende gegen den simulierten Reader (ds2506_sim.py, braucht
+# pyserial, läuft in Echtzeit):
+#   python bench_ds2506.py saveall [N]    Verbinden + Dump + alle Dateien,
+#                                         je Leitungs-/Sketch-Variante
+#   python bench_ds2506.py latency [N]    Antwortzeit je Kommando, mit und
+#                                         ohne USB-Latenz
+#   python bench_ds2506.py recovery [N]   dumpall bei steigender Bitfehlerrate:
+#                                         Dauer, Wiederholungen, Erfolg
+#   python bench_ds2506.py async [N]      AsyncDS2506Reader über ein pty
+#                                         (PtySimulator, nur POSIX): connect,
+#                                         rom, binary, status, dumpall gegen
+#                                         das Abbild geprüft; Exit-Code 1 bei
+#                                         falschen Daten
+#
+# Die Dumps werden zufällig, aber reproduzierbar erzeugt (feste Seeds):
+# wenige belegte Pages, Rest 0xFF - so wie echte Dumps aussehen.
+import asyncio
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from read_ds2506 import (
+    DS2506Reader, DumpAnalysis, SPARSE_PROFILES, FAST_BAUDRATES, save_all_files, serial,
+    status_protection_pages,
+)
+
+
+def make_dumps(n, seed=1):
+    rnd = random.Random(seed)
+    dumps = []
+    statuses = []
+    for _ in range(n):
+        data = bytearray(b"\xFF" * 8192)
+        pages = set(SPARSE_PROFILES["emulator"])
+        pages.update(rnd.sample(range(256), rnd.randint(0, 12)))
+        for p in pages:
+            data[p * 32:(p + 1) * 32] = bytes(rnd.getrandbits(8) for _ in range(32))
+        status = bytearray(b"\xFF" * 256)
+        for i in rnd.sample(range(0x40), 6):
+            status[i] = rnd.getrandbits(8)
+        dumps.append(bytes(data))
+        statuses.append(bytes(status))
+    return dumps, statuses
+
+
+def make_family_dumps(n, per_family=50, seed=2):
+    # Modellfamilien: gleiche Pages je Familie, pro Gerät 0-3 Bytes anders
+    rnd = random.Random(seed)
+    dumps = []
+    base = None
+    for i in range(n):
+        if i % per_family == 0:
+            base = bytearray(b"\xFF" * 8192)
+            for p in rnd.sample(range(256), rnd.randint(5, 20)):
+                base[p * 32:(p + 1) * 32] = bytes(rnd.getrandbits(8) for _ in range(32))
+        data = bytearray(base)
+        for p in rnd.sample(range(256), rnd.randint(0, 3)):
+            data[p * 32 + rnd.randrange(32)] = rnd.getrandbits(8)
+        dumps.append(bytes(data))
+    return dumps
+
+
+def timed(label, func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    dt = time.perf_counter() - t0
+    print(f"  {label:<32} {dt * 1000:9.1f} ms")
+    return result, dt
+
+
+# -------------------------------------------------
+# Page-Belegung / Status: Schleifen vs. NumPy
+#
+# Vergleichsbasis sind die reinen Schleifen (Page für Page auf 0xFF
+# prüfen, WP/CP Bit für Bit), nicht calc_used_pages_from_binary - das
+# baut eine ganze DumpAnalysis samt Hexdump.
+def _used_pages_loop(data):
+    return [p for p in range(256) if any(b != 0xFF for b in data[p * 32:(p + 1) * 32])]
+
+
+def bench_analysis(n=2000):
+    try:
+        import ds2506_numpy
+        ds2506_numpy._require_numpy()
+    except ImportError as e:
+        print(f"Übersprungen: {e}")
+        return
+
+    dumps, statuses = make_dumps(n)
+    print(f"\n=== Analyse: {n} Dumps ===")
+
+    def loops():
+        used = [_used_pages_loop(d) for d in dumps]
+        prot = [status_protection_pages(s) for s in statuses]
+        return used, prot
+
+    (used, prot), t_loop = timed("Python-Schleifen", loops)
+    result, t_np = timed("NumPy analyze_stack", ds2506_numpy.analyze_stack, dumps, statuses)
+
+    # Ergebnisse müssen identisch sein
+    assert ds2506_numpy.page_lists(result["occupancy"]) == used
+    assert ds2506_numpy.page_lists(result["wp"]) == [p[0] for p in prot]
+    assert ds2506_numpy.page_lists(result["cp"]) == [p[2] for p in prot]
+    assert result["eprom_count"].tolist() == [
+        sum(1 for b in p[1] if b != 0xFF) for p in prot
+    ]
+    print(f"  Faktor: {t_loop / t_np:.1f}x (Ergebnisse identisch)")
+
+
+# -------------------------------------------------
+# CRC16 über gespeicherte Dumps: Bit-Schleife vs. Tabelle
+def _crc16_bitwise(data, crc=0):
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x01:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+    return crc
+
+
+def bench_crc(n=200):
+    import ds2506_crc
+
+    dumps, _ = make_dumps(n)
+    print(f"\n=== CRC16: {n} Dumps ===")
+
+    def bitwise():
+        return [_crc16_bitwise(b"\xF0\x00\x00" + d) ^ 0xFFFF for d in dumps]
+
+    expected, t_bit = timed("Bit-Schleife", bitwise)
+    bad, t_tab = timed("Tabelle verify_dumps", ds2506_crc.verify_dumps, dumps, expected)
+
+    assert bad == []
+    print(f"  Faktor: {t_bit / t_tab:.1f}x (Ergebnisse identisch)")
+
+
+# -------------------------------------------------
+# Hexdump: f-String/chr() pro Byte vs. hex(" ") + translate
+def _hexdump_bytewise(f, data):
+    for addr in range(0, len(data), 16):
+        chunk = data[addr:addr + 16]
+        hex_str = " ".join(f"{b:02X}" for b in chunk)
+        ascii_str = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        f.write(f"{addr:04X}: {hex_str:<48} {ascii_str}\n")
+
+
+def bench_hexdump(n=200):
+    import ds2506_hexdump
+
+    dumps, _ = make_dumps(n)
+    print(f"\n=== Hexdump: {n} Dumps ===")
+
+    def bytewise():
+        f = io.StringIO()
+        for d in dumps:
+            _hexdump_bytewise(f, d)
+        return f.getvalue()
+
+    def blockwise():
+        f = io.StringIO()
+        for d in dumps:
+            ds2506_hexdump.write_hexdump(f, d)
+        return f.getvalue()
+
+    old, t_old = timed("Byte-Schleife", bytewise)
+    new, t_new = timed("write_hexdump", blockwise)
+
+    assert old == new
+    print(f"  Faktor: {t_old / t_new:.1f}x (Ergebnisse identisch)")
+
+
+# -------------------------------------------------
+# Ähnlichkeit alle gegen alle: Mengen-Schnitt je Paar vs. ds2506_diff
+def bench_jaccard(n=1000):
+    try:
+        import ds2506_diff
+        ds2506_diff._require_numpy()
+    except ImportError as e:
+        print(f"Übersprungen: {e}")
+        return
+
+    dumps = make_family_dumps(n)
+    print(f"\n=== Page-Hash-Jaccard: {n} Dumps, {n * (n - 1) // 2} Paare ===")
+
+    def pairwise():
+        sets = [
+            {(p, d[p * 32:(p + 1) * 32]) for p in range(256)
+             if d[p * 32:(p + 1) * 32] != b"\xFF" * 32}
+            for d in dumps
+        ]
+        pairs = {}
+        for i in range(n):
+            for j in range(i + 1, n):
+                shared = len(sets[i] & sets[j])
+                if shared:
+                    pairs[i, j] = shared / len(sets[i] | sets[j])
+        return pairs
+
+    def vectorized():
+        return {(i, j): jac for i, j, jac, _shared in ds2506_diff.similar_pairs(dumps)}
+
+    old, t_old = timed("Python-Mengen je Paar", pairwise)
+    new, t_new = timed("similar_pairs (NumPy)", vectorized)
+
+    assert old.keys() == new.keys()
+    assert all(abs(old[k] - new[k]) < 1e-6 for k in old)
+    print(f"  Faktor: {t_old / t_new:.1f}x (Ergebnisse identisch)")
+
+
+# -------------------------------------------------
+# Ende-zu-Ende gegen den simulierten Reader
+def sim_reader(url, fast_baudrates=FAST_BAUDRATES):
+    if serial is None:
+        print("Übersprungen: pyserial fehlt (python -m pip install pyserial)")
+        return None
+    reader = DS2506Reader(url, fast_baudrates=fast_baudrates)
+    reader.log = lambda *args, **kwargs: None
+    reader.progress = False
+    return reader
+
+
+def bench_saveall(n=1):
+    # (Bezeichnung, sim://-Optionen, Baudraten-Aushandlung)
+    variants = [
+        ("115200, Sketch-Zeiten", "scale=1", ()),
+        ("2 Mbaud, Sketch-Zeiten", "scale=1", FAST_BAUDRATES),
+        ("2 Mbaud, nur Leitung", "scale=0", FAST_BAUDRATES),
+    ]
+    print(f"\n=== saveall (simulierter Reader, {n}x je Variante) ===")
+    print(f"  {'Variante':<26} {'connect':>8} {'dump':>8} {'save':>8} {'gesamt':>8}")
+    for label, options, fast in variants:
+        rows = []
+        for _ in range(n):
+            reader = sim_reader(f"sim://?{options}&seed=1", fast)
+            if reader is None:
+                return
+            t0 = time.perf_counter()
+            if not reader.connect(reset=True):
+                print(f"  {label:<26} Verbinden fehlgeschlagen")
+                break
+            t1 = time.perf_counter()
+            rominfo, data, status = reader.read_full_dump()
+            t2 = time.perf_counter()
+            with tempfile.TemporaryDirectory() as outdir:
+                save_all_files(reader, DumpAnalysis(data, status, rominfo), "BENCH", outdir)
+            t3 = time.perf_counter()
+            reader.disconnect()
+            rows.append((t1 - t0, t2 - t1, t3 - t2, t3 - t0))
+        if rows:
+            avg = [statistics.mean(col) for col in zip(*rows)]
+            print(f"  {label:<26} " + " ".join(f"{v:7.2f}s" for v in avg))
+
+
+def bench_latency(n=20):
+    commands = [
+        ("ping", lambda r: r.send_command("ping")),
+        ("rom", lambda r: r.send_command("rom")),
+        ("readrange 32", lambda r: r.read_range(0x7E0, 32)),
+        ("crcpages 1", lambda r: r.read_pages(63, 1)),
+        ("sendstatus", lambda r: r.read_status_data()),
+    ]
+    variants = [
+        ("direkt", "scale=1"),
+        ("USB 5+-2 ms", "scale=1&latency=0.005&jitter=0.002"),
+    ]
+    print(f"\n=== Antwortzeit je Kommando (Median aus {n}, 2 Mbaud) ===")
+    print(f"  {'Kommando':<14}" + "".join(f"{label:>14}" for label, _ in variants))
+    results = {}
+    for label, options in variants:
+        reader = sim_reader(f"sim://?{options}&seed=1")
+        if reader is None:
+            return
+        if not reader.connect(reset=False):
+            print(f"  {label}: Verbinden fehlgeschlagen")
+            return
+        for name, func in commands:
+            times = []
+            for _ in range(n):
+                t0 = time.perf_counter()
+                func(reader)
+                times.append(time.perf_counter() - t0)
+            results[(name, label)] = statistics.median(times)
+        reader.disconnect()
+    for name, _func in commands:
+        print(f"  {name:<14}" + "".join(
+            f"{results[(name, label)] * 1000:11.1f} ms" for label, _ in variants
+        ))
+
+
+def bench_recovery(n=3):
+    print(f"\n=== Wiederholungskosten dumpall ({n}x je Fehlerrate, 2 Mbaud) ===")
+    print(f"  {'Fehler/Byte':<12} {'Dauer':>8} {'Wdh.':>6} {'ok':>5}")
+    for rate in (0, 1e-4, 1e-3, 5e-3):
+        durations = []
+        retries = 0
+        ok = 0
+        for seed in range(n):
+            reader = sim_reader(f"sim://?scale=0.2&errors={rate}&seed={seed}")
+            if reader is None:
+                return
+            if not reader.connect(reset=False):
+                print(f"  {rate:<12g} Verbinden fehlgeschlagen")
+                break
+            t0 = time.perf_counter()
+            result = reader.read_dump_all()
+            durations.append(time.perf_counter() - t0)
+            ok += result is not None
+            retries += reader.metrics.totals()["retries"]
+            reader.disconnect()
+        if durations:
+            print(f"  {rate:<12g} {statistics.mean(durations):7.2f}s "
+                  f"{retries / len(durations):6.1f} {ok:>3}/{len(durations)}")
+
+
+# -------------------------------------------------
+# AsyncDS2506Reader gegen den Simulator hinter einem pty
+#
+# Ohne Bitfehler muss jeder Schritt die Daten des Simulators liefern.
+# Mit Bitfehlern darf ein Schritt scheitern (abgelehnt), aber nie
+# falsche Daten liefern - geprüft nur für die Kommandos mit CRC.
+async def _async_steps(reader_class, path, firmware, steps):
+    reader = reader_class(path)
+    reader.log = lambda *args, **kwargs: None
+    reader.progress = False
+    checks = {
+        "rom": (reader.get_rom_info,
+                lambda r: r.get("crc_ok") and bytes(r["rom_bytes"]) == firmware.rom),
+        "binary": (reader.read_binary_data, lambda r: r == firmware.data),
+        "status": (reader.read_status_data, lambda r: r == firmware.status),
+        "dumpall": (reader.read_dump_all,
+                    lambda r: r[1] == firmware.data and r[2] == firmware.status),
+    }
+    results = {}
+    t0 = time.perf_counter()
+    connected = await reader.connect(reset=True)
+    results["connect"] = (time.perf_counter() - t0, "ok" if connected else "abgelehnt")
+    if not connected:
+        return results
+    for name in steps:
+        func, check = checks[name]
+        t0 = time.perf_counter()
+        result = await func()
+        dt = time.perf_counter() - t0
+        if not result or (name == "rom" and not result.get("crc_ok")):
+            results[name] = (dt, "abgelehnt")
+        else:
+            results[name] = (dt, "ok" if check(result) else "FALSCH")
+    reader.disconnect()
+    return results
+
+
+def bench_async(n=3):
+    try:
+        from ds2506_async import AsyncDS2506Reader   # fcntl/termios, nur POSIX
+        from ds2506_sim import PtySimulator, SimFirmware
+    except ImportError as e:
+        print(f"Übersprungen: {e}")
+        return
+
+    # (Bezeichnung, Bitfehler je Byte, Schritte, Ablehnung erlaubt)
+    variants = [
+        ("fehlerfrei", 0, ("rom", "binary", "status", "dumpall"), False),
+        ("Fehler 1e-4", 1e-4, ("binary", "dumpall"), True),
+    ]
+    print(f"\n=== AsyncDS2506Reader über pty ({n}x je Variante, 2 Mbaud) ===")
+    failed = False
+    for label, errors, steps, may_reject in variants:
+        rows = {}
+        for seed in range(n):
+            sim = PtySimulator(SimFirmware(scale=0, errors=errors, seed=seed))
+            path = sim.start()
+            try:
+                results = asyncio.run(_async_steps(AsyncDS2506Reader, path, sim.firmware, steps))
+            finally:
+                sim.stop()
+            for name, row in results.items():
+                rows.setdefault(name, []).append(row)
+        print(f"  {label}:")
+        for name in ("connect",) + steps:
+            outcomes = [outcome for _dt, outcome in rows.get(name, [])]
+            mean = statistics.mean(dt for dt, _ in rows[name]) if outcomes else 0.0
+            counts = ", ".join(f"{outcomes.count(o)} {o}"
+                               for o in ("ok", "abgelehnt", "FALSCH") if outcomes.count(o))
+            print(f"    {name:<10} {mean * 1000:8.1f} ms  {counts or 'nicht gelaufen'}")
+            if "FALSCH" in outcomes or (not may_reject and outcomes.count("ok") != n):
+                failed = True
+    print("  Ergebnis:", "FEHLER" if failed else "OK")
+    if failed:
+        sys.exit(1)
+
+
+BENCHMARKS = {
+    "analysis": bench_analysis,
+    "crc": bench_crc,
+    "hexdump": bench_hexdump,
+    "jaccard": bench_jaccard,
+    "saveall": bench_saveall,
+    "latency": bench_latency,
+    "recovery": bench_recovery,
+    "async": bench_async,
+}
+
+
+def main():
+    names = sys.argv[1:2] or list(BENCHMARKS)
+    args = [int(a) for a in sys.argv[2:]]
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unbekannter Benchmark '{name}' (bekannt: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name](*args)
+
+
+if __name__ == "__main__":
+    main()
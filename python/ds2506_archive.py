@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# Archivdatei für viele Dumps (ein File statt tausender .bin/.hex/.txt)
+#
+# Aufbau (alle Zahlen Little Endian):
+#   Kopf     16 Bytes   "DS2506AR", Version (u16), Reserve
+#   Records  je RECORD_SIZE (8704) Bytes, fest:
+#              ROM       8 Bytes  (unbekannt = 00..00)
+#              Data   8192 Bytes
+#              Status  256 Bytes
+#              Meta    248 Bytes  JSON (UTF-8), mit 0x00 aufgefüllt;
+#                                 enthält auch den Schlüssel ("key"),
+#                                 wenn er noch hineinpasst
+#   Index    je 64 Bytes pro Record:
+#              Schlüssel 56 Bytes (UTF-8, 0x00-aufgefüllt, meist das Präfix)
+#              CRC32 über den Record (u32), Reserve (u32)
+#   Fuß      16 Bytes   Anzahl Records (u32), Reserve (u32), "DS25IDX\0"
+#
+# Record i liegt also bei HEADER_SIZE + i * RECORD_SIZE - der Index wird
+# nur für die Schlüssel gebraucht. Anhängen überschreibt Index und Fuß
+# und schreibt beide erst bei close() neu. Stirbt der Prozess vorher,
+# fehlt der Index: DumpArchive liest dann alle vollständigen Records
+# trotzdem (recovered = True, Schlüssel aus Meta, CRC32 aus dem Record)
+# und ArchiveWriter(path, append=True).repair() schreibt ihn neu.
+#
+# Lesen per mmap: DumpArchive liefert pro Record memoryview-Scheiben
+# direkt in die Datei, ohne Kopie. Die Auswertung (DumpAnalysis,
+# calc_used_pages_from_binary, analyze_status, ...) nimmt diese Views
+# direkt. Vor close() müssen alle Views freigegeben sein (mmap-Regel).
+#
+# Beispiel:
+#   with ArchiveWriter("dumps.ds2506a", append=True) as w:
+#       w.add(data, status, rom_bytes, key="123_T_66051")
+#   with DumpArchive("dumps.ds2506a") as arch:
+#       rec = arch[0]
+#       used = reader.calc_used_pages_from_binary(rec.data)[0]
+import json
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"DS2506AR"
+INDEX_MAGIC = b"DS25IDX\0"
+VERSION = 1
+
+ROM_SIZE = 8
+DATA_SIZE = 8192
+STATUS_SIZE = 256
+META_SIZE = 248
+RECORD_SIZE = ROM_SIZE + DATA_SIZE + STATUS_SIZE + META_SIZE   # 8704
+
+HEADER = struct.Struct("<8sH6x")
+INDEX_ENTRY = struct.Struct("<56sI4x")
+FOOTER = struct.Struct("<I4x8s")
+HEADER_SIZE = HEADER.size
+
+
+def record_key(view):
+    # Schlüssel aus dem Meta-JSON eines Records ("" wenn keiner drinsteht)
+    raw = bytes(view[RECORD_SIZE - META_SIZE:RECORD_SIZE]).rstrip(b"\0")
+    try:
+        key = json.loads(raw).get("key", "") if raw else ""
+    except (ValueError, AttributeError):
+        return ""
+    return key if isinstance(key, str) else ""
+
+
+class ArchiveRecord:
+    __slots__ = ("number", "key", "crc32", "rom", "data", "status", "_meta")
+
+    def __init__(self, number, key, crc32, view):
+        self.number = number
+        self.key = key
+        self.crc32 = crc32
+        self.rom = view[:ROM_SIZE]
+        self.data = view[ROM_SIZE:ROM_SIZE + DATA_SIZE]
+        self.status = view[ROM_SIZE + DATA_SIZE:ROM_SIZE + DATA_SIZE + STATUS_SIZE]
+        self._meta = view[RECORD_SIZE - META_SIZE:]
+
+    @property
+    def meta(self):
+        raw = bytes(self._meta).rstrip(b"\0")
+        return json.loads(raw) if raw else {}
+
+    @property
+    def rom_bytes(self):
+        # None, wenn beim Packen kein ROM bekannt war
+        return None if self.rom == bytes(ROM_SIZE) else list(self.rom)
+
+    def release(self):
+        for view in (self.rom, self.data, self.status, self._meta):
+            view.release()
+
+
+# -------------------------------------------------
+# Schreiben
+class ArchiveWriter:
+    def __init__(self, path, append=False):
+        self.path = path
+        self._keys = []
+        self.recovered = False     # Archiv hatte keinen Index (Absturz)
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with DumpArchive(path) as arch:
+                self._keys = [(arch.key(i), arch.crc32(i)) for i in range(len(arch))]
+                self.recovered = arch.recovered
+            self._f = open(path, "r+b")
+        else:
+            self._f = open(path, "wb")
+            self._f.write(HEADER.pack(MAGIC, VERSION))
+        # hinter dem letzten Record steht noch der alte Index (bzw. ein
+        # halber Record); das erste add() schneidet ihn ab
+        self._tail = append
+
+    def add(self, data, status, rom=None, key="", meta=None):
+        if len(data) != DATA_SIZE:
+            raise ValueError(f"Data Memory hat {len(data)} statt {DATA_SIZE} Bytes")
+        if len(status) != STATUS_SIZE:
+            raise ValueError(f"Status Memory hat {len(status)} statt {STATUS_SIZE} Bytes")
+        rom = bytes(rom) if rom else bytes(ROM_SIZE)
+        if len(rom) != ROM_SIZE:
+            raise ValueError(f"ROM hat {len(rom)} statt {ROM_SIZE} Bytes")
+        meta = meta or {}
+        meta_raw = json.dumps(dict(meta, key=key) if key else meta, ensure_ascii=False)
+        meta_raw = meta_raw.encode("utf-8")
+        if len(meta_raw) > META_SIZE:
+            # Schlüssel nur, wenn noch Platz ist (der Index hat ihn sowieso)
+            meta_raw = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        if len(meta_raw) > META_SIZE:
+            raise ValueError(f"Metadaten zu lang ({len(meta_raw)} > {META_SIZE} Bytes)")
+        key_raw = key.encode("utf-8")
+        if len(key_raw) > INDEX_ENTRY.size - 8:
+            raise ValueError(f"Schlüssel zu lang: {key}")
+
+        record = b"".join((rom, bytes(data), bytes(status), meta_raw.ljust(META_SIZE, b"\0")))
+        self._f.seek(self._end())
+        if self._tail:
+            self._f.truncate()
+            self._tail = False
+        self._f.write(record)
+        self._keys.append((key, zlib.crc32(record)))
+        return len(self._keys) - 1
+
+    def _end(self):
+        return HEADER_SIZE + len(self._keys) * RECORD_SIZE
+
+    def _write_index(self):
+        self._f.seek(self._end())
+        self._f.truncate()
+        self._f.write(b"".join(
+            INDEX_ENTRY.pack(key.encode("utf-8"), crc) for key, crc in self._keys
+        ))
+        self._f.write(FOOTER.pack(len(self._keys), INDEX_MAGIC))
+        self._f.flush()
+
+    # -------------------------------------------------
+    # Index + Fuß sofort schreiben
+    #
+    # Macht die Datei ohne close() wieder vollständig lesbar: nach einem
+    # Absturz (append=True, dann repair()) oder zwischendurch beim
+    # Packen. Weitere add() hängen danach wie gewohnt an. Liefert die
+    # Zahl der Records im Index.
+    def repair(self):
+        self._write_index()
+        self._tail = True
+        return len(self._keys)
+
+    def close(self):
+        if self._f is None:
+            return
+        self._write_index()
+        self._f.close()
+        self._f = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def keys(self):
+        return [key for key, _crc in self._keys]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -------------------------------------------------
+# Lesen (mmap, ohne Kopie)
+class DumpArchive:
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._f.close()
+            raise ValueError(f"{path}: leere Datei, kein Archiv")
+        self._view = memoryview(self._mm)
+
+        try:
+            magic, version = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{path}: zu kurz für ein Archiv")
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: kein DS2506-Archiv")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: Archiv-Version {version} unbekannt")
+
+        count, index_magic = FOOTER.unpack_from(self._mm, len(self._mm) - FOOTER.size)
+        index_offset = HEADER_SIZE + count * RECORD_SIZE
+        if (index_magic == INDEX_MAGIC
+                and index_offset + count * INDEX_ENTRY.size + FOOTER.size == len(self._mm)):
+            self.recovered = False
+            self._count = count
+            self._index_offset = index_offset
+        else:
+            # Index fehlt (Absturz beim Anhängen): alle vollständigen
+            # Records, ein halber am Ende fällt weg
+            self.recovered = True
+            self._count = (len(self._mm) - HEADER_SIZE) // RECORD_SIZE
+            self._index_offset = None
+        self._keys = None
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, i):
+        # -> (Schlüssel, CRC32); ohne Index aus dem Record selbst
+        if self._index_offset is None:
+            start = HEADER_SIZE + i * RECORD_SIZE
+            with self._view[start:start + RECORD_SIZE] as record:
+                return record_key(record), zlib.crc32(record)
+        key, crc = INDEX_ENTRY.unpack_from(self._mm, self._index_offset + i * INDEX_ENTRY.size)
+        return key.rstrip(b"\0").decode("utf-8"), crc
+
+    def key(self, i):
+        return self._entry(i)[0]
+
+    def crc32(self, i):
+        return self._entry(i)[1]
+
+    def keys(self):
+        if self._keys is None:
+            self._keys = [self.key(i) for i in range(self._count)]
+        return self._keys
+
+    def find(self, key):
+        # alle Record-Nummern mit diesem Schlüssel
+        return [i for i, k in enumerate(self.keys()) if k == key]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        key, crc = self._entry(i)
+        start = HEADER_SIZE + i * RECORD_SIZE
+        return ArchiveRecord(i, key, crc, self._view[start:start + RECORD_SIZE])
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def verify(self, i):
+        start = HEADER_SIZE + i * RECORD_SIZE
+        return zlib.crc32(self._view[start:start + RECORD_SIZE]) == self.crc32(i)
+
+    def close(self):
+        if self._f is None:
+            return
+        try:
+            self._view.release()
+            self._mm.close()
+        except BufferError:
+            # es hängen noch Record-Views dran (z.B. nach einer Exception);
+            # das mmap wird dann mit dem letzten View freigegeben
+            pass
+        self._f.close()
+        self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+# asyncio-Variante des DS2506Reader
+#
+# Für Dienste, die schon auf asyncio laufen: kein Thread pro Board,
+# sondern ein nicht-blockierender File-Deskriptor (termios-konfiguriert)
+# an der Event-Loop (loop.add_reader). Deshalb nur POSIX (Linux/macOS).
+# Funktioniert mit echten Ports ebenso wie mit einem pty, hinter dem ein
+# simulierter Reader läuft.
+#
+# Protokoll und Auswertung sind dieselben wie in read_ds2506.py; beide
+# Reader teilen sich ReaderProtocol aus ds2506_protocol.py.
+#
+# Beispiel:
+#   async with AsyncDS2506Reader("/dev/ttyUSB0") as reader:
+#       rom = await reader.get_rom_info()
+#       data = await reader.read_binary_data()
+import asyncio
+import fcntl
+import os
+import struct
+import termios
+import time
+
+from ds2506_crc import Crc16
+from ds2506_protocol import (
+    BINARY_MARKERS, DUMPALL_FRAME_SIZE, DUMPALL_MARKERS, FAST_BAUDRATES, PAGE_RECORD_SIZE,
+    PAGE_SIZE, PAGES_MARKERS, PROMPT_LINE, READ_MEMORY_HEADER, STATUS_MARKERS,
+    ReaderProtocol, baud_reply,
+)
+
+
+# -------------------------------------------------
+# Nicht-blockierender serieller Port über den File-Deskriptor
+#
+# Empfangene Bytes landen in einem Puffer; read_line / read_exact
+# warten per asyncio.Event bis zur Deadline (time.monotonic()).
+class AsyncSerialPort:
+    def __init__(self, port, baudrate=115200):
+        self.port = port
+        self.baudrate = baudrate
+        self.fd = None
+        self.error = None
+        self._buf = bytearray()
+        self._data_event = asyncio.Event()
+        self._loop = None
+
+    # -------------------------------------------------
+    # Öffnen / Schließen
+    def open(self, dtr=False):
+        self._loop = asyncio.get_running_loop()
+        self.fd = os.open(self.port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            self._configure(self.baudrate)
+            self.set_dtr(dtr)
+        except (OSError, termios.error):
+            os.close(self.fd)
+            self.fd = None
+            raise
+        self._loop.add_reader(self.fd, self._on_readable)
+
+    def close(self):
+        if self.fd is None:
+            return
+        self._loop.remove_reader(self.fd)
+        os.close(self.fd)
+        self.fd = None
+        self._data_event.set()
+
+    @property
+    def is_open(self):
+        return self.fd is not None
+
+    def _configure(self, baudrate):
+        speed = getattr(termios, f"B{baudrate}", None)
+        if speed is None:
+            raise ValueError(f"Baudrate {baudrate} wird von termios nicht unterstützt")
+
+        # Rohmodus 8N1, kein Echo, keine Zeilenbearbeitung
+        iflag, oflag, cflag, lflag, _ispeed, _ospeed, cc = termios.tcgetattr(self.fd)
+        iflag = 0
+        oflag = 0
+        lflag = 0
+        cflag = (cflag & ~(termios.CSIZE | termios.PARENB | termios.CSTOPB)) \
+            | termios.CS8 | termios.CREAD | termios.CLOCAL
+        cc[termios.VMIN] = 0
+        cc[termios.VTIME] = 0
+        termios.tcsetattr(
+            self.fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, speed, speed, cc]
+        )
+
+    def set_baudrate(self, baudrate):
+        self._configure(baudrate)
+        self.baudrate = baudrate
+
+    def set_dtr(self, state):
+        # DTR steuert den Auto-Reset des Arduino; ein pty kennt kein DTR
+        request = termios.TIOCMBIS if state else termios.TIOCMBIC
+        try:
+            fcntl.ioctl(self.fd, request, struct.pack("I", termios.TIOCM_DTR))
+        except OSError:
+            pass
+
+    # -------------------------------------------------
+    # Empfang (Callback der Event-Loop)
+    def _on_readable(self):
+        try:
+            chunk = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            # z.B. EIO, wenn die Gegenseite eines pty geschlossen wurde
+            chunk = b""
+            self.error = e
+        if not chunk:
+            if self.error is None:
+                self.error = EOFError("Port geschlossen")
+            self._loop.remove_reader(self.fd)
+        else:
+            self._buf.extend(chunk)
+        self._data_event.set()
+
+    def clear(self):
+        self._buf.clear()
+
+    async def _wait(self, ready, deadline):
+        while not ready():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self.error is not None or self.fd is None:
+                return False
+            self._data_event.clear()
+            try:
+                await asyncio.wait_for(self._data_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    async def read_line(self, deadline):
+        """Nächste Textzeile (ohne CR/LF) oder None bei Timeout."""
+        if not await self._wait(lambda: b"\n" in self._buf, deadline):
+            return None
+        idx = self._buf.index(b"\n")
+        raw = bytes(self._buf[:idx])
+        del self._buf[:idx + 1]
+        return raw.decode("utf-8", errors="ignore").rstrip("\r")
+
+    async def read_exact(self, n, deadline, progress=None):
+        """Genau n Bytes; bei Timeout das, was bis dahin da war."""
+        data = bytearray()
+        while len(data) < n:
+            if not await self._wait(lambda: len(self._buf) > 0, deadline):
+                break
+            take = min(n - len(data), len(self._buf))
+            data.extend(self._buf[:take])
+            del self._buf[:take]
+            if progress:
+                progress(len(data))
+        return bytes(data)
+
+    # -------------------------------------------------
+    # Senden (wartet bei vollem Ausgangspuffer auf Schreibbarkeit)
+    async def write(self, data):
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self.fd, view)
+                view = view[written:]
+            except BlockingIOError:
+                writable = self._loop.create_future()
+                self._loop.add_writer(self.fd, writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    self._loop.remove_writer(self.fd)
+
+
+# -------------------------------------------------
+# Reader mit awaitable API
+#
+# Gleiche Abläufe wie DS2506Reader (ping/PONG, 'baud', 'rom', 'binary',
+# 'sendstatus', 'dumpall', 'crcpages'), nur ohne Threads und ohne
+# Sleeps. Auswertung und Prüfungen kommen aus ReaderProtocol.
+class AsyncDS2506Reader(ReaderProtocol):
+    def __init__(self, port, baudrate=115200, fast_baudrates=FAST_BAUDRATES):
+        self.port = port
+        self.baudrate = baudrate
+        self.fast_baudrates = fast_baudrates
+        self.serial = None
+        self.memory_size = 8192
+        self.has_dumpall = None
+
+        # Ausgabe wie beim DS2506Reader: log(...) mit print-Signatur
+        self.log = print
+        self.progress = True
+
+    def _log(self, *args, **kwargs):
+        self.log(*args, **kwargs)
+
+    async def __aenter__(self):
+        if not await self.connect():
+            raise ConnectionError(f"Reader an {self.port} antwortet nicht")
+        return self
+
+    async def __aexit__(self, *exc):
+        self.disconnect()
+
+    # -------------------------------------------------
+    # Verbindung
+    async def connect(self, reset=False, timeout=5.0):
+        try:
+            self.serial = AsyncSerialPort(self.port, self.baudrate)
+            self.serial.open(dtr=reset)
+        except (OSError, ValueError, termios.error) as e:
+            self._log(f"Fehler beim Verbinden: {e}")
+            self.serial = None
+            return False
+        self._log(f"Verbunden mit {self.port} @ {self.baudrate} baud")
+
+        t0 = time.monotonic()
+        if not await self._handshake(timeout):
+            self._log(f"Reader antwortet nicht (kein PONG nach {timeout:.1f}s).")
+            self.disconnect()
+            return False
+        self._log(f"Reader bereit nach {time.monotonic() - t0:.2f}s")
+
+        if self.fast_baudrates:
+            await self.negotiate_baudrate(self.fast_baudrates)
+        return True
+
+    def disconnect(self):
+        if self.serial and self.serial.is_open:
+            self.serial.close()
+            self._log("Verbindung geschlossen")
+        self.serial = None
+
+    def _is_connected(self):
+        if not self.serial or not self.serial.is_open:
+            self._log("Nicht verbunden!")
+            return False
+        if self.serial.error is not None:
+            self._log(f"Serielle Verbindung unterbrochen: {self.serial.error}")
+            return False
+        return True
+
+    # Bereitschafts-Handshake, siehe DS2506Reader._handshake
+    async def _handshake(self, timeout, attempt_timeout=0.3):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await self.serial.write(b"ping\n")
+            attempt_deadline = min(deadline, time.monotonic() + attempt_timeout)
+            while True:
+                line = await self.serial.read_line(attempt_deadline)
+                if line is None:
+                    break
+                reply = self._handshake_line(line)
+                if reply == "ready":
+                    if self.has_ping:
+                        await self._read_until_prompt(time.monotonic() + 0.5, echo=None)
+                    self.serial.clear()
+                    return True
+                if reply == "banner":
+                    attempt_deadline = min(deadline, time.monotonic() + attempt_timeout)
+            if self.serial.error is not None:
+                return False
+        return False
+
+    # Schnellere Baudrate aushandeln, siehe DS2506Reader.negotiate_baudrate
+    async def negotiate_baudrate(self, rates):
+        if not self.has_ping:
+            self._log("Sketch ohne 'ping' (kein PONG), bleibe bei", self.baudrate)
+            return self.baudrate
+
+        for rate in rates:
+            if rate == self.baudrate:
+                break
+
+            lines = await self.send_command(
+                f"baud {rate}", timeout=1.0, terminator=(f"BAUD_OK {rate}", PROMPT_LINE)
+            )
+            reply = baud_reply(lines, rate)
+            if reply == "unsupported":
+                self._log("Sketch kennt 'baud' nicht, bleibe bei", self.baudrate)
+                break
+            if reply != "ok":
+                continue
+
+            old_rate = self.baudrate
+            try:
+                self.serial.set_baudrate(rate)
+            except (ValueError, termios.error) as e:
+                # Sketch fällt nach 2 s von selbst zurück
+                self._log(f"Baudrate {rate} am Port nicht einstellbar: {e}")
+                await self._read_until_prompt(time.monotonic() + 3, echo=None)
+                self.serial.clear()
+                continue
+            self.serial.clear()
+
+            if await self._confirm_baudrate():
+                self.baudrate = rate
+                self._log(f"Baudrate umgeschaltet: {old_rate} -> {rate}")
+                return rate
+
+            self._log(f"Baudrate {rate} nicht stabil, zurück auf {old_rate}")
+            self.serial.set_baudrate(old_rate)
+            self.serial.clear()
+            await self._read_until_prompt(time.monotonic() + 3, echo=None)
+            self.serial.clear()
+
+        return self.baudrate
+
+    async def _confirm_baudrate(self, attempts=3):
+        for _ in range(attempts):
+            await self.serial.write(b"ping\n")
+            deadline = time.monotonic() + 0.3
+            while True:
+                line = await self.serial.read_line(deadline)
+                if line is None:
+                    break
+                if line.strip() == "PONG":
+                    await self._read_until_prompt(time.monotonic() + 0.5, echo=None)
+                    self.serial.clear()
+                    return True
+        return False
+
+    async def _read_until_prompt(self, deadline, end_marker=None, echo="< "):
+        lines = []
+        while True:
+            line = await self.serial.read_line(deadline)
+            if line is None:
+                return lines, False
+            line = line.strip()
+            if not line:
+                continue
+            if echo is not None:
+                self._log(f"{echo}{line}")
+            lines.append(line)
+            if end_marker and line == end_marker and echo is not None:
+                self._log("Ende-Marker erkannt:", end_marker)
+            if line == PROMPT_LINE:
+                return lines, True
+
+    # -------------------------------------------------
+    # Roh-Kommando, siehe DS2506Reader.send_command
+    async def send_command(self, cmd, timeout=15.0, terminator=PROMPT_LINE):
+        if not self._is_connected():
+            return None
+        if isinstance(terminator, str):
+            terminator = (terminator,)
+
+        self.serial.clear()
+        await self.serial.write(f"{cmd}\n".encode())
+        deadline = time.monotonic() + timeout
+
+        output = []
+        while True:
+            line = await self.serial.read_line(deadline)
+            if line is None:
+                if terminator:
+                    self._log(f"Timeout: keine Abschlusszeile nach {timeout:.1f}s")
+                break
+            line = line.rstrip()
+            if line:
+                self._log(line)
+                output.append(line)
+                if terminator and line in terminator:
+                    break
+
+        return output
+
+    async def get_rom_info(self):
+        lines = await self.send_command("rom")
+        return self.analyze_rom_bytes(self.parse_rom_lines(lines))
+
+    # -------------------------------------------------
+    # Binärblöcke
+    async def _wait_for_start_marker(self, markers, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            line = await self.serial.read_line(deadline)
+            if line is None:
+                return None, None
+            pair = self._start_marker(line, markers)
+            if pair is not None:
+                return pair
+
+    async def _receive_payload(self, size, timeout):
+        start_time = time.monotonic()
+
+        def progress(n):
+            if not self.progress:
+                return
+            elapsed = time.monotonic() - start_time
+            self._log(
+                f"\rFortschritt: {n * 100 // size}% ({n}/{size}) - {elapsed:.1f}s",
+                end="",
+            )
+
+        data = await self.serial.read_exact(size, start_time + timeout, progress)
+        self._log("\nFertig! Länge empfangen:", len(data))
+        return data
+
+    # Kommando senden, Block fester Länge lesen; check(data, lines) prüft
+    # ihn zusammen mit den Zeilen bis zum Prompt (z.B. CRC16=)
+    async def _read_block(self, cmd, markers, size, timeout, check=None):
+        if not self._is_connected():
+            return None
+
+        self._log(f"Sende '{cmd}' Kommando...")
+        self.serial.clear()
+        await self.serial.write(f"{cmd}\n".encode())
+
+        start_marker, end_marker = await self._wait_for_start_marker(markers)
+        if start_marker is None:
+            self._log(f"Kein Start-Marker ({', '.join(markers)}) erkannt.")
+            return None
+
+        data = await self._receive_payload(size, timeout)
+        lines, _ = await self._read_until_prompt(time.monotonic() + 2, end_marker)
+        if len(data) != size:
+            self._log(f"WARNUNG: Falsche Länge ({len(data)} statt {size})")
+            return None
+        if check is not None and not check(data, lines):
+            return None
+        return data
+
+    async def read_binary_data(self):
+        return await self._read_block(
+            "binary",
+            BINARY_MARKERS,
+            self.memory_size,
+            timeout=30.0,
+            check=lambda data, lines: self._check_binary_crc(
+                Crc16(READ_MEMORY_HEADER).update(data), lines
+            ),
+        )
+
+    async def read_status_data(self):
+        return await self._read_block("sendstatus", STATUS_MARKERS, 256, timeout=10.0)
+
+    # -------------------------------------------------
+    # ROM + Data (mit Page-CRC) + Status in einem Frame ('dumpall'),
+    # siehe DS2506Reader.read_dump_all
+    async def read_dump_all(self, retries=3):
+        if not self._is_connected():
+            return None
+
+        for attempt in range(retries + 1):
+            if attempt:
+                self._log(f"dumpall wird wiederholt - Versuch {attempt}/{retries}")
+            frame = await self._read_dump_all_frame()
+            if frame is None:
+                return None
+            checked = self._split_dump_frame(frame)
+            if checked is None:
+                continue
+
+            rom, records, status = checked
+            rom_info = self.analyze_rom_bytes(rom)
+            data, bad_pages = self._check_page_records(records)
+            for page in bad_pages:
+                # fehlerhafte Pages einzeln nachladen (ein Versuch je Page)
+                result = await self.read_pages(page, 1)
+                if result is None or result[1]:
+                    self._log(f"FEHLER: Page {page} weiterhin fehlerhaft")
+                    return None
+                data[page * PAGE_SIZE:(page + 1) * PAGE_SIZE] = result[0]
+            return rom_info, bytes(data), status
+
+        self._log("FEHLER: ROM/Status Memory nach Wiederholungen weiterhin fehlerhaft")
+        return None
+
+    async def _read_dump_all_frame(self):
+        self._log("Sende 'dumpall' Kommando...")
+        self.serial.clear()
+        await self.serial.write(b"dumpall\n")
+
+        start_marker, end_marker = await self._wait_for_start_marker(DUMPALL_MARKERS)
+        if start_marker is None:
+            self._log("Kein DUMPALL_START erkannt.")
+            return None
+
+        frame = await self._receive_frame(DUMPALL_FRAME_SIZE, timeout=30.0)
+        if frame is None:
+            return None
+        self.has_dumpall = True
+        lines, _ = await self._read_until_prompt(time.monotonic() + 2, end_marker)
+        if "DUMPALL_ERROR" in lines:
+            self._log("Fehler beim Lesen des Status Memory!")
+            return None
+        return frame
+
+    async def _receive_frame(self, expected, timeout):
+        header = await self.serial.read_exact(2, time.monotonic() + 2)
+        frame_len = self._frame_length(header, expected)
+        if frame_len is None:
+            return None
+        frame = await self._receive_payload(frame_len, timeout)
+        if len(frame) != frame_len:
+            self._log(f"WARNUNG: Frame unvollständig ({len(frame)} statt {frame_len})")
+            return None
+        return frame
+
+    async def read_pages(self, first_page, count):
+        if not self._is_connected():
+            return None
+
+        self.serial.clear()
+        await self.serial.write(f"crcpages {first_page} {count}\n".encode())
+        start_marker, end_marker = await self._wait_for_start_marker(PAGES_MARKERS)
+        if start_marker is None:
+            return None
+        raw = await self._receive_frame(count * PAGE_RECORD_SIZE, timeout=30.0)
+        await self._read_until_prompt(time.monotonic() + 2, end_marker, echo=None)
+        if raw is None:
+            return None
+        return self._check_page_records(raw, first_page)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# CRC8 / CRC16 (Dallas/Maxim) mit vorberechneten Tabellen
+#
+#   CRC8  Polynom 0x8C (x^8 + x^5 + x^4 + 1)        -> ROM Code
+#   CRC16 Polynom 0xA001 (x^16 + x^15 + x^2 + 1)    -> Data/Status Memory
+#
+# Beide werden LSB-first gerechnet, genau wie OneWire::crc8/crc16.
+# Der DS2506 sendet die CRC16 invertiert (~crc, LSB zuerst).
+#
+# Neben den Funktionen gibt es inkrementelle Objekte (Crc8, Crc16), die
+# man stückweise füttern kann, z.B. direkt beim Empfang:
+#   crc = Crc16(b"\xF0\x00\x00")   # Kommando + Adresse wie beim Chip
+#   crc.update(chunk) ...
+#   ok = crc.matches_inverted(chip_crc)
+
+
+def _make_table(poly, width):
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x01:
+                crc = (crc >> 1) ^ poly
+            else:
+                crc >>= 1
+        table.append(crc & ((1 << width) - 1))
+    return tuple(table)
+
+
+CRC8_TABLE = _make_table(0x8C, 8)
+CRC16_TABLE = _make_table(0xA001, 16)
+
+
+# -------------------------------------------------
+# Einmal-Berechnung
+def crc8(data, crc=0):
+    table = CRC8_TABLE
+    for b in data:
+        crc = table[crc ^ b]
+    return crc
+
+
+def crc16(data, crc=0):
+    table = CRC16_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return crc
+
+
+# -------------------------------------------------
+# Inkrementell
+class Crc8:
+    __slots__ = ("value",)
+
+    def __init__(self, data=b"", crc=0):
+        self.value = crc
+        self.update(data)
+
+    def update(self, data):
+        self.value = crc8(data, self.value)
+        return self
+
+
+class Crc16:
+    __slots__ = ("value",)
+
+    def __init__(self, data=b"", crc=0):
+        self.value = crc
+        self.update(data)
+
+    def update(self, data):
+        self.value = crc16(data, self.value)
+        return self
+
+    @property
+    def inverted(self):
+        # so, wie der DS2506 sie sendet
+        return self.value ^ 0xFFFF
+
+    def matches_inverted(self, chip_crc):
+        return self.inverted == chip_crc
+
+
+# -------------------------------------------------
+# DS2506-spezifisch
+def rom_crc_ok(rom_bytes):
+    return len(rom_bytes) == 8 and crc8(rom_bytes[:7]) == rom_bytes[7]
+
+
+def read_memory_crc16(data, addr=0x0000):
+    # CRC16 (invertiert), die der Chip nach READ MEMORY (F0h) ab addr
+    # bis Speicherende liefert: über Kommando, Adresse und alle Daten
+    return Crc16(bytes((0xF0, addr & 0xFF, (addr >> 8) & 0xFF))).update(data).inverted
+
+
+def page_crc16(page_data):
+    # CRC16 (invertiert) einer Page, wie bei EXTENDED READ MEMORY (A5h)
+    return crc16(page_data) ^ 0xFFFF
+
+
+def check_page_records(raw, first_page=0, page_size=32):
+    """Page-Records (Daten + CRC16 LSB zuerst) prüfen.
+
+    Liefert (Daten als bytearray, Liste der Pages mit CRC-Fehler).
+    """
+    record_size = page_size + 2
+    view = memoryview(raw)
+    data = bytearray()
+    bad_pages = []
+    for i in range(len(view) // record_size):
+        rec = view[i * record_size:(i + 1) * record_size]
+        page_data = rec[:page_size]
+        chip_crc = rec[page_size] | (rec[page_size + 1] << 8)
+        if crc16(page_data) ^ 0xFFFF != chip_crc:
+            bad_pages.append(first_page + i)
+        data += page_data
+    return data, bad_pages
+
+
+def status_crc_blocks(status, block_size=8):
+    # CRC16 (invertiert) je Block bei READ STATUS (AAh) ab Adresse 0: der
+    # erste Block zählt Kommando und Adresse mit, jeder weitere beginnt neu
+    crcs = []
+    crc = crc16(b"\xAA\x00\x00")
+    for off in range(0, len(status), block_size):
+        crcs.append(crc16(status[off:off + block_size], crc) ^ 0xFFFF)
+        crc = 0
+    return crcs
+
+
+def check_status_blocks(raw, block_size=8):
+    """Status-Blöcke (Daten + CRC16 LSB zuerst, ab Adresse 0) prüfen.
+
+    Liefert (Status als bytearray, Liste der Startadressen mit CRC-Fehler).
+    """
+    record_size = block_size + 2
+    view = memoryview(raw)
+    status = bytearray()
+    bad_blocks = []
+    crc = crc16(b"\xAA\x00\x00")
+    for i in range(len(view) // record_size):
+        rec = view[i * record_size:(i + 1) * record_size]
+        chip_crc = rec[block_size] | (rec[block_size + 1] << 8)
+        if crc16(rec[:block_size], crc) ^ 0xFFFF != chip_crc:
+            bad_blocks.append(i * block_size)
+        status += rec[:block_size]
+        crc = 0
+    return status, bad_blocks
+
+
+def verify_dumps(dumps, expected_crcs, addr=0x0000):
+    """Viele gespeicherte Dumps gegen bekannte READ-MEMORY-CRCs prüfen.
+
+    Liefert die Indizes der Dumps, deren CRC nicht passt.
+    """
+    return [
+        i for i, (data, expected) in enumerate(zip(dumps, expected_crcs))
+        if read_memory_crc16(data, addr) != expected
+    ]
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# Dumps vergleichen: einer gegen einen, einer gegen viele, alle gegen alle
+#
+# diff_dumps(a, b) vergleicht zwei Data/Status-Paare inhaltlich:
+#   pages     geänderte Pages mit Bytebereichen (absolute Adressen)
+#   status    gekippte Bits je Status-Byte (siehe status_flips)
+#   wp, cp    Pages, die neu gesperrt bzw. freigegeben sind
+#   fields    geänderte Felder aus build_prefix (Gerätenummer,
+#             Zulassungsnummer) - dekodiert, wenn prefix_fields übergeben
+#             wird (DS2506Reader.decode_prefix_fields), sonst als Hex
+#
+# Ähnlichkeit vieler Dumps (optional, NumPy): Page-Hash-Jaccard, d.h.
+# Anteil gleicher Pages an derselben Stelle unter allen belegten
+# (nicht-FF) Pages beider Dumps; zwei leere Dumps gelten als gleich.
+# Jede (Page-Nummer, Inhalt)-Kombination ist ein Merkmal; gezählt werden
+# nur Merkmale, die mindestens zwei Dumps haben - Pages, die nur ein
+# Gerät hat (Seriennummern, Kalibrierung), gehen nur in die Anzahl
+# belegter Pages ein. Merkmale mit genau denselben Dumps (die Pages
+# einer Modellfamilie) werden zu einem gewichteten zusammengefasst.
+#
+# Dumps ohne gemeinsames Merkmal haben Jaccard 0; gerechnet wird daher
+# nur innerhalb von Gruppen, die über Merkmale zusammenhängen, und dort
+# blockweise über die Zeilen (jaccard_blocks): die Schnittmengen je
+# Block entweder durch Aufaddieren der Dumps je Merkmal (Aufwand ~
+# Summe df^2) oder, wenn viele Merkmale breit geteilt sind, als
+# Matrixmultiplikation X @ X.T. Die ganze N x N-Matrix liegt nie im
+# Speicher, nur Block x Gruppengröße.
+#
+# python -m pip install numpy
+#
+# Beispiel:
+#   diff = diff_dumps(a_data, a_status, b_data, b_status,
+#                     prefix_fields=reader.decode_prefix_fields)
+#   print("\n".join(format_diff(diff)))
+#   for i, j, jac, shared in similar_pairs(data_dumps, min_jaccard=0.9):
+#       ...
+from ds2506_numpy import _require_numpy, np, page_occupancy, stack_dumps
+
+PAGE_SIZE = 32
+PAGE_COUNT = 256
+WP_END = 0x20
+EPROM_END = 0x40
+CP_START = 0x100
+
+# Bytes hinter den Feldern von build_prefix (siehe decode_prefix_fields)
+PREFIX_FIELDS = {
+    "device": (0x07EC, 0x07F0),
+    "zulassung": (0x07F2, 0x07F6),
+}
+
+# Zeilen pro Block bei jaccard_blocks (Block x Gruppengröße float32)
+JACCARD_BLOCK = 1024
+
+
+def byte_ranges(old, new, base=0):
+    # geänderte Bytes -> [[erste, letzte], ...], Adressen ab base
+    ranges = []
+    for i, (a, b) in enumerate(zip(old, new)):
+        if a == b:
+            continue
+        if ranges and ranges[-1][1] == base + i - 1:
+            ranges[-1][1] = base + i
+        else:
+            ranges.append([base + i, base + i])
+    return ranges
+
+
+def status_field(addr):
+    # (Feld, erste Page) für ein Status-Byte; erste Page None ohne Page-Bezug
+    if addr < WP_END:
+        return "WP", addr * 8
+    if addr < EPROM_END:
+        return "EPROM", None
+    if CP_START <= addr < CP_START + PAGE_COUNT // 8:
+        return "CP", (addr - CP_START) * 8
+    return "STATUS", None
+
+
+def status_flips(old, new):
+    # ein dict pro geändertem Status-Byte: addr, old/new (Hex), cleared/set
+    # (Bitnummern 1->0 bzw. 0->1), field, pages (betroffene Pages bei WP/CP)
+    flips = []
+    for addr, (a, b) in enumerate(zip(old, new)):
+        if a == b:
+            continue
+        diff = a ^ b
+        cleared = [bit for bit in range(8) if diff & a & (1 << bit)]
+        set_ = [bit for bit in range(8) if diff & b & (1 << bit)]
+        field, first_page = status_field(addr)
+        flips.append({
+            "addr": addr,
+            "old": f"{a:02X}",
+            "new": f"{b:02X}",
+            "cleared": cleared,
+            "set": set_,
+            "field": field,
+            "pages": [] if first_page is None
+                     else [first_page + bit for bit in cleared + set_],
+        })
+    return flips
+
+
+# -------------------------------------------------
+# Zwei Dumps
+def diff_pages(a_data, b_data):
+    # [{"page", "addr", "ranges", "bytes"}, ...] für alle geänderten Pages
+    a_view, b_view = memoryview(a_data), memoryview(b_data)
+    if a_view == b_view:
+        return []
+    pages = []
+    for page in range(min(len(a_view), len(b_view)) // PAGE_SIZE):
+        start = page * PAGE_SIZE
+        old = a_view[start:start + PAGE_SIZE]
+        new = b_view[start:start + PAGE_SIZE]
+        if old == new:
+            continue
+        ranges = byte_ranges(old, new, start)
+        pages.append({
+            "page": page,
+            "addr": start,
+            "ranges": ranges,
+            "bytes": sum(last - first + 1 for first, last in ranges),
+        })
+    return pages
+
+
+def diff_dumps(a_data, a_status, b_data, b_status, prefix_fields=None):
+    """Inhaltlicher Vergleich a -> b (Aufbau siehe Kopf der Datei)."""
+    pages = diff_pages(a_data, b_data)
+    flips = status_flips(a_status, b_status) if a_status is not None and b_status is not None else []
+
+    protection = {"wp": {"added": [], "removed": []}, "cp": {"added": [], "removed": []}}
+    for flip in flips:
+        key = flip["field"].lower()
+        if key not in protection:
+            continue
+        _field, first_page = status_field(flip["addr"])
+        # Bit = 0 bedeutet gesperrt: 1->0 sperrt, 0->1 gibt frei
+        protection[key]["added"] += [first_page + bit for bit in flip["cleared"]]
+        protection[key]["removed"] += [first_page + bit for bit in flip["set"]]
+
+    fields = {}
+    changed = {p["page"] for p in pages}
+    if prefix_fields is not None:
+        old_values = dict(zip(PREFIX_FIELDS, prefix_fields(a_data)))
+        new_values = dict(zip(PREFIX_FIELDS, prefix_fields(b_data)))
+    for name, (start, end) in PREFIX_FIELDS.items():
+        if not any(page * PAGE_SIZE < end and start < (page + 1) * PAGE_SIZE for page in changed):
+            continue
+        if prefix_fields is not None:
+            old, new = old_values[name], new_values[name]
+        else:
+            old, new = bytes(a_data[start:end]).hex().upper(), bytes(b_data[start:end]).hex().upper()
+        if old != new:
+            fields[name] = [old, new]
+
+    return {
+        "identical": not pages and not flips,
+        "pages": pages,
+        "changed_bytes": sum(p["bytes"] for p in pages),
+        "status": flips,
+        "wp": protection["wp"],
+        "cp": protection["cp"],
+        "fields": fields,
+    }
+
+
+def page_jaccard(a_data, b_data):
+    # Page-Hash-Jaccard zweier Dumps ohne NumPy -> (jaccard, gemeinsame Pages)
+    a_view, b_view = memoryview(a_data), memoryview(b_data)
+    shared = used = 0
+    for start in range(0, min(len(a_view), len(b_view)), PAGE_SIZE):
+        a_page = bytes(a_view[start:start + PAGE_SIZE])
+        b_page = bytes(b_view[start:start + PAGE_SIZE])
+        a_used = a_page.count(0xFF) != PAGE_SIZE
+        b_used = b_page.count(0xFF) != PAGE_SIZE
+        if a_used and b_used and a_page == b_page:
+            shared += 1
+            used += 1
+        else:
+            used += a_used + b_used
+    return (shared / used if used else 1.0), shared
+
+
+def _format_pages(pages):
+    # [3, 4, 5, 9] -> "3-5,9"
+    out = []
+    for page in sorted(pages):
+        if out and out[-1][1] == page - 1:
+            out[-1][1] = page
+        else:
+            out.append([page, page])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in out) or "-"
+
+
+FIELD_LABELS = {"device": "Gerätenummer", "zulassung": "Zulassungsnummer"}
+
+
+def format_diff(diff):
+    # Textzeilen für die Konsole
+    if diff["identical"]:
+        return ["Identisch (Data + Status)."]
+    lines = [f"Geänderte Pages: {len(diff['pages'])} ({diff['changed_bytes']} Bytes)"]
+    for p in diff["pages"]:
+        ranges = ", ".join(
+            f"0x{a:04X}" if a == b else f"0x{a:04X}-0x{b:04X}" for a, b in p["ranges"]
+        )
+        lines.append(f"  Page {p['page']:03d} (0x{p['addr']:04X}): {ranges}")
+    for key in ("wp", "cp"):
+        change = diff[key]
+        if change["added"] or change["removed"]:
+            lines.append(
+                f"{key.upper()}: neu gesperrt {_format_pages(change['added'])}, "
+                f"freigegeben {_format_pages(change['removed'])}"
+            )
+    other = [f for f in diff["status"] if f["field"] not in ("WP", "CP")]
+    for flip in other:
+        lines.append(
+            f"Status 0x{flip['addr']:02X} ({flip['field']}): {flip['old']} -> {flip['new']}"
+        )
+    for name, (old, new) in diff["fields"].items():
+        lines.append(f"{FIELD_LABELS.get(name, name)}: {old} -> {new}")
+    return lines
+
+
+# -------------------------------------------------
+# Viele Dumps: Page-Hash-Jaccard (NumPy)
+def _row_ids(rows):
+    # gleiche Zeilen -> gleiche Nummer. rows: uint64 (M, k); lexsort über
+    # die Spalten ist viel schneller als np.unique(axis=0).
+    # -> (Nummer je Zeile, je Nummer eine Beispielzeile, Anzahl je Nummer)
+    order = np.lexsort(rows.T[::-1])
+    ordered = rows[order]
+    new = np.ones(len(rows), dtype=bool)
+    new[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    ids = np.empty(len(rows), dtype=np.int64)
+    ids[order] = np.cumsum(new) - 1
+    starts = np.flatnonzero(new)
+    return ids, order[starts], np.diff(np.append(starts, len(rows)))
+
+
+def page_features(data_dumps):
+    """(X, Gewichte, belegte Pages je Dump) für die Schnittmengen-Zählung.
+
+    X: bool (N, Spalten). Merkmale, die genau dieselben Dumps haben (z.B.
+    alle Pages einer Modellfamilie), sind zu einer Spalte zusammengefasst;
+    Gewicht = Anzahl Merkmale dahinter. Gemeinsame Pages von i und j =
+    sum(X[i] & X[j] * Gewichte).
+    """
+    stack = stack_dumps(data_dumps, PAGE_COUNT * PAGE_SIZE)
+    n = len(stack)
+    occupied = page_occupancy(stack)
+    used = occupied.sum(axis=1)
+
+    # belegte Pages als je 4 x uint64 -> Inhalts-Nummer
+    flat = np.flatnonzero(occupied.ravel())
+    pages = stack.reshape(n * PAGE_COUNT, PAGE_SIZE)[flat]
+    content_id, _first, _counts = _row_ids(pages.view(np.uint64))
+
+    # Merkmal = (Page-Nummer, Inhalt); nur Merkmale mit >= 2 Dumps
+    key = (flat % PAGE_COUNT).astype(np.int64) * (int(content_id.max(initial=0)) + 1) + content_id
+    _keys, feature, counts = np.unique(key, return_inverse=True, return_counts=True)
+    feature = feature.ravel()
+    shared = counts >= 2
+    column = np.cumsum(shared) - 1
+    keep = shared[feature]
+
+    columns = np.zeros((int(shared.sum()), n), dtype=bool)
+    columns[column[feature[keep]], flat[keep] // PAGE_COUNT] = True
+    if not len(columns):
+        return np.zeros((n, 0), dtype=bool), np.zeros(0, dtype=np.float32), used
+    packed = np.packbits(columns, axis=1)
+    packed = np.pad(packed, ((0, 0), (0, -packed.shape[1] % 8)))
+    _ids, first, weights = _row_ids(packed.view(np.uint64))
+    return columns[first].T, weights.astype(np.float32), used
+
+
+def similarity_groups(postings, used):
+    # Dumps in Gruppen, die untereinander Pages teilen (Zusammenhangs-
+    # komponenten); zwischen Gruppen ist Jaccard 0. Leere Dumps bilden
+    # eine gemeinsame Gruppe (untereinander Jaccard 1).
+    parent = list(range(len(used)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for members in postings:
+        first = root(int(members[0]))
+        for i in members[1:].tolist():
+            parent[root(i)] = first
+    empty = np.flatnonzero(used == 0).tolist()
+    for i in empty[1:]:
+        parent[root(i)] = root(empty[0])
+
+    groups = {}
+    for i in range(len(used)):
+        groups.setdefault(root(i), []).append(i)
+    return [np.array(g) for g in groups.values()]
+
+
+def jaccard_blocks(data_dumps, rows=None, block=JACCARD_BLOCK):
+    """Je Block (Zeilen, Spalten, Jaccard, gemeinsame Pages).
+
+    Nur Paare, die mindestens eine Page teilen (sonst Jaccard 0), landen
+    in einem Block; jede Zeile sieht dabei alle solchen Spalten. rows:
+    nur diese Dumps gegen alle (Standard: alle gegen alle).
+    """
+    _require_numpy()
+    features, weights, used = page_features(data_dumps)
+    postings = [np.flatnonzero(col) for col in features.T]
+    used = used.astype(np.float32)
+    wanted = None if rows is None else set(np.asarray(rows).tolist())
+
+    groups = similarity_groups(postings, used)
+    group_of = np.empty(len(used), dtype=np.int64)
+    local = np.empty(len(used), dtype=np.int64)   # Stelle innerhalb der Gruppe
+    for g, group in enumerate(groups):
+        group_of[group] = g
+        local[group] = np.arange(len(group))
+    group_cols = [[] for _ in groups]
+    for c, members in enumerate(postings):
+        group_cols[group_of[members[0]]].append(c)
+
+    for group, cols in zip(groups, group_cols):
+        group_rows = group if wanted is None else group[[i in wanted for i in group.tolist()]]
+        for start in range(0, len(group_rows), block):
+            idx = group_rows[start:start + block]
+            shared = _shared_pages(idx, group, cols, features, weights, postings, local)
+            union = used[idx, None] + used[None, group] - shared
+            jaccard = np.divide(shared, union, out=np.ones_like(shared), where=union > 0)
+            # ein Dump ist sich selbst gleich, auch mit Pages, die sonst keiner hat
+            self_hit = idx[:, None] == group[None, :]
+            jaccard[self_hit] = 1.0
+            shared[self_hit] = used[idx]
+            yield idx, group, jaccard, shared.astype(np.int32)
+
+
+# BLAS schafft grob so viele Multiply-Adds wie NumPy Einzel-Additionen
+# per Fancy-Index; danach wird zwischen den beiden Wegen gewählt
+DENSE_SPEEDUP = 32
+
+
+def _shared_pages(idx, group, cols, features, weights, postings, local):
+    # gemeinsame Pages (len(idx), len(group)) als float32. Dumps haben nur
+    # wenige belegte Pages: meist ist es billiger, je Merkmal dessen Dumps
+    # direkt aufzuaddieren (Aufwand ~ Summe df^2), als X @ X.T zu rechnen.
+    # Bei vielen breit geteilten Merkmalen gewinnt die Matrixmultiplikation.
+    block_row = np.full(len(group), -1)
+    block_row[local[idx]] = np.arange(len(idx))
+    hits = []
+    scatter_cost = 0
+    for c in cols:
+        members = local[postings[c]]
+        r = block_row[members]
+        r = r[r >= 0]
+        if len(r):
+            hits.append((r, members, weights[c]))
+            scatter_cost += len(r) * len(members)
+
+    if scatter_cost * DENSE_SPEEDUP > len(idx) * len(group) * len(cols):
+        x = features[np.ix_(group, cols)].astype(np.float32)
+        return (x[local[idx]] * weights[cols]) @ x.T
+
+    shared = np.zeros((len(idx), len(group)), dtype=np.float32)
+    for r, members, weight in hits:
+        shared[np.ix_(r, members)] += weight
+    return shared
+
+
+def jaccard_matrix(data_dumps):
+    # ganze N x N-Matrix - nur für überschaubare N
+    n = len(data_dumps)
+    matrix = np.zeros((n, n), dtype=np.float32)
+    for idx, cols, jaccard, _shared in jaccard_blocks(data_dumps):
+        matrix[np.ix_(idx, cols)] = jaccard
+    return matrix
+
+
+def similar_pairs(data_dumps, min_jaccard=0.0, top=None, rows=None, block=JACCARD_BLOCK):
+    """(i, j, jaccard, gemeinsame Pages) mit i != j und jaccard > 0, >= min_jaccard.
+
+    Ohne top jedes Paar einmal (i < j; mit rows: i aus rows), mit top
+    je Dump i die top ähnlichsten j (absteigend).
+    """
+    for idx, cols, jaccard, shared in jaccard_blocks(data_dumps, rows, block):
+        if rows is None and top is None:
+            jaccard[cols[None, :] <= idx[:, None]] = -1.0  # jedes Paar nur einmal
+        else:
+            jaccard[cols[None, :] == idx[:, None]] = -1.0  # sich selbst nie
+        hits = (jaccard > 0) & (jaccard >= min_jaccard)
+        for r in range(len(idx)):
+            found = np.flatnonzero(hits[r])
+            if top is not None:
+                found = found[np.argsort(-jaccard[r, found], kind="stable")[:top]]
+            for c in found:
+                yield int(idx[r]), int(cols[c]), float(jaccard[r, c]), int(shared[r, c])
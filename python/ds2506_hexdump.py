@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# Hexdump-Formatierung (eine Implementierung für alle Ausgaben)
+#
+#   0000: 8B 52 EB 00 00 70 5E B9 FF FF FF FF FF FF FF FF  .R...p^.........
+#
+# Statt pro Byte ein f-String und ein chr() wird ein ganzer Block auf
+# einmal mit bytes.hex(" ") bzw. bytes.translate() umgesetzt und dann nur
+# noch in Zeilen zerschnitten. hexdump_lines() ist ein Generator,
+# write_hexdump() schreibt direkt in ein Dateiobjekt - ein ganzes Archiv
+# geht so durch, ohne dass je mehr als ein Block im Speicher liegt.
+#
+# Beispiel:
+#   with open("hexdump.hex", "w") as f:
+#       write_hexdump(f, data, upper=False)
+#   lines = list(hexdump_lines(data[0x40:0x60], 0x40, indent="  "))
+
+LINE_BYTES = 16
+HEX_WIDTH = LINE_BYTES * 3 - 1   # "8B 52 ... B9" ohne Leerzeichen am Ende
+BLOCK_BYTES = 4096   # so viele Bytes werden pro Schritt umgesetzt
+
+# druckbares ASCII bleibt, alles andere wird '.'
+ASCII_TABLE = bytes(b if 32 <= b < 127 else 0x2E for b in range(256))
+
+
+def hexdump_lines(data, start_addr=0, upper=True, indent=""):
+    """Zeilen (ohne Zeilenende) für data; data[0] liegt auf start_addr."""
+    view = memoryview(data).cast("B")
+    addr_fmt = indent + ("%04X: " if upper else "%04x: ")
+    for block_start in range(0, len(view), BLOCK_BYTES):
+        block = view[block_start:block_start + BLOCK_BYTES].tobytes()
+        hex_all = block.hex(" ")
+        if upper:
+            hex_all = hex_all.upper()
+        ascii_all = block.translate(ASCII_TABLE).decode("ascii")
+        addr = start_addr + block_start
+        for offs in range(0, len(block), LINE_BYTES):
+            # nur die letzte Zeile kann kürzer sein und wird aufgefüllt
+            hex_str = hex_all[offs * 3:offs * 3 + HEX_WIDTH]
+            if len(hex_str) < HEX_WIDTH:
+                hex_str = hex_str.ljust(HEX_WIDTH)
+            yield (addr_fmt % (addr + offs)) + hex_str + "  " + ascii_all[offs:offs + LINE_BYTES]
+
+
+def write_hexdump(f, data, start_addr=0, upper=True, indent=""):
+    """Hexdump zeilenweise nach f schreiben; liefert die Anzahl Zeilen."""
+    f.writelines(line + "\n" for line in hexdump_lines(data, start_addr, upper, indent))
+    return -(-len(data) // LINE_BYTES)
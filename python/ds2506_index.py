@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# SQLite-Index über gespeicherte Dumps
+#
+# Gerätenummer (0x07EC..0x07EF), Zulassungsnummer (0x07F2..0x07F5) und
+# ROM Code standen bisher nur im Dateinamen/Report. Der Index hält sie
+# zusammen mit Page-Belegung, WP/CP-Zählern und Dateipfaden in einer
+# SQLite-Datei, damit Fragen wie "welche Dumps haben dieselbe
+# Zulassung / denselben ROM / dieselbe Page-Belegung" ohne Globben und
+# Neu-Parsen in Millisekunden beantwortet sind.
+#
+# Ein Eintrag pro Dump, Schlüssel = absoluter Pfad der *binary.bin;
+# liegt der Dump auch im Dump-Speicher, steht dessen ID in dump_id.
+# Erneutes Eintragen überschreibt den alten Stand.
+#
+# layout = Page-Belegung als 32-Byte-Bitmap in Hex (64 Zeichen), Bit
+# gesetzt = Page belegt, LSB = niedrigste Page - gleiche Anordnung wie
+# die WP-Bits im Status Memory.
+#
+# Nicht lesbare Werte (leer, "UNKDEV"/"UNKZUL" aus dem Präfix) stehen als
+# NULL im Index: same() und groups() werfen so nicht alle Dumps ohne
+# Gerätenummer in einen Topf; query(device="UNKDEV") findet genau sie.
+#
+# Beispiel:
+#   index = DumpIndex("dumps.sqlite")
+#   index.query(zulassung="66051")
+#   index.same("archiv/x/123_T_66051_binary.bin", "layout")
+import os
+import sqlite3
+import threading
+import time
+
+FIELDS = [
+    "key", "prefix", "rom", "device", "zulassung", "layout", "used_pages",
+    "wp_pages", "cp_pages", "binary", "status", "report", "header",
+    "dump_id", "mtime", "size", "indexed",
+]
+
+# Spalten, nach denen gesucht bzw. gruppiert werden kann
+QUERY_FIELDS = ("rom", "device", "zulassung", "layout")
+
+# Platzhalter aus decode_prefix_fields (read_ds2506.py) = Wert unbekannt
+PLACEHOLDERS = {"device": "UNKDEV", "zulassung": "UNKZUL"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dumps (
+    key        TEXT PRIMARY KEY,
+    prefix     TEXT,
+    rom        TEXT,
+    device     TEXT,
+    zulassung  TEXT,
+    layout     TEXT,
+    used_pages INTEGER,
+    wp_pages   INTEGER,
+    cp_pages   INTEGER,
+    binary     TEXT,
+    status     TEXT,
+    report     TEXT,
+    header     TEXT,
+    dump_id    TEXT,
+    mtime      REAL,
+    size       INTEGER,
+    indexed    TEXT
+);
+CREATE INDEX IF NOT EXISTS dumps_rom ON dumps(rom);
+CREATE INDEX IF NOT EXISTS dumps_device ON dumps(device);
+CREATE INDEX IF NOT EXISTS dumps_zulassung ON dumps(zulassung);
+CREATE INDEX IF NOT EXISTS dumps_layout ON dumps(layout);
+"""
+
+
+def occupancy_bitmap(used_pages, page_count=256):
+    bitmap = bytearray(page_count // 8)
+    for page in used_pages:
+        bitmap[page // 8] |= 1 << (page % 8)
+    return bytes(bitmap)
+
+
+def normalize_rom(rom):
+    # "8B 52 EB ..." / "8b:52:eb..." / [0x8B, ...] -> "8B52EB..."
+    if not rom:
+        return ""
+    if isinstance(rom, str):
+        return "".join(ch for ch in rom if ch not in " :-").upper()
+    return bytes(rom).hex().upper()
+
+
+def normalize_value(field, value):
+    if field == "rom":
+        return normalize_rom(value)
+    if field == "layout":
+        return value.lower()
+    return str(value)
+
+
+def stored_value(field, value):
+    # Wert, wie er in der Spalte steht; None (NULL) = unbekannt
+    if value is None:
+        return None
+    value = normalize_value(field, value)
+    if value == "" or value == PLACEHOLDERS.get(field):
+        return None
+    return value
+
+
+class DumpIndex:
+    def __init__(self, path):
+        self.path = path
+        # Flotten-Modus trägt aus mehreren Threads ein -> eine Verbindung
+        # für alle, geschützt durch das Lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+            # ältere Indizes haben ''/Platzhalter als Wert eingetragen
+            for field in QUERY_FIELDS:
+                self._db.execute(
+                    f"UPDATE dumps SET {field} = NULL WHERE {field} IN ('', ?)",
+                    (PLACEHOLDERS.get(field, ""),),
+                )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------
+    # Eintragen
+    def record(self, key, **fields):
+        row = dict.fromkeys(FIELDS)
+        row.update(fields)
+        row["key"] = key
+        for field in QUERY_FIELDS:
+            row[field] = stored_value(field, row[field])
+        row["indexed"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        unknown = set(row) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unbekannte Felder: {', '.join(sorted(unknown))}")
+        columns = ", ".join(FIELDS)
+        marks = ", ".join("?" for _ in FIELDS)
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO dumps ({columns}) VALUES ({marks})",
+                [row[f] for f in FIELDS],
+            )
+            self._db.commit()
+
+    def is_current(self, key, mtime, size):
+        # für inkrementelles Nachindizieren: Datei unverändert?
+        with self._lock:
+            row = self._db.execute(
+                "SELECT mtime, size FROM dumps WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and row["mtime"] == mtime and row["size"] == size
+
+    def forget_missing(self, under, keys):
+        # Einträge unterhalb des Ordners under entfernen, die beim
+        # Durchsuchen nicht mehr gefunden wurden (keys)
+        keys = set(keys)
+        under = os.path.join(under, "")
+        with self._lock:
+            known = [r["key"] for r in self._db.execute("SELECT key FROM dumps")]
+            gone = [k for k in known if k.startswith(under) and k not in keys]
+            self._db.executemany("DELETE FROM dumps WHERE key = ?", [(k,) for k in gone])
+            self._db.commit()
+        return len(gone)
+
+    # -------------------------------------------------
+    # Abfragen
+    def _select(self, where, params):
+        sql = "SELECT * FROM dumps"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY key"
+        with self._lock:
+            return [dict(r) for r in self._db.execute(sql, params)]
+
+    def query(self, **criteria):
+        # query(rom=..., device=..., zulassung=..., layout=...) - UND-verknüpft;
+        # Platzhalter ("UNKDEV", "UNKZUL") suchen die Dumps ohne Wert
+        where = []
+        params = []
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            if field not in QUERY_FIELDS:
+                raise ValueError(f"Nach '{field}' kann nicht gesucht werden")
+            value = stored_value(field, value)
+            if value is None:
+                where.append(f"{field} IS NULL")
+            else:
+                where.append(f"{field} = ?")
+                params.append(value)
+        return self._select(where, params)
+
+    def get(self, key):
+        rows = self._select(["key = ?"], [key])
+        return rows[0] if rows else None
+
+    def same(self, key, field):
+        # alle anderen Dumps mit demselben Wert in field wie der Dump key
+        # (keine, wenn der Wert beim Dump key unbekannt ist)
+        if field not in QUERY_FIELDS:
+            raise ValueError(f"Nach '{field}' kann nicht gesucht werden")
+        ref = self.get(key)
+        if ref is None:
+            raise KeyError(f"'{key}' ist nicht im Index")
+        if ref[field] is None:
+            return []
+        return self._select([f"{field} = ?", "key != ?"], [ref[field], key])
+
+    def groups(self, field, min_count=2):
+        # Werte, die sich mindestens min_count Dumps teilen
+        if field not in QUERY_FIELDS:
+            raise ValueError(f"Nach '{field}' kann nicht gruppiert werden")
+        with self._lock:
+            return [
+                (r[0], r[1]) for r in self._db.execute(
+                    f"SELECT {field}, COUNT(*) FROM dumps WHERE {field} IS NOT NULL "
+                    f"GROUP BY {field} HAVING COUNT(*) >= ? ORDER BY COUNT(*) DESC",
+                    (min_count,),
+                )
+            ]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM dumps").fetchone()[0]
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# Zeitmessung pro Phase für jede Reader-Operation
+#
+# Jede Operation (connect, command, binary, status, dumpall, pages,
+# range) wird mit ihren Phasen erfasst:
+#   marker    Kommando gesendet -> Start-Marker da (Latenz des Sketches)
+#   header    Längen-Präfix eines Frames
+#   payload   Binärdaten (Bytes, daraus Bytes/s)
+#   trailer   Ende-Marker + Prompt einsammeln
+#   handshake, baud, response   beim Verbinden bzw. Text-Kommandos
+# dazu Wiederholungen (retries) und Timeouts.
+#
+# Operationen können verschachtelt sein (dumpall -> pages beim
+# Nachladen); Phasen zählen immer zur innersten laufenden Operation.
+#
+# Export:
+#   write_jsonl(datei)             eine JSON-Zeile pro Operation
+#   write_prometheus(datei, [m..]) Textfile für den node_exporter
+#                                  (textfile collector), Labels port/op
+#
+# Beispiel:
+#   with metrics.operation("binary", baudrate=115200) as op:
+#       t0 = time.monotonic(); ...; metrics.add_phase("marker", time.monotonic() - t0)
+import collections
+import json
+import os
+import time
+from contextlib import contextmanager
+
+
+class Operation:
+    __slots__ = ("op", "port", "baudrate", "started", "seconds", "phases",
+                 "bytes", "retries", "timeouts", "ok")
+
+    def __init__(self, op, port=None, baudrate=None):
+        self.op = op
+        self.port = port
+        self.baudrate = baudrate
+        self.started = time.time()
+        self.seconds = 0.0
+        self.phases = {}
+        self.bytes = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.ok = False
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @property
+    def bytes_per_s(self):
+        payload = self.phases.get("payload", 0.0)
+        return self.bytes / payload if payload > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "ts": round(self.started, 3),
+            "port": self.port,
+            "op": self.op,
+            "baudrate": self.baudrate,
+            "ok": self.ok,
+            "seconds": round(self.seconds, 4),
+            "phases": {k: round(v, 4) for k, v in self.phases.items()},
+            "bytes": self.bytes,
+            "bytes_per_s": round(self.bytes_per_s, 1),
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+        }
+
+
+class TransferMetrics:
+    def __init__(self, port=None):
+        self.port = port
+        self.operations = []
+        self._stack = []
+
+    @contextmanager
+    def operation(self, op, baudrate=None):
+        entry = Operation(op, self.port, baudrate)
+        self._stack.append(entry)
+        t0 = time.monotonic()
+        try:
+            yield entry
+        finally:
+            entry.seconds = time.monotonic() - t0
+            self._stack.pop()
+            self.operations.append(entry)
+
+    def limit(self, keep):
+        # nur die letzten keep Operationen behalten (Dauerbetrieb, 'watch')
+        self.operations = collections.deque(self.operations, maxlen=keep)
+
+    @property
+    def current(self):
+        return self._stack[-1] if self._stack else None
+
+    # Alles Folgende ist ohne laufende Operation ein No-op
+    def add_phase(self, name, seconds):
+        if self._stack:
+            self._stack[-1].add_phase(name, seconds)
+
+    def add_bytes(self, n):
+        if self._stack:
+            self._stack[-1].bytes += n
+
+    def count(self, field, n=1):
+        # field: "retries" oder "timeouts"
+        if self._stack:
+            entry = self._stack[-1]
+            setattr(entry, field, getattr(entry, field) + n)
+
+    # -------------------------------------------------
+    # Auswertung
+    def summary(self):
+        # {op: {"count", "ok", "seconds", "phases", "bytes", "bytes_per_s",
+        #       "retries", "timeouts"}}
+        out = {}
+        for entry in self.operations:
+            s = out.setdefault(entry.op, {
+                "count": 0, "ok": 0, "seconds": 0.0, "phases": {},
+                "bytes": 0, "retries": 0, "timeouts": 0,
+            })
+            s["count"] += 1
+            s["ok"] += entry.ok
+            s["seconds"] += entry.seconds
+            s["bytes"] += entry.bytes
+            s["retries"] += entry.retries
+            s["timeouts"] += entry.timeouts
+            for name, sec in entry.phases.items():
+                s["phases"][name] = s["phases"].get(name, 0.0) + sec
+        for s in out.values():
+            payload = s["phases"].get("payload", 0.0)
+            s["bytes_per_s"] = s["bytes"] / payload if payload > 0 else 0.0
+        return out
+
+    def totals(self):
+        # eine Zeile pro Port, z.B. für die Flotten-Summary
+        payload_s = sum(e.phases.get("payload", 0.0) for e in self.operations)
+        payload_bytes = sum(e.bytes for e in self.operations)
+        return {
+            "marker_s": round(sum(e.phases.get("marker", 0.0) for e in self.operations), 3),
+            "payload_s": round(payload_s, 3),
+            "trailer_s": round(sum(e.phases.get("trailer", 0.0) for e in self.operations), 3),
+            "payload_bps": round(payload_bytes / payload_s) if payload_s > 0 else 0,
+            "retries": sum(e.retries for e in self.operations),
+            "timeouts": sum(e.timeouts for e in self.operations),
+        }
+
+    def format_summary(self):
+        lines = []
+        for op, s in self.summary().items():
+            phases = ", ".join(f"{k} {v:.2f}s" for k, v in s["phases"].items())
+            line = f"{op:<8} {s['ok']}/{s['count']} ok, {s['seconds']:.2f}s"
+            if phases:
+                line += f" ({phases})"
+            if s["bytes"]:
+                line += f", {s['bytes']} Bytes @ {s['bytes_per_s'] / 1024:.1f} KiB/s"
+            if s["retries"] or s["timeouts"]:
+                line += f", {s['retries']} Wiederholungen, {s['timeouts']} Timeouts"
+            lines.append(line)
+        return lines
+
+    # -------------------------------------------------
+    # Export
+    def write_jsonl(self, filename, append=True):
+        with open(filename, "a" if append else "w", encoding="utf-8") as f:
+            for entry in self.operations:
+                f.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+        return filename
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(metrics_list):
+    # Prometheus-Textformat für mehrere Ports (TransferMetrics je Port)
+    families = {
+        "ds2506_operations_total": ("counter", "Reader-Operationen nach Ergebnis"),
+        "ds2506_operation_seconds_total": ("counter", "Gesamtdauer der Operationen"),
+        "ds2506_phase_seconds_total": ("counter", "Dauer pro Phase"),
+        "ds2506_payload_bytes_total": ("counter", "Empfangene Nutzdaten"),
+        "ds2506_payload_bytes_per_second": ("gauge", "Durchsatz der Nutzdaten"),
+        "ds2506_retries_total": ("counter", "Wiederholungen (z.B. CRC-Nachladen)"),
+        "ds2506_timeouts_total": ("counter", "Timeouts"),
+    }
+    samples = {name: [] for name in families}
+    for metrics in metrics_list:
+        port = _label(metrics.port)
+        for op, s in metrics.summary().items():
+            labels = f'port="{port}",op="{_label(op)}"'
+            samples["ds2506_operations_total"].append(
+                (f'{{{labels},result="ok"}}', s["ok"]))
+            samples["ds2506_operations_total"].append(
+                (f'{{{labels},result="error"}}', s["count"] - s["ok"]))
+            samples["ds2506_operation_seconds_total"].append((f"{{{labels}}}", s["seconds"]))
+            for phase, sec in s["phases"].items():
+                samples["ds2506_phase_seconds_total"].append(
+                    (f'{{{labels},phase="{_label(phase)}"}}', sec))
+            if s["bytes"]:
+                samples["ds2506_payload_bytes_total"].append((f"{{{labels}}}", s["bytes"]))
+                samples["ds2506_payload_bytes_per_second"].append(
+                    (f"{{{labels}}}", s["bytes_per_s"]))
+            samples["ds2506_retries_total"].append((f"{{{labels}}}", s["retries"]))
+            samples["ds2506_timeouts_total"].append((f"{{{labels}}}", s["timeouts"]))
+
+    lines = []
+    for name, (kind, help_text) in families.items():
+        if not samples[name]:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples[name]:
+            lines.append(f"{name}{labels} {value:g}" if isinstance(value, float)
+                         else f"{name}{labels} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(filename, metrics_list):
+    # erst in eine Temp-Datei, dann umbenennen - der Collector sieht nie
+    # eine halb geschriebene Datei
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(metrics_list))
+    os.replace(tmp, filename)
+    return filename
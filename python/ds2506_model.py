@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# Referenzmodell des Emulators (arduino/emulator/DS2506_Custom) in Python
+#
+# Bildet nach, was der Emulator auf dem Bus antwortet, ohne Arduino:
+#   Flash-Abbild volle 8 KB, pro Page kodiert in image_blob (siehe
+#                encode_page), page_index zeigt auf die Kodierung,
+#                0xFFFF = Page komplett 0xFF
+#   Overlay      geschriebene Pages als RAM-Kopie (höchstens
+#                overlay_pages Stück), nur Pages ohne Schreibschutz
+#   0xF0         READ MEMORY ab TA bis Speicherende, danach die CRC16
+#                (invertiert, LSB zuerst) über Kommando, TA und Daten
+#   0xAA         READ STATUS in 8-Byte-Blöcken, nach jedem Block die CRC16,
+#                danach beginnt die CRC wieder bei 0
+#   0x0F / 0x55  WRITE MEMORY / WRITE STATUS (OTP: nur 1 -> 0), am Ende
+#                die CRC16 über Kommando, TA und empfangene Bytes
+# Der Inhalt entspricht dem Werkszustand (Flash + Status wie im
+# Konstruktor); EEPROM und Hintergrund-Commit spielen für die Antworten
+# keine Rolle und sind nicht nachgebaut.
+#
+# Laden aus einer erzeugten ds2506_image.h (parse_header; ältere Header
+# mit page_XXXX-Arrays gehen auch) oder direkt aus einem Dump. compare()
+# prüft, ob der Emulator einen Dump bitgenau ausliefern würde - das geht
+# für tausende Dumps in Sekunden (siehe 'emucheck' in read_ds2506.py).
+#
+# Beispiel:
+#   model = DS2506Model.from_header("ds2506_image.h")
+#   stream = model.transaction(0xF0, 0x0000)     # 8192 Daten + 2 CRC
+#   result = model.compare(data, status)         # {"ok": ..., "missing_pages": ...}
+import re
+
+from ds2506_crc import crc16, read_memory_crc16
+
+DEVICE_TOTAL_SIZE = 8192
+PAGE_SIZE = 32
+PAGES = DEVICE_TOTAL_SIZE // PAGE_SIZE
+STATUS_SIZE = 256
+FF_PAGE = b"\xFF" * PAGE_SIZE
+
+BLANK_PAGE = 0xFFFF                  # Eintrag in page_index für "nur 0xFF"
+RUN_FLAG = 0x80                      # Steuerbyte: 0xFF-Lauf statt Literal
+OVERLAY_PAGES = 8                    # wie DS2506_OVERLAY_PAGES im Sketch
+
+# (logisch, physisch) der Header von vor image_page_numbers/page_lut;
+# so war die pageMap im Emulator fest eingetragen
+PAGE_MAP = (
+    (0, 0), (16, 1), (30, 2), (38, 3),
+    (48, 4), (56, 5), (63, 6), (64, 7),
+)
+
+READ_MEMORY = 0xF0
+READ_STATUS = 0xAA
+WRITE_MEMORY = 0x0F
+WRITE_STATUS = 0x55
+
+_ARRAY_RE = re.compile(
+    r"const\s+(uint8_t|uint16_t)\s+(\w+)\s*\[\s*(\d+)\s*\]\s*PROGMEM\s*=\s*\{(.*?)\};", re.S
+)
+_ROM_RE = re.compile(r"^//\s*ROM Code:\s*((?:[0-9A-Fa-f]{2}\s*){8})", re.M)
+
+
+# -------------------------------------------------
+# Kodierung einer Page im Flash-Abbild
+#
+# Folge von Steuerbytes c, bis 32 Bytes erreicht sind:
+#   c <  0x80   c + 1 Bytes folgen wörtlich
+#   c >= 0x80   (c & 0x7F) + 1 mal 0xFF, es folgt nichts
+# 0xFF-Läufe ab 2 Bytes werden zusammengefasst.
+def encode_page(page):
+    out = bytearray()
+    literal = bytearray()
+    i = 0
+    while i < len(page):
+        run = 0
+        while i + run < len(page) and page[i + run] == 0xFF:
+            run += 1
+        if run >= 2:
+            if literal:
+                out.append(len(literal) - 1)
+                out += literal
+                literal.clear()
+            out.append(RUN_FLAG | (run - 1))
+            i += run
+        else:
+            literal.append(page[i])
+            i += 1
+    if literal:
+        out.append(len(literal) - 1)
+        out += literal
+    return bytes(out)
+
+
+def decode_page(blob, offset):
+    out = bytearray()
+    while len(out) < PAGE_SIZE:
+        c = blob[offset]
+        n = (c & 0x7F) + 1
+        if c & RUN_FLAG:
+            out += b"\xFF" * n
+            offset += 1
+        else:
+            out += blob[offset + 1:offset + 1 + n]
+            offset += 1 + n
+    if len(out) != PAGE_SIZE:
+        raise ValueError(f"Page-Kodierung ergibt {len(out)} statt {PAGE_SIZE} Bytes")
+    return bytes(out)
+
+
+def encode_image(data):
+    """8 KB -> (image_blob, page_index); gleiche Pages liegen nur einmal im Blob."""
+    if len(data) != DEVICE_TOTAL_SIZE:
+        raise ValueError(f"Data Memory hat {len(data)} statt {DEVICE_TOTAL_SIZE} Bytes")
+    blob = bytearray()
+    index = []
+    seen = {}
+    for p in range(PAGES):
+        page = bytes(data[p * PAGE_SIZE:(p + 1) * PAGE_SIZE])
+        if page == FF_PAGE:
+            index.append(BLANK_PAGE)
+            continue
+        if page not in seen:
+            seen[page] = len(blob)
+            blob += encode_page(page)
+        index.append(seen[page])
+    if len(blob) >= BLANK_PAGE:
+        raise ValueError(f"image_blob zu groß ({len(blob)} Bytes)")
+    return bytes(blob), index
+
+
+def decode_image(blob, index):
+    return b"".join(
+        FF_PAGE if offset == BLANK_PAGE else decode_page(blob, offset) for offset in index
+    )
+
+
+# -------------------------------------------------
+# ds2506_image.h lesen
+def parse_header(text):
+    """Arrays aus einer ds2506_image.h.
+
+    Liefert {"data": 8192 Bytes (Flash-Abbild) oder None, "pages":
+    {adresse: 32 Bytes} (nur ältere Header), "page_map": ((logisch,
+    physisch), ...) oder None, "status": 256 Bytes oder None, "rom": 8
+    Bytes oder None, "arrays": {name: bytes bzw. Liste für uint16_t}}.
+    """
+    arrays = {}
+    for ctype, name, size, body in _ARRAY_RE.findall(text):
+        body = re.sub(r"//[^\n]*", "", body)
+        values = [int(v, 0) for v in body.replace(",", " ").split()]
+        if len(values) != int(size):
+            raise ValueError(f"{name}: {len(values)} statt {size} Werte")
+        arrays[name] = bytes(values) if ctype == "uint8_t" else values
+
+    pages = {}
+    for name, values in arrays.items():
+        m = re.fullmatch(r"page_([0-9A-Fa-f]{4})", name)
+        if m and len(values) == PAGE_SIZE:
+            pages[int(m.group(1), 16)] = values
+
+    data = None
+    if "image_blob" in arrays and "page_index" in arrays:
+        index = arrays["page_index"]
+        if len(index) != PAGES:
+            raise ValueError(f"page_index hat {len(index)} statt {PAGES} Einträge")
+        try:
+            data = decode_image(arrays["image_blob"], index)
+        except IndexError:
+            raise ValueError("page_index zeigt hinter das Ende von image_blob")
+
+    # Header aus der Zeit mit RAM-Abbild (image_page_numbers, page_lut)
+    page_map = None
+    numbers = arrays.get("image_page_numbers")
+    if numbers is not None:
+        page_map = tuple((logical, physical) for physical, logical in enumerate(numbers))
+
+    rom = _ROM_RE.search(text)
+    return {
+        "data": data,
+        "pages": pages,
+        "page_map": page_map,
+        "status": arrays.get("status_mem"),
+        "rom": bytes.fromhex(rom.group(1)) if rom else None,
+        "arrays": arrays,
+    }
+
+
+def load_header(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_header(f.read())
+
+
+# -------------------------------------------------
+class DS2506Model:
+    def __init__(self, image, status, rom=None, overlay_pages=OVERLAY_PAGES,
+                 strict_addr_check=False, enable_write=True):
+        if len(image) != DEVICE_TOTAL_SIZE:
+            raise ValueError(f"Abbild hat {len(image)} statt {DEVICE_TOTAL_SIZE} Bytes")
+        if len(status) != STATUS_SIZE:
+            raise ValueError(f"Status Memory hat {len(status)} statt {STATUS_SIZE} Bytes")
+        self.image = bytes(image)
+        self.status = bytearray(status)
+        self.rom = bytes(rom) if rom else None
+        self.overlay_pages = overlay_pages
+        self.strict_addr_check = strict_addr_check
+        self.enable_write = enable_write
+        self.overlay = {}                # logische Page -> bytearray(32)
+
+    @classmethod
+    def from_header(cls, source, **options):
+        # source: Pfad, Header-Text oder Ergebnis von parse_header().
+        # Ältere Header ohne image_blob: die page_XXXX-Arrays laut
+        # Page-Mapping (bzw. PAGE_MAP) bilden das Abbild, der Rest ist
+        # 0xFF - so hat der Emulator sie damals ausgeliefert.
+        if isinstance(source, dict):
+            header = source
+        elif "PROGMEM" in source:
+            header = parse_header(source)
+        else:
+            header = load_header(source)
+        if header["status"] is None:
+            raise ValueError("status_mem fehlt im Header")
+
+        image = header["data"]
+        if image is None:
+            out = bytearray(FF_PAGE * PAGES)
+            for logical, _physical in header["page_map"] or PAGE_MAP:
+                page = header["pages"].get(logical * PAGE_SIZE)
+                if page is None:
+                    raise ValueError(
+                        f"page_{logical * PAGE_SIZE:04X} fehlt im Header (Page-Mapping braucht sie)"
+                    )
+                out[logical * PAGE_SIZE:(logical + 1) * PAGE_SIZE] = page
+            image = out
+        return cls(image, header["status"], header["rom"], **options)
+
+    @classmethod
+    def from_dump(cls, data, status, rom=None, **options):
+        # so, als wäre der Header aus diesem Dump erzeugt und geflasht
+        blob, index = encode_image(data)
+        return cls(decode_image(blob, index), status, rom, **options)
+
+    # -------------------------------------------------
+    # Seiteninhalt wie pageData() im Sketch
+    def page_data(self, page):
+        page &= 0xFF
+        if page in self.overlay:
+            return bytes(self.overlay[page])
+        return self.image[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+    def served_data(self):
+        # 8 KB so, wie sie per 0xF0 ab 0 herauskommen (ohne CRC)
+        if not self.overlay:
+            return self.image
+        return b"".join(self.page_data(p) for p in range(PAGES))
+
+    def write_protected(self, page):
+        # Write-Protect-Bits im Status (Byte 0x00..0x1F, Bit = 0 => gesperrt)
+        page &= 0xFF
+        return not self.status[page >> 3] & (1 << (page & 7))
+
+    # -------------------------------------------------
+    # Bus-Transaktionen (Antwort des Emulators als Bytes)
+    def read_memory(self, addr):
+        addr &= 0xFFFF
+        header = bytes((READ_MEMORY, addr & 0xFF, addr >> 8))
+        data = self.served_data()[addr:] if addr < DEVICE_TOTAL_SIZE else b""
+        crc = crc16(header + data) ^ 0xFFFF
+        return data + bytes((crc & 0xFF, crc >> 8))
+
+    def read_status(self, addr):
+        addr &= 0xFFFF
+        crc = crc16(bytes((READ_STATUS, addr & 0xFF, addr >> 8)))
+        out = bytearray()
+        while addr < STATUS_SIZE:
+            block_end = min((addr | 7) + 1, STATUS_SIZE)
+            block = bytes(self.status[addr:block_end])
+            out += block
+            crc = crc16(block, crc) ^ 0xFFFF
+            out += bytes((crc & 0xFF, crc >> 8))
+            crc = 0
+            addr = block_end
+        return bytes(out)
+
+    def _program_data(self, target, incoming):
+        # False, wenn das Byte nicht geschrieben werden kann (geschützt
+        # oder kein Overlay-Platz frei) - wie programDataByte() im Sketch
+        page = (target >> 5) & 0xFF
+        offset = target & 0x1F
+        if self.write_protected(page):
+            return False
+        current = self.page_data(page)
+        burned = current[offset] & incoming
+        if burned == current[offset]:
+            return True
+        if page not in self.overlay:
+            if len(self.overlay) >= self.overlay_pages:
+                return False
+            self.overlay[page] = bytearray(current)
+        self.overlay[page][offset] = burned
+        return True
+
+    def _program(self, cmd, addr, payload):
+        if not self.enable_write:
+            raise ValueError(f"Kommando 0x{cmd:02X} nicht unterstützt (Schreiben aus)")
+        addr &= 0xFFFF
+        crc = crc16(bytes((cmd, addr & 0xFF, addr >> 8)))
+        for offset, incoming in enumerate(payload):
+            # reg_TA ist uint16 und läuft über, die Page-Nummer ist uint8
+            target = (addr + offset) & 0xFFFF
+            if cmd == WRITE_MEMORY:
+                ok = self._program_data(target, incoming)
+            elif target < STATUS_SIZE:
+                self.status[target] &= incoming
+                ok = True
+            else:
+                ok = False
+            if not ok and self.strict_addr_check:
+                raise ValueError(f"Adresse 0x{target:04X} nicht beschreibbar (Kommando 0x{cmd:02X})")
+            crc = crc16(bytes((incoming,)), crc)
+        crc ^= 0xFFFF
+        return bytes((crc & 0xFF, crc >> 8))
+
+    def write_memory(self, addr, payload):
+        return self._program(WRITE_MEMORY, addr, payload)
+
+    def write_status(self, addr, payload):
+        return self._program(WRITE_STATUS, addr, payload)
+
+    def transaction(self, cmd, addr, payload=b""):
+        """Kommando + Zieladresse (+ Schreibdaten) -> Antwort des Emulators."""
+        if cmd == READ_MEMORY:
+            return self.read_memory(addr)
+        if cmd == READ_STATUS:
+            return self.read_status(addr)
+        if cmd == WRITE_MEMORY:
+            return self.write_memory(addr, payload)
+        if cmd == WRITE_STATUS:
+            return self.write_status(addr, payload)
+        raise ValueError(f"Kommando 0x{cmd:02X} unbekannt (raiseSlaveError)")
+
+    # -------------------------------------------------
+    # Abgleich mit einem Dump
+    def compare(self, data, status):
+        """Würde der Emulator diesen Dump ausliefern?
+
+        missing_pages: im Dump belegt, im Abbild nur 0xFF (fehlt im Header)
+        wrong_pages:   im Abbild vorhanden, aber anderer Inhalt
+        crc_ok:        CRC16 eines vollen 0xF0-Lesens wie beim Original
+        """
+        served = self.served_data()
+        missing = []
+        wrong = []
+        for page in range(PAGES):
+            start = page * PAGE_SIZE
+            want = bytes(data[start:start + PAGE_SIZE])
+            have = served[start:start + PAGE_SIZE]
+            if have == want:
+                continue
+            if have == FF_PAGE:
+                missing.append(page)
+            else:
+                wrong.append(page)
+
+        stream = self.read_memory(0)
+        chip_crc = stream[-2] | (stream[-1] << 8)
+        status_diff = [i for i in range(STATUS_SIZE) if self.status[i] != status[i]]
+        crc_ok = chip_crc == read_memory_crc16(data)
+        return {
+            "ok": not missing and not wrong and not status_diff and crc_ok,
+            "missing_pages": missing,
+            "wrong_pages": wrong,
+            "status_diff": status_diff,
+            "crc_ok": crc_ok,
+        }
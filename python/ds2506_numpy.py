@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Vektorisierte Auswertung vieler Dumps auf einmal (optional, NumPy)
+#
+# Gleiche Ergebnisse wie DS2506Reader.calc_used_pages_from_binary und
+# DS2506Reader.status_protection_pages, aber für einen ganzen Stapel
+# Dumps in einem Aufruf:
+#   Data Memory   -> Array (N, 256, 32), Page belegt = irgendein Byte != FF
+#   Status Memory -> Bitmaps per np.unpackbits (LSB = niedrigste Page)
+#
+# python -m pip install numpy
+#
+# Beispiel:
+#   result = analyze_stack(list_of_8k_dumps, list_of_256b_status)
+#   result["occupancy"][i, page]  -> bool
+#   result["wp"][i, page]         -> bool (write-protected)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATA_SIZE = 8192
+PAGE_SIZE = 32
+PAGE_COUNT = DATA_SIZE // PAGE_SIZE
+STATUS_SIZE = 256
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy fehlt: python -m pip install numpy")
+
+
+# -------------------------------------------------
+# Dumps (bytes/bytearray/memoryview) zu einem uint8-Array stapeln
+def stack_dumps(dumps, size):
+    _require_numpy()
+    if isinstance(dumps, np.ndarray):
+        arr = dumps.astype(np.uint8, copy=False)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+    else:
+        dumps = list(dumps)
+        arr = np.empty((len(dumps), size), dtype=np.uint8)
+        for i, d in enumerate(dumps):
+            arr[i] = np.frombuffer(d, dtype=np.uint8, count=size)
+    if arr.shape[1] != size:
+        raise ValueError(f"Dumps haben {arr.shape[1]} statt {size} Bytes")
+    return arr
+
+
+# -------------------------------------------------
+# Page-Belegung: (N, 256) bool
+def page_occupancy(data_stack):
+    data_stack = stack_dumps(data_stack, DATA_SIZE)
+    pages = data_stack.reshape(len(data_stack), PAGE_COUNT, PAGE_SIZE)
+    return (pages != 0xFF).any(axis=2)
+
+
+# -------------------------------------------------
+# Status-Bitmaps: Bit = 0 bedeutet gesperrt/gesetzt
+#
+#   wp     (N, 256) bool   Write-Protect, Bytes 0x00..0x1F
+#   cp     (N, 256) bool   Copy-Protect, Bytes 0x100..0x11F (nur wenn
+#                          der Status-Dump so lang ist, sonst alles False)
+#   eprom_count (N,) int   Bytes 0x20..0x3F != FF
+def decode_status(status_stack):
+    _require_numpy()
+    if isinstance(status_stack, np.ndarray):
+        status_stack = status_stack.astype(np.uint8, copy=False)
+        if status_stack.ndim == 1:
+            status_stack = status_stack.reshape(1, -1)
+    else:
+        status_stack = list(status_stack)
+        width = min(len(s) for s in status_stack) if status_stack else STATUS_SIZE
+        status_stack = stack_dumps([bytes(s[:width]) for s in status_stack], width)
+
+    n, width = status_stack.shape
+    if width < 0x40:
+        raise ValueError(f"Status-Dumps haben nur {width} Bytes")
+
+    wp = np.unpackbits(status_stack[:, 0x00:0x20], axis=1, bitorder="little") == 0
+    if width >= 0x120:
+        cp = np.unpackbits(status_stack[:, 0x100:0x120], axis=1, bitorder="little") == 0
+    else:
+        cp = np.zeros((n, PAGE_COUNT), dtype=bool)
+    eprom_count = (status_stack[:, 0x20:0x40] != 0xFF).sum(axis=1)
+    return {"wp": wp, "cp": cp, "eprom_count": eprom_count}
+
+
+# -------------------------------------------------
+# Alles in einem Aufruf
+def analyze_stack(data_dumps, status_dumps=None):
+    occupancy = page_occupancy(data_dumps)
+    result = {
+        "occupancy": occupancy,
+        "used_count": occupancy.sum(axis=1),
+    }
+    if status_dumps is not None:
+        status = decode_status(status_dumps)
+        result.update(status)
+        result["wp_count"] = status["wp"].sum(axis=1)
+        result["cp_count"] = status["cp"].sum(axis=1)
+    return result
+
+
+def page_lists(mask):
+    # (N, 256) bool -> Liste von Page-Listen wie bei den Python-Schleifen
+    return [np.flatnonzero(row).tolist() for row in mask]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# Reader-Protokoll (read_ds2506.ino) ohne Ein-/Ausgabe
+#
+# Gemeinsamer Teil von DS2506Reader (read_ds2506.py, Empfangs-Thread)
+# und AsyncDS2506Reader (ds2506_async.py, asyncio): Prompt und Marker,
+# Einordnen von Antwortzeilen (Handshake, Start-Marker, 'baud'), Frame-
+# Längen, ROM-Auswertung und die CRC-Prüfungen der Binärantworten.
+# Gelesen und gewartet wird nur in den Readern; ReaderProtocol braucht
+# von ihnen nur self._log(...) und setzt has_ping.
+#
+# Beispiel (im Reader):
+#   pair = self._start_marker(line, BINARY_MARKERS)  # None: weiterlesen
+#   if not self._check_binary_crc(crc, trailer_lines): ...
+from ds2506_crc import crc8, crc16, check_page_records, check_status_blocks, rom_crc_ok
+
+# Zeile, mit der der Arduino jede Antwort abschließt (siehe loop() im Sketch)
+PROMPT_LINE = "Bereit fuer naechstes Kommando:"
+
+# Ende der Begrüßung nach dem Booten (siehe setup() im Sketch)
+READY_BANNER = "Bereit fuer Befehle!"
+
+# Data Memory: 256 Pages à 32 Bytes. Bei 'dumpall'/'crcpages' folgt auf
+# jede Page die CRC16 des Chips (invertiert, LSB zuerst).
+PAGE_SIZE = 32
+PAGE_COUNT = 256
+PAGE_RECORD_SIZE = PAGE_SIZE + 2
+
+# Status Memory: 256 Bytes. Bei 'dumpall' kommt es in 32 Blöcken à 8 Bytes,
+# jeder gefolgt von der CRC16 des Chips (wie bei READ STATUS).
+STATUS_SIZE = 256
+STATUS_RECORD_SIZE = 8 + 2
+DUMPALL_FRAME_SIZE = 8 + PAGE_COUNT * PAGE_RECORD_SIZE + STATUS_SIZE // 8 * STATUS_RECORD_SIZE
+
+# Baudraten, die nach dem Verbinden der Reihe nach angeboten werden
+# (siehe 'baud' im Sketch). Scheitert alles, bleibt es bei 115200.
+FAST_BAUDRATES = (2000000, 1000000, 500000)
+
+# Start-Marker -> Ende-Marker der Binärantworten
+BINARY_MARKERS = {"BINARY_START": "BINARY_END", "BIN_START": "BIN_END"}
+STATUS_MARKERS = {"STATUS_START": "STATUS_END", "STATUS_BEGIN": "STATUS_END"}
+DUMPALL_MARKERS = {"DUMPALL_START": "DUMPALL_END"}
+PAGES_MARKERS = {"PAGES_START": "PAGES_END"}
+RANGE_MARKERS = {"RANGE_START": "RANGE_END"}
+
+# Kommando + Startadresse, über die der Chip die CRC16 von 'binary' rechnet
+READ_MEMORY_HEADER = b"\xF0\x00\x00"
+
+
+# -------------------------------------------------
+# Antwort des Sketches auf 'baud <rate>' einordnen
+#
+#   "ok"          BAUD_OK <rate>, Sketch schaltet um
+#   "unsupported" Sketch kennt 'baud' nicht: "Unbekannter Befehl" oder
+#                 ein Hexdump ab 0x00BA (strtol("baud ...", 16) im Sketch)
+#   None          keine/andere Antwort (ERROR_BAUD, Timeout) -> nächste Rate
+def baud_reply(lines, rate):
+    if lines and lines[-1] == f"BAUD_OK {rate}":
+        return "ok"
+    if lines and any(l.startswith(("Unbekannter Befehl", "Lese 64 Bytes ab")) for l in lines):
+        return "unsupported"
+    return None
+
+
+def parse_rom_lines(lines):
+    # "ROM Code: 8B 52 EB ..." aus der Antwort auf 'rom' herauslesen
+    rom_bytes = []
+
+    for line in lines or []:
+        if line.startswith("ROM Code"):
+            parts = line.split(":", 1)
+            if len(parts) == 2:
+                hexlist = parts[1].strip().split()
+            else:
+                hexlist = line.replace("ROM Code", "").strip().split()
+            for p in hexlist:
+                try:
+                    rom_bytes.append(int(p, 16))
+                except ValueError:
+                    pass
+
+    return rom_bytes
+
+
+def decode_rom(rom_bytes):
+    # ROM Code (8 Bytes) -> Info-dict wie in den Reports, {} wenn es
+    # nicht genau 8 Bytes sind
+    rom_bytes = list(rom_bytes or [])
+    if len(rom_bytes) != 8:
+        return {}
+    calc_crc = crc8(rom_bytes[:7])
+    return {
+        "rom_bytes": rom_bytes,
+        "family_code": rom_bytes[0],
+        "crc_chip": rom_bytes[7],
+        "crc_calc": calc_crc,
+        "crc_ok": calc_crc == rom_bytes[7],
+    }
+
+
+class ReaderProtocol:
+    # PONG beim Handshake (None: noch nicht verbunden, False: älterer
+    # Sketch ohne 'ping', nur der Prompt kam zurück)
+    has_ping = None
+
+    # -------------------------------------------------
+    # CRC8 (Dallas/Maxim) für ROM-Code
+    # (Tabellen-Implementierung in ds2506_crc.py)
+    def compute_crc8_maxim(self, data_bytes):
+        return crc8(data_bytes)
+
+    # -------------------------------------------------
+    # CRC16 (Dallas/Maxim, Polynom 0xA001) für Data/Status Memory
+    def compute_crc16(self, data_bytes, crc=0):
+        return crc16(data_bytes, crc)
+
+    def parse_rom_lines(self, lines):
+        return parse_rom_lines(lines)
+
+    def analyze_rom_bytes(self, rom_bytes):
+        # wie decode_rom(), mit Ausgabe
+        info = decode_rom(rom_bytes)
+        self._log("\n=== ROM Code Analyse (Python) ===")
+        if info:
+            self._log("ROM Bytes:", " ".join(f"{b:02X}" for b in info["rom_bytes"]))
+            self._log(f"Family Code: 0x{info['family_code']:02X}")
+            self._log(f"CRC (Chip / Byte7): 0x{info['crc_chip']:02X}")
+            self._log(f"CRC (berechnet):    0x{info['crc_calc']:02X}")
+            self._log("CRC Status:", "OK" if info["crc_ok"] else "FEHLER!")
+        else:
+            self._log("Konnte ROM Code nicht sauber parsen (nicht exakt 8 Bytes).")
+        return info
+
+    # -------------------------------------------------
+    # Zeile beim Bereitschafts-Handshake einordnen
+    #
+    # "ready": PONG oder (ältere Sketche ohne 'ping') der Prompt,
+    # "banner": Begrüßung zu Ende, None: weiter warten. Zeilen der
+    # Begrüßung werden angezeigt.
+    def _handshake_line(self, line):
+        line = line.strip()
+        if not line or line.startswith("Befehl empfangen"):
+            return None
+        if line == "PONG":
+            self.has_ping = True
+            return "ready"
+        if line == PROMPT_LINE:
+            self.has_ping = False
+            return "ready"
+        self._log(line)
+        return "banner" if line == READY_BANNER else None
+
+    # -------------------------------------------------
+    # Zeile beim Warten auf den Start-Marker eines Binärblocks
+    #
+    # markers: {start_marker: end_marker}. Liefert das passende Paar,
+    # (None, None) bei Fehler oder Prompt, None zum Weiterlesen.
+    def _start_marker(self, line, markers):
+        line = line.strip()
+        if line:
+            self._log(f"< {line}")
+        if line in markers:
+            return line, markers[line]
+        if "ERROR" in line:
+            self._log("Fehler beim Lesen!")
+            return None, None
+        if line == PROMPT_LINE:
+            # Antwort zu Ende, ohne Start-Marker (Kommando unbekannt?)
+            return None, None
+        return None
+
+    # -------------------------------------------------
+    # Längen-Präfix (uint16 LE) eines Frames prüfen
+    def _frame_length(self, header, expected):
+        if len(header) != 2:
+            self._log("Timeout beim Lesen der Frame-Länge.")
+            return None
+        frame_len = header[0] | (header[1] << 8)
+        if frame_len != expected:
+            self._log(f"WARNUNG: Unerwartete Frame-Länge {frame_len} (erwartet {expected})")
+            return None
+        return frame_len
+
+    # -------------------------------------------------
+    # CRC16=XXXX hinter 'binary' mit der mitgerechneten CRC vergleichen
+    # (crc: Crc16 über READ_MEMORY_HEADER + Daten). Ältere Sketche
+    # senden keine CRC-Zeile, das gilt als ok.
+    def _check_binary_crc(self, crc, lines):
+        for line in lines:
+            if line.startswith("CRC16="):
+                chip_crc = int(line[6:], 16)
+                if not crc.matches_inverted(chip_crc):
+                    self._log(
+                        f"CRC16-FEHLER: Chip 0x{chip_crc:04X}, "
+                        f"empfangen 0x{crc.inverted:04X}"
+                    )
+                    return False
+                self._log(f"CRC16 OK (0x{chip_crc:04X})")
+        return True
+
+    # -------------------------------------------------
+    # Page-Records (32 Byte + CRC16 vom Chip) prüfen
+    #
+    # Liefert (Daten als bytearray, Liste der Pages mit CRC-Fehler).
+    # Die Pages werden ab first_page durchnummeriert.
+    def _check_page_records(self, raw, first_page=0):
+        return check_page_records(raw, first_page, PAGE_SIZE)
+
+    # -------------------------------------------------
+    # dumpall-Frame zerlegen und ROM/Status prüfen
+    #
+    # Liefert (ROM, Page-Records, Status) oder None, wenn die ROM-CRC8
+    # oder die CRC eines Status-Blocks nicht passt. Die Page-Records
+    # prüft der Aufrufer (fehlerhafte Pages lassen sich nachladen).
+    def _split_dump_frame(self, frame):
+        records_end = 8 + PAGE_COUNT * PAGE_RECORD_SIZE
+        rom = frame[:8]
+        if not rom_crc_ok(rom):
+            self._log("ROM-CRC8 im dumpall-Frame falsch!")
+            return None
+        status, bad_blocks = check_status_blocks(frame[records_end:])
+        if bad_blocks:
+            self._log(
+                "CRC-Fehler im Status Memory, Block(s) ab "
+                + ", ".join(f"0x{addr:02X}" for addr in bad_blocks)
+            )
+            return None
+        return rom, frame[8:records_end], bytes(status)
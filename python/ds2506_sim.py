@@ -0,0 +1,908 @@
+#!/usr/bin/env python3
+# Simulierter Reader (read_ds2506.ino) ohne Arduino
+#
+# SimFirmware bildet den Sketch Kommando für Kommando nach (Begrüßung,
+# rom, binary, sendstatus, dumpall, crcpages, readrange, baud, ping,
+# all, pages, hexdump, status, help, Hex-Adresse) - mit derselben
+# Ausgabe bis aufs Byte und denselben delay()-Aufrufen. Dazu kommt ein
+# Zeitmodell:
+#   Leitung    10 Bit pro Byte bei der aktuellen Baudrate, 64-Byte-
+#              Sendepuffer wie beim UNO (Serial.write blockiert, wenn voll)
+#   1-Wire     bus Sekunden pro Byte auf dem Bus (Standard-Speed ~0,56 ms)
+#   scale      Faktor für alles, was auf dem Arduino Zeit kostet
+#              (delay(), 1-Wire); 0 = nur die serielle Leitung
+#   latency    Verzögerung Host -> Reader pro Schreibvorgang (USB),
+#   jitter     +- gleichverteilt dazu
+#   errors     Wahrscheinlichkeit pro Byte, dass ein Nutzdaten-Byte
+#              (Serial.write) auf der Leitung ein falsches Bit bekommt
+#   max_baud   Raten darüber schafft das "Kabel" nicht (nur Datenmüll)
+# Sprechen Host und Sketch unterschiedliche Baudraten, kommt auf beiden
+# Seiten nur Datenmüll an - wie echt.
+#
+# Zwei Anschlüsse:
+#   SimSerial   pyserial-artiges Objekt im selben Prozess; read_ds2506
+#               nimmt es für Ports der Form sim://[BINARY]?key=wert&...
+#   PtySimulator  Pseudo-Terminal (/dev/pts/N) für beliebige Programme
+#
+# Beispiel:
+#   python read_ds2506.py "sim://?errors=1e-4&latency=0.002"
+#   python ds2506_sim.py --image dump_binary.bin --scale 0   (-> /dev/pts/N)
+import collections
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from ds2506_crc import crc8, page_crc16, read_memory_crc16, status_crc_blocks
+
+DATA_SIZE = 8192
+STATUS_SIZE = 256
+PAGE_SIZE = 32
+PAGE_COUNT = 256
+
+DEFAULT_BAUD = 115200
+SUPPORTED_BAUDS = (115200, 250000, 500000, 1000000, 2000000)
+TX_BUFFER = 64          # Sendepuffer des UNO (HardwareSerial)
+BUS_BYTE_S = 0.00056    # 1-Wire Standard-Speed: 8 Slots à ~70 µs
+BUS_RESET_S = 0.00096   # Reset-Puls + Presence
+
+PROMPT = "Bereit fuer naechstes Kommando:"
+
+HELP_LINES = (
+    "\n=== Kommandos ===",
+    "all       - Liest kompletten Speicher (formatiert)",
+    "pages     - Listet nur Pages, die nicht komplett 0xFF sind",
+    "hexdump   - Hex-Dump zum Kopieren",
+    "binary    - Binaerdaten senden (fuer Python-Script)",
+    "status    - Liest Status Memory",
+    "sendstatus- Status Memory binaer senden",
+    "dumpall   - ROM + Data + Status als ein Binaerframe",
+    "crcpages N M - M Pages ab Page N mit Chip-CRC16 senden",
+    "readrange A L - L Bytes ab Adresse A binaer senden (hex)",
+    "rom       - Zeigt ROM Code",
+    "ping      - Antwortet mit PONG (Bereitschaftstest)",
+    "baud RATE - Baudrate umschalten (115200..2000000)",
+    "help      - Zeigt diese Hilfe",
+    "[ADRESSE] - Liest 64 Bytes ab Adresse (hex)",
+    "",
+    "Python-Script Kommandos:",
+    "savebin   - Speichert binary.bin",
+    "savehex   - Speichert hexdump.hex",
+    "savestatus- Speichert status.bin",
+    "savefull  - Speichert alles",
+    "",
+)
+
+
+# -------------------------------------------------
+# Speicherinhalt
+def default_image():
+    # Kleiner Beispiel-Dump: die 8 Emulator-Pages belegt, Gerätenummer
+    # und Zulassung gesetzt, Rest 0xFF; Page 0 schreibgeschützt
+    data = bytearray(b"\xFF" * DATA_SIZE)
+    for page in (0, 16, 30, 38, 48, 56, 63, 64):
+        for i in range(PAGE_SIZE):
+            data[page * PAGE_SIZE + i] = (page * 7 + i) & 0xFF
+    data[0x7EC:0x7F0] = b"G123"
+    data[0x7F2:0x7F6] = bytes((0x00, 0x01, 0x02, 0x03))
+    status = bytearray(b"\xFF" * STATUS_SIZE)
+    status[0x00] = 0xFE
+    rom = bytes((0x8B, 0x52, 0xEB, 0x00, 0x00, 0x70, 0x5E))
+    return bytes(data), bytes(status), rom + bytes((crc8(rom),))
+
+
+def load_image(binary, status=None, rom=None):
+    # binary: *_binary.bin; status: *_status.bin (sonst das passende
+    # aus demselben Ordner, sonst 0xFF); rom: "8B52EB..." oder Bytes
+    with open(binary, "rb") as f:
+        data = f.read()
+    if len(data) != DATA_SIZE:
+        raise ValueError(f"{binary}: {len(data)} statt {DATA_SIZE} Bytes")
+
+    if status is None and binary.endswith("binary.bin"):
+        candidate = binary[:-len("binary.bin")] + "status.bin"
+        if os.path.exists(candidate):
+            status = candidate
+    if status is None:
+        status_data = b"\xFF" * STATUS_SIZE
+    else:
+        with open(status, "rb") as f:
+            status_data = f.read()
+        if len(status_data) != STATUS_SIZE:
+            raise ValueError(f"{status}: {len(status_data)} statt {STATUS_SIZE} Bytes")
+
+    if rom is None:
+        rom = default_image()[2]
+    elif isinstance(rom, str):
+        rom = bytes.fromhex("".join(ch for ch in rom if ch not in " :-"))
+    if len(rom) != 8:
+        raise ValueError(f"ROM hat {len(rom)} statt 8 Bytes")
+    return data, status_data, bytes(rom)
+
+
+# -------------------------------------------------
+# Bytes auf der Leitung: jedes Stück kommt erst zu seinem Zeitpunkt an
+class _Timeline:
+    def __init__(self):
+        self._queue = collections.deque()   # [ankunft, bytes, baud]
+        self._cond = threading.Condition()
+        self._interrupted = False
+
+    def put(self, t, data, baud):
+        with self._cond:
+            # die Leitung überholt nicht: nie vor dem vorigen Stück
+            if self._queue and t < self._queue[-1][0]:
+                t = self._queue[-1][0]
+            self._queue.append([t, bytes(data), baud])
+            self._cond.notify_all()
+
+    def ripe(self):
+        # Anzahl Bytes, die schon angekommen sind
+        now = time.monotonic()
+        n = 0
+        with self._cond:
+            for t, data, _baud in self._queue:
+                if t > now:
+                    break
+                n += len(data)
+        return n
+
+    def _wait_ripe(self, deadline):
+        # Aufruf nur mit gehaltenem Lock; True = erstes Byte ist da
+        while True:
+            if self._interrupted:
+                self._interrupted = False
+                return False
+            now = time.monotonic()
+            if self._queue and self._queue[0][0] <= now:
+                return True
+            wait = None if deadline is None else deadline - now
+            if self._queue:
+                head = self._queue[0][0] - now
+                wait = head if wait is None else min(wait, head)
+            if wait is not None and wait <= 0:
+                return False
+            self._cond.wait(wait)
+
+    def wait(self, deadline=None):
+        # bis das erste Byte angekommen ist, ohne es zu nehmen
+        with self._cond:
+            return self._wait_ripe(deadline)
+
+    def take(self, n, deadline=None):
+        """Bis zu n angekommene Bytes als [(bytes, baud), ...].
+
+        Wartet höchstens bis deadline (None = unbegrenzt) auf das erste
+        Byte; interrupt() bricht das Warten ab.
+        """
+        with self._cond:
+            if not self._wait_ripe(deadline):
+                return []
+            now = time.monotonic()
+            pieces = []
+            while n > 0 and self._queue and self._queue[0][0] <= now:
+                entry = self._queue[0]
+                data = entry[1]
+                if len(data) > n:
+                    pieces.append((data[:n], entry[2]))
+                    entry[1] = data[n:]
+                    break
+                pieces.append((data, entry[2]))
+                n -= len(data)
+                self._queue.popleft()
+            return pieces
+
+    def interrupt(self):
+        with self._cond:
+            self._interrupted = True
+            self._cond.notify_all()
+
+    def clear(self):
+        with self._cond:
+            self._queue.clear()
+            self._cond.notify_all()
+
+
+# -------------------------------------------------
+# Der Sketch
+class SimFirmware:
+    def __init__(self, data=None, status=None, rom=None, scale=1.0, latency=0.0,
+                 jitter=0.0, errors=0.0, max_baud=2000000, bus=BUS_BYTE_S, seed=None):
+        if data is None:
+            data, default_status, default_rom = default_image()
+            status = default_status if status is None else status
+            rom = default_rom if rom is None else rom
+        self.data = bytes(data)
+        self.status = bytes(status) if status is not None else b"\xFF" * STATUS_SIZE
+        self.rom = bytes(rom) if rom is not None else default_image()[2]
+        self.scale = scale
+        self.latency = latency
+        self.jitter = jitter
+        self.errors = errors
+        self.max_baud = max_baud
+        self.bus = bus
+        self._rng = random.Random(seed)
+
+        self.baud = DEFAULT_BAUD
+        self.booted = False
+        self.rx = _Timeline()    # Host -> Sketch
+        self.tx = _Timeline()    # Sketch -> Host
+        self.commands = 0
+        self.injected = 0        # Anzahl verfälschter Bytes
+        self._error_gap = None
+        self._pending = bytearray()
+        self._tx_clock = 0.0
+        self._busy_until = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_url(cls, url):
+        # sim://[BINARY]?status=..&rom=..&scale=..&latency=..&jitter=..
+        #       &errors=..&max_baud=..&bus=..&seed=..
+        parts = urlsplit(url)
+        if parts.scheme != "sim":
+            raise ValueError(f"Keine sim://-URL: {url}")
+        options = dict(parse_qsl(parts.query))
+        unknown = set(options) - {
+            "status", "rom", "scale", "latency", "jitter", "errors", "max_baud", "bus", "seed",
+        }
+        if unknown:
+            raise ValueError(f"Unbekannte Optionen: {', '.join(sorted(unknown))}")
+
+        image = parts.netloc + parts.path
+        if image:
+            data, status, rom = load_image(image, options.get("status"), options.get("rom"))
+        else:
+            data, status, rom = default_image()
+            if "rom" in options:
+                rom = bytes.fromhex(options["rom"])
+        return cls(
+            data, status, rom,
+            scale=float(options.get("scale", 1.0)),
+            latency=float(options.get("latency", 0.0)),
+            jitter=float(options.get("jitter", 0.0)),
+            errors=float(options.get("errors", 0.0)),
+            max_baud=int(options.get("max_baud", 2000000)),
+            bus=float(options.get("bus", BUS_BYTE_S)),
+            seed=int(options["seed"]) if "seed" in options else None,
+        )
+
+    # -------------------------------------------------
+    # Start / Stopp (reset=True: wie DTR-Reset, setup() läuft mit Begrüßung)
+    def start(self, reset=True):
+        self.stop()
+        self._stop.clear()
+        self.rx.clear()
+        self.tx.clear()
+        self._pending.clear()
+        boot = reset or not self.booted
+        if boot:
+            self.baud = DEFAULT_BAUD
+        self._thread = threading.Thread(
+            target=self._run, args=(boot, reset), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self.rx.interrupt()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    # -------------------------------------------------
+    # Leitung
+    def receive(self, data, host_baud=None):
+        # vom Host geschrieben; kommt nach latency +- jitter an
+        delay = self.latency
+        if self.jitter:
+            delay += self._rng.uniform(-self.jitter, self.jitter)
+        self.rx.put(time.monotonic() + max(0.0, delay), data,
+                    self.baud if host_baud is None else host_baud)
+
+    def on_wire(self, data, sent_baud, recv_baud=None):
+        # Was der Empfänger bei recv_baud (None = passt immer) sieht
+        if sent_baud > self.max_baud or (recv_baud is not None and recv_baud != sent_baud):
+            return bytes(self._rng.getrandbits(8) for _ in data)
+        return data
+
+    def _next_error(self):
+        # Abstand bis zum nächsten Fehler, geometrisch verteilt - statt
+        # für jedes Byte zu würfeln
+        if self.errors >= 1:
+            return 1
+        return 1 + int(math.log(1.0 - self._rng.random()) / math.log(1.0 - self.errors))
+
+    def _inject(self, data):
+        # Bitfehler mit Wahrscheinlichkeit errors pro Byte; der Abstand
+        # läuft über Aufrufe hinweg weiter
+        if self.errors <= 0:
+            return data
+        if self._error_gap is None:
+            self._error_gap = self._next_error() - 1
+        if self._error_gap >= len(data):
+            self._error_gap -= len(data)
+            return data
+        data = bytearray(data)
+        pos = self._error_gap
+        while pos < len(data):
+            data[pos] ^= 1 << self._rng.randrange(8)
+            self.injected += 1
+            pos += self._next_error()
+        self._error_gap = pos - len(data)
+        return bytes(data)
+
+    def _sleep(self, seconds):
+        if seconds > 0:
+            self._stop.wait(seconds)
+
+    def _transmit(self, piece):
+        # ein Stück <= TX_BUFFER auf die Leitung; blockiert wie
+        # Serial.write, solange der Sendepuffer voll ist
+        byte_s = 10.0 / self.baud
+        now = time.monotonic()
+        self._tx_clock = max(now, self._tx_clock) + len(piece) * byte_s
+        self.tx.put(self._tx_clock, piece, self.baud)
+        self._sleep(self._tx_clock - TX_BUFFER * byte_s - now)
+
+    def _out(self, data):
+        self._pending += data
+        while len(self._pending) >= TX_BUFFER:
+            piece = bytes(self._pending[:TX_BUFFER])
+            del self._pending[:TX_BUFFER]
+            self._transmit(piece)
+
+    def _drain(self):
+        if self._pending:
+            piece = bytes(self._pending)
+            self._pending.clear()
+            self._transmit(piece)
+
+    def _flush(self):
+        # Serial.flush(): warten, bis alles draußen ist
+        self._drain()
+        self._sleep(self._tx_clock - time.monotonic())
+
+    # Serial.print / println / write
+    def _print(self, text):
+        self._out(str(text).encode("latin-1", errors="replace"))
+
+    def _println(self, text=""):
+        self._out(str(text).encode("latin-1", errors="replace") + b"\r\n")
+
+    def _write(self, data):
+        self._out(self._inject(data))
+
+    # Zeit auf dem Arduino
+    def _delay(self, ms):
+        self._drain()
+        self._sleep(ms / 1000.0 * self.scale)
+
+    def _busy(self, seconds):
+        # 1-Wire-Zeit aufsummieren, geschlafen wird erst ab 1 ms
+        seconds *= self.scale
+        if seconds <= 0:
+            return
+        now = time.monotonic()
+        self._busy_until = max(self._busy_until, now) + seconds
+        if self._busy_until - now >= 0.001:
+            self._drain()
+            self._sleep(self._busy_until - now)
+
+    def _bus_reset(self):
+        self._busy(BUS_RESET_S)
+
+    def _bus_command(self, _cmd, _addr):
+        # SKIP ROM, Kommando, Adresse LSB/MSB
+        self._busy(4 * self.bus)
+
+    def _bus_read(self, n):
+        self._busy(n * self.bus)
+
+    # Host -> Sketch
+    def _available(self):
+        return self.rx.ripe()
+
+    def _read_input(self, n=4096, deadline=None):
+        raw = bytearray()
+        for data, baud in self.rx.take(n, deadline):
+            raw += self.on_wire(data, baud, self.baud)
+        return bytes(raw)
+
+    # -------------------------------------------------
+    # Hauptschleife (setup() + loop())
+    def _run(self, boot, reset):
+        if boot and reset:
+            self._setup()
+        self.booted = True
+        while not self._stop.is_set():
+            if not self.rx.wait():
+                continue
+            # WICHTIG: Warte bis alle Zeichen angekommen sind!
+            self._delay(50)
+            raw = self._read_input(deadline=time.monotonic())
+            while self._available():
+                raw += self._read_input(deadline=time.monotonic())
+            text = raw.decode("latin-1").replace("\n", "").replace("\r", "")
+            self._loop_command(text.strip().lower())
+            self._println("\n" + PROMPT)
+            self._drain()
+
+    def _setup(self):
+        self._delay(1000)
+        self.rx.clear()
+        self._println("\n=== DS2506 EPROM Reader ===\n")
+        self._bus_read(8)
+        self._print_rom()
+        self._println("\n=== Erste 128 Bytes ===")
+        self._read_memory(0x0000, 128)
+        self._print_help()
+        self._delay(100)
+        self.rx.clear()
+        self._println("Bereit fuer Befehle!")
+        self._drain()
+
+    def _loop_command(self, cmd):
+        if not cmd:
+            return
+        self.commands += 1
+        self._println(f"Befehl empfangen: '{cmd}'")
+
+        if cmd == "all":
+            self._read_all_memory()
+        elif cmd == "hexdump":
+            self._hexdump()
+        elif cmd == "binary":
+            self._send_binary()
+        elif cmd == "sendstatus":
+            self._send_status()
+        elif cmd == "dumpall":
+            self._send_dump_all()
+        elif cmd.startswith("crcpages"):
+            m = re.match(r"crcpages\s*[+]?(\d+)\s*[+]?(\d+)", cmd)
+            if m:
+                self._send_pages(int(m.group(1)) & 0xFFFF, int(m.group(2)) & 0xFFFF)
+            else:
+                self._println("ERROR_SYNTAX (crcpages <erste> <anzahl>)")
+        elif cmd.startswith("readrange"):
+            m = re.match(r"readrange\s*(?:0x)?([0-9a-f]+)\s*(?:0x)?([0-9a-f]+)", cmd)
+            if m:
+                self._send_range(int(m.group(1), 16) & 0xFFFF, int(m.group(2), 16) & 0xFFFF)
+            else:
+                self._println("ERROR_SYNTAX (readrange <adresse> <laenge>)")
+        elif cmd == "status":
+            self._read_status_memory()
+        elif cmd == "rom":
+            self._print_rom()
+        elif cmd == "ping":
+            self._println("PONG")
+        elif cmd.startswith("baud "):
+            m = re.match(r"\s*(\d+)", cmd[5:])
+            self._switch_baud(int(m.group(1)) if m else 0)
+        elif cmd in ("help", "?"):
+            self._print_help()
+        elif cmd == "pages":
+            self._list_used_pages()
+        else:
+            # Versuche als Hex-Adresse zu interpretieren (strtol, Basis 16)
+            addr = _strtol16(cmd) & 0xFFFF
+            if addr < DATA_SIZE or cmd == "0":
+                self._println(f"\nLese 64 Bytes ab 0x{addr:04X}")
+                self._read_memory(addr, min(64, DATA_SIZE - addr))
+            else:
+                self._println(f"Unbekannter Befehl: '{cmd}'")
+                self._println("Gib 'help' ein fuer alle Kommandos")
+
+    # -------------------------------------------------
+    # Kommandos (Namen wie im Sketch)
+    def _print_rom(self):
+        self._println("ROM Code: " + "".join(f"{b:02X} " for b in self.rom))
+        self._println(f"Family Code: 0x{self.rom[0]:02X}")
+
+    def _print_help(self):
+        for line in HELP_LINES:
+            self._println(line)
+
+    def _read_memory(self, addr, length):
+        self._bus_reset()
+        self._bus_command(0xF0, addr)
+        for i in range(0, length, 16):
+            chunk = self.data[addr + i:addr + min(i + 16, length)]
+            self._bus_read(len(chunk))
+            line = f"0x{addr + i:04X}: " + "".join(f"{b:02X} " for b in chunk)
+            if len(chunk) == 16:
+                self._println(line)
+            else:
+                self._print(line)
+        if length % 16:
+            self._println()
+
+    def _read_status_memory(self):
+        self._println("\n=== Status Memory (256 Bytes, CRC bereinigt) ===")
+        self._bus_reset()
+        self._bus_command(0xAA, 0)
+        for off in range(0, STATUS_SIZE, 16):
+            self._bus_read(20)   # 2 Blöcke à 8 Bytes + 2 CRC
+            self._println(
+                f"0x{off:02X}: " + "".join(f"{b:02X} " for b in self.status[off:off + 16])
+            )
+        self._println()
+
+    def _read_all_memory(self):
+        self._println()
+        self._println("=== PAGE VIEW DES KOMPLETTEN SPEICHERS ===")
+        start = time.monotonic()
+        self._bus_reset()
+        self._bus_command(0xF0, 0)
+        for page in range(PAGE_COUNT):
+            addr = page * PAGE_SIZE
+            self._print(f"\nPage {page:03d} (0x{addr:04X} - 0x{addr + PAGE_SIZE - 1:04X}")
+            self._println("):")
+            for line_off in (0, 16):
+                chunk = self.data[addr + line_off:addr + line_off + 16]
+                self._bus_read(16)
+                ascii_str = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+                self._println(
+                    f"  0x{addr + line_off:04X}: "
+                    + "".join(f"{b:02X} " for b in chunk) + " " + ascii_str
+                )
+        duration = int((time.monotonic() - start) * 1000)
+        self._println("\n========================================")
+        self._println(f"Fertig! Dauer: {duration // 1000}.{duration % 1000} Sekunden")
+        self._println("========================================")
+        self._println()
+
+    def _list_used_pages(self):
+        self._println()
+        self._println("=== PAGE BELEGUNGSCHECK ===")
+        self._bus_reset()
+        self._bus_command(0xF0, 0)
+        self._bus_read(DATA_SIZE)
+        used = 0
+        for page in range(PAGE_COUNT):
+            chunk = self.data[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+            if chunk.count(0xFF) != PAGE_SIZE:
+                used += 1
+                start = page * PAGE_SIZE
+                self._println(
+                    f"Page {page:03d} (0x{start:04X} - 0x{start + PAGE_SIZE - 1:04X}) belegt"
+                )
+        self._println(f"\nInsgesamt {used} belegte Pages von 256")
+        self._println("=== ENDE PAGE BELEGUNGSCHECK ===")
+        self._println()
+
+    def _hexdump(self):
+        self._println("\n=== HEX DUMP START ===")
+        self._bus_reset()
+        self._bus_command(0xF0, 0)
+        for addr in range(0, DATA_SIZE, 16):
+            self._bus_read(16)
+            self._println(
+                f"{addr:04X}: " + "".join(f"{b:02X} " for b in self.data[addr:addr + 16])
+            )
+            if (addr + 16) % 512 == 0:
+                self._println(f"# {(addr + 16) * 100 // DATA_SIZE}%")
+        self._println("=== HEX DUMP END ===")
+
+    def _send_binary(self):
+        self._println("BINARY_START")
+        self._delay(100)
+        self._bus_reset()
+        self._bus_command(0xF0, 0)
+        # pageweise gepuffert, ohne Pause dazwischen
+        for off in range(0, DATA_SIZE, PAGE_SIZE):
+            self._bus_read(PAGE_SIZE)
+            self._write(self.data[off:off + PAGE_SIZE])
+        # Am Speicherende liefert der Chip die (invertierte) CRC16
+        self._bus_read(2)
+        crc = read_memory_crc16(self.data, 0)
+        self._delay(100)
+        self._println()
+        self._println(f"CRC16={crc:04X}")
+        self._println("BINARY_END")
+
+    def _status_blocks(self, with_crc=False):
+        # 0xAA: 32 Blöcke à 8 Bytes + CRC16; die CRC-Bytes gehen nur bei
+        # with_crc mit raus ('dumpall'), sonst verwirft sie der Sketch
+        crc_blocks = status_crc_blocks(self.status) if with_crc else None
+        for block in range(0, STATUS_SIZE, 8):
+            self._bus_read(10)
+            chunk = self.status[block:block + 8]
+            if crc_blocks is not None:
+                crc = crc_blocks[block // 8]
+                chunk = chunk + bytes((crc & 0xFF, crc >> 8))
+            self._write(chunk)
+
+    def _send_status(self):
+        self._println("STATUS_START")
+        self._delay(50)
+        self._bus_reset()
+        self._bus_command(0xAA, 0)
+        self._status_blocks()
+        self._delay(50)
+        self._println("\nSTATUS_END")
+
+    def _stream_pages_with_crc(self, first_page, count):
+        self._bus_command(0xA5, first_page * PAGE_SIZE)
+        for page in range(first_page, first_page + count):
+            chunk = self.data[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+            crc = page_crc16(chunk)
+            self._bus_read(3 + PAGE_SIZE + 2)
+            self._write(chunk + bytes((crc & 0xFF, crc >> 8)))
+
+    def _send_pages(self, first_page, count):
+        if first_page >= PAGE_COUNT or count == 0 or count > PAGE_COUNT - first_page:
+            self._println("ERROR_RANGE")
+            return
+        self._bus_reset()
+        frame_len = count * (PAGE_SIZE + 2)
+        self._println("PAGES_START")
+        self._out(bytes((frame_len & 0xFF, frame_len >> 8)))
+        self._stream_pages_with_crc(first_page, count)
+        self._println()
+        self._println("PAGES_END")
+
+    def _send_range(self, addr, length):
+        if addr >= DATA_SIZE or length == 0 or length > DATA_SIZE - addr:
+            self._println("ERROR_RANGE")
+            return
+        self._bus_reset()
+        self._println("RANGE_START")
+        self._out(bytes((length & 0xFF, length >> 8)))
+        self._bus_command(0xF0, addr)
+        # höchstens eine Page je Serial.write(), wie im Sketch
+        for off in range(addr, addr + length, PAGE_SIZE):
+            end = min(off + PAGE_SIZE, addr + length)
+            self._bus_read(end - off)
+            self._write(self.data[off:end])
+        self._println()
+        self._println("RANGE_END")
+
+    def _send_dump_all(self):
+        frame_len = 8 + PAGE_COUNT * (PAGE_SIZE + 2) + STATUS_SIZE // 8 * 10
+        self._bus_reset()
+        self._println("DUMPALL_START")
+        self._out(bytes((frame_len & 0xFF, frame_len >> 8)))
+        self._write(self.rom)
+        self._stream_pages_with_crc(0, PAGE_COUNT)
+        self._bus_reset()
+        self._bus_command(0xAA, 0)
+        self._status_blocks(with_crc=True)
+        self._println()
+        self._println("DUMPALL_END")
+
+    def _switch_baud(self, rate):
+        if rate not in SUPPORTED_BAUDS:
+            self._println("ERROR_BAUD")
+            return
+
+        self._println(f"BAUD_OK {rate}")
+        self._flush()
+        self.baud = rate
+
+        # 2 s auf 'ping' in der neuen Rate warten (millis(), nicht skaliert)
+        line = ""
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline and not self._stop.is_set():
+            for c in self._read_input(deadline=deadline).decode("latin-1"):
+                if c == "\n":
+                    if line.endswith("ping"):
+                        self._println("PONG")
+                        return
+                    line = ""
+                elif c != "\r" and len(line) < 32:
+                    line += c
+
+        # keine Bestätigung -> zurück zur Standardrate
+        self._flush()
+        self.baud = DEFAULT_BAUD
+
+
+def _strtol16(text):
+    # strtol(text, NULL, 16): führende Leerzeichen, Vorzeichen, 0x,
+    # dann so viele Hex-Ziffern wie da sind (0, wenn keine)
+    m = re.match(r"\s*([+-]?)(?:0x)?([0-9a-f]+)", text)
+    if not m:
+        return 0
+    value = min(int(m.group(2), 16), 0x7FFFFFFFFFFFFFFF)
+    return -value if m.group(1) == "-" else value
+
+
+# -------------------------------------------------
+# Anschluss 1: pyserial-artiges Objekt im selben Prozess
+class SimSerial:
+    def __init__(self, port=None, baudrate=DEFAULT_BAUD, timeout=None, firmware=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.dtr = True
+        self.is_open = False
+        self.firmware = firmware
+        if port is not None and firmware is None:
+            self.open()
+
+    def open(self):
+        if self.firmware is None:
+            self.firmware = SimFirmware.from_url(self.port)
+        self.firmware.start(reset=self.dtr)
+        self.is_open = True
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self.firmware.stop()
+            self.firmware.tx.interrupt()
+
+    @property
+    def in_waiting(self):
+        if not self.is_open:
+            raise OSError("Port nicht geöffnet")
+        return self.firmware.tx.ripe()
+
+    def read(self, size=1):
+        if not self.is_open:
+            raise OSError("Port nicht geöffnet")
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        pieces = self.firmware.tx.take(size, deadline)
+        return b"".join(
+            self.firmware.on_wire(data, baud, self.baudrate) for data, baud in pieces
+        )
+
+    def write(self, data):
+        if not self.is_open:
+            raise OSError("Port nicht geöffnet")
+        self.firmware.receive(bytes(data), self.baudrate)
+        return len(data)
+
+    def cancel_read(self):
+        self.firmware.tx.interrupt()
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self.firmware.tx.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -------------------------------------------------
+# Anschluss 2: Pseudo-Terminal (nur POSIX)
+class PtySimulator:
+    def __init__(self, firmware, link=None):
+        self.firmware = firmware
+        self.link = link
+        self.path = None
+        self._master = None
+        self._slave = None
+        self._threads = []
+        self._running = False
+
+    def _host_baud(self):
+        # Baudrate, die der Host am pty eingestellt hat (None = unbekannt)
+        import termios
+        try:
+            speed = termios.tcgetattr(self._slave)[5]
+        except termios.error:
+            return None
+        for rate in SUPPORTED_BAUDS:
+            if getattr(termios, f"B{rate}", None) == speed:
+                return rate
+        return None
+
+    def start(self):
+        import pty
+        import tty
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.path = os.ttyname(self._slave)
+        if self.link:
+            if os.path.lexists(self.link):
+                os.remove(self.link)
+            os.symlink(self.path, self.link)
+
+        self._running = True
+        self.firmware.start(reset=True)
+        for target in (self._pump_in, self._pump_out):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self.path
+
+    def _pump_in(self):
+        while self._running:
+            try:
+                raw = os.read(self._master, 4096)
+            except OSError:
+                break
+            if raw:
+                self.firmware.receive(raw, self._host_baud())
+
+    def _pump_out(self):
+        while self._running:
+            pieces = self.firmware.tx.take(4096, time.monotonic() + 0.5)
+            host_baud = self._host_baud() if pieces else None
+            for data, baud in pieces:
+                try:
+                    os.write(self._master, self.firmware.on_wire(data, baud, host_baud))
+                except OSError:
+                    return
+
+    def stop(self):
+        self._running = False
+        self.firmware.stop()
+        self.firmware.tx.interrupt()
+        if self.link and os.path.islink(self.link):
+            os.remove(self.link)
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+
+def main():
+    # ds2506_sim.py [--image BINARY] [--status STATUS] [--rom HEX] [--scale F]
+    #               [--latency S] [--jitter S] [--errors P] [--max-baud N]
+    #               [--bus S] [--seed N] [--link PFAD]
+    options = {
+        "--image": None, "--status": None, "--rom": None, "--scale": "1",
+        "--latency": "0", "--jitter": "0", "--errors": "0", "--max-baud": "2000000",
+        "--bus": str(BUS_BYTE_S), "--seed": None, "--link": None,
+    }
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] in options and i + 1 < len(args):
+            options[args[i]] = args[i + 1]
+            i += 2
+            continue
+        print("Nutzung: python ds2506_sim.py [--image BINARY] [--status STATUS] [--rom HEX] "
+              "[--scale F] [--latency S] [--jitter S] [--errors P] [--max-baud N] "
+              "[--bus S] [--seed N] [--link PFAD]")
+        sys.exit(1)
+
+    if options["--image"]:
+        data, status, rom = load_image(options["--image"], options["--status"], options["--rom"])
+    else:
+        data, status, rom = default_image()
+        if options["--rom"]:
+            rom = bytes.fromhex(options["--rom"])
+    firmware = SimFirmware(
+        data, status, rom,
+        scale=float(options["--scale"]),
+        latency=float(options["--latency"]),
+        jitter=float(options["--jitter"]),
+        errors=float(options["--errors"]),
+        max_baud=int(options["--max-baud"]),
+        bus=float(options["--bus"]),
+        seed=int(options["--seed"]) if options["--seed"] else None,
+    )
+
+    sim = PtySimulator(firmware, options["--link"])
+    path = sim.start()
+    print(f"Simulierter Reader auf {path}" + (f" ({sim.link})" if sim.link else ""))
+    print(f"  python read_ds2506.py {sim.link or path}")
+    print("Beenden mit Strg+C")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+        print(f"\n{firmware.commands} Kommandos, {firmware.injected} Bytes verfälscht")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# Inhaltsadressierter Dump-Speicher mit Page-Deduplizierung
+#
+# Die meisten Pages eines Dumps sind 0xFF oder bei allen Geräten eines
+# Modells gleich. Statt 8 KB pro Gerät wird jede 32-Byte-Page nur einmal
+# abgelegt (Schlüssel = Hash des Inhalts), ein Dump ist dann nur noch
+# ein Manifest aus 256 Page-Hashes + Status Memory + ROM. Das Status
+# Memory (fast nur 0xFF) wird genauso in 8 Blöcke zu 32 Bytes zerlegt.
+#
+# Aufbau des Speicherordners:
+#   pages.bin        alle eindeutigen Pages hintereinander (nur anhängen)
+#   manifests.jsonl  eine Zeile pro Dump:
+#                    {"id", "tag", "saved", "rom", "pages", "status"}
+#                    "pages"/"status" = Läufe [hash, anzahl], z.B. 200x
+#                    die FF-Page in einem Eintrag - in Summe immer 256
+#                    bzw. 8 Blöcke
+#
+# Die Dump-ID ist der Hash über ROM + Data + Status: derselbe Dump wird
+# nur einmal gespeichert. Beide Dateien werden nur angehängt; eine beim
+# Absturz abgeschnittene letzte Page/Zeile wird beim Öffnen ignoriert und
+# erst vor dem nächsten Schreiben (put) bzw. mit repair() entfernt -
+# Lesen ändert den Speicher nie.
+#
+# Beispiel:
+#   store = DumpStore("dump_store")
+#   dump_id = store.put(data, status, rom_bytes, tag="WERKSTATT_G123")
+#   rom, data, status = store.get(dump_id)      # bytes, bitgenau
+import hashlib
+import json
+import os
+import threading
+import time
+
+PAGE_SIZE = 32
+PAGE_COUNT = 256
+DATA_SIZE = PAGE_SIZE * PAGE_COUNT
+STATUS_SIZE = 256
+
+
+def page_hash(page):
+    return hashlib.blake2b(page, digest_size=16).hexdigest()
+
+
+def dump_id(data, status, rom=b""):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(bytes(rom))
+    h.update(data)
+    h.update(status)
+    return h.hexdigest()
+
+
+def page_runs(hashes):
+    # [h0, h0, h0, h1, ...] -> [[h0, 3], [h1, 1], ...]
+    runs = []
+    for h in hashes:
+        if runs and runs[-1][0] == h:
+            runs[-1][1] += 1
+        else:
+            runs.append([h, 1])
+    return runs
+
+
+class DumpStore:
+    def __init__(self, root):
+        self.root = root
+        self.pages_file = os.path.join(root, "pages.bin")
+        self.manifest_file = os.path.join(root, "manifests.jsonl")
+        self._pages = {}       # hash -> 32 Bytes
+        self._manifests = {}   # id -> Manifest (dict)
+        self._lock = threading.Lock()
+        self._torn = False     # abgeschnittenes Ende vom letzten Absturz?
+
+        # Ausgabe wie beim DS2506Reader: log(...) mit print-Signatur
+        self.log = print
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _log(self, *args, **kwargs):
+        self.log(*args, **kwargs)
+
+    # -------------------------------------------------
+    # Laden (nur lesen, ein abgeschnittenes Ende wird übergangen)
+    def _load(self):
+        if os.path.exists(self.pages_file):
+            with open(self.pages_file, "rb") as f:
+                blob = f.read()
+            usable = len(blob) - len(blob) % PAGE_SIZE
+            if usable != len(blob):
+                self._torn = True
+            view = memoryview(blob)
+            for off in range(0, usable, PAGE_SIZE):
+                page = bytes(view[off:off + PAGE_SIZE])
+                self._pages.setdefault(page_hash(page), page)
+
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        self._torn = True
+                    try:
+                        manifest = json.loads(line)
+                    except ValueError:
+                        continue
+                    runs = manifest["pages"] + manifest["status"]
+                    if all(h in self._pages for h, _n in runs):
+                        self._manifests[manifest["id"]] = manifest
+
+    # -------------------------------------------------
+    # Abgeschnittenes Ende nach einem Absturz entfernen
+    #
+    # Eine halbe Page am Ende von pages.bin würde alle danach angehängten
+    # Pages verschieben, eine halbe Zeile in manifests.jsonl die nächste
+    # Zeile verderben. put() repariert deshalb vor dem ersten Schreiben
+    # selbst. Liefert die Zahl der entfernten Bytes.
+    def repair(self):
+        with self._lock:
+            return self._repair()
+
+    def _repair(self):
+        cut = 0
+        if os.path.exists(self.pages_file):
+            size = os.path.getsize(self.pages_file)
+            extra = size % PAGE_SIZE
+            if extra:
+                with open(self.pages_file, "r+b") as f:
+                    f.truncate(size - extra)
+                self._log(f"{self.pages_file}: {extra} Bytes einer abgeschnittenen Page entfernt")
+                cut += extra
+
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, "rb") as f:
+                raw = f.read()
+            tail = raw[raw.rfind(b"\n") + 1:]
+            if tail:
+                try:
+                    json.loads(tail)
+                    complete = True
+                except ValueError:
+                    complete = False
+                with open(self.manifest_file, "r+b") as f:
+                    if complete:
+                        # Zeile vollständig, nur der Zeilenumbruch fehlt
+                        f.seek(0, os.SEEK_END)
+                        f.write(b"\n")
+                    else:
+                        f.truncate(len(raw) - len(tail))
+                        self._log(
+                            f"{self.manifest_file}: {len(tail)} Bytes einer "
+                            f"abgeschnittenen Zeile entfernt"
+                        )
+                        cut += len(tail)
+
+        self._torn = False
+        return cut
+
+    # -------------------------------------------------
+    # Speichern
+    def put(self, data, status, rom=None, tag=""):
+        data = bytes(data)
+        status = bytes(status)
+        rom = bytes(rom or b"")
+        if len(data) != DATA_SIZE:
+            raise ValueError(f"Data Memory hat {len(data)} statt {DATA_SIZE} Bytes")
+        if len(status) != STATUS_SIZE:
+            raise ValueError(f"Status Memory hat {len(status)} statt {STATUS_SIZE} Bytes")
+
+        did = dump_id(data, status, rom)
+        with self._lock:
+            if did in self._manifests:
+                return did
+
+            if self._torn:
+                self._repair()
+
+            new_pages = {}
+            data_runs = self._split(data, new_pages)
+            status_runs = self._split(status, new_pages)
+
+            # erst die Pages, dann das Manifest - so zeigt ein Manifest nie
+            # auf eine Page, die es (noch) nicht gibt
+            if new_pages:
+                with open(self.pages_file, "ab") as f:
+                    f.write(b"".join(new_pages.values()))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._pages.update(new_pages)
+
+            manifest = {
+                "id": did,
+                "tag": tag,
+                "saved": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "rom": rom.hex().upper(),
+                "pages": data_runs,
+                "status": status_runs,
+            }
+            with open(self.manifest_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(manifest) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._manifests[did] = manifest
+        return did
+
+    def _split(self, blob, new_pages):
+        # blob in 32-Byte-Stücke zerlegen, unbekannte in new_pages sammeln
+        hashes = []
+        for off in range(0, len(blob), PAGE_SIZE):
+            page = blob[off:off + PAGE_SIZE]
+            h = page_hash(page)
+            hashes.append(h)
+            known = self._pages.get(h, new_pages.get(h))
+            if known is None:
+                new_pages[h] = page
+            elif known != page:
+                raise ValueError(f"Hash-Kollision bei Offset 0x{off:04X}")
+        return page_runs(hashes)
+
+    # -------------------------------------------------
+    # Rekonstruktion
+    def _join(self, runs):
+        pages = self._pages
+        return b"".join(pages[h] * n for h, n in runs)
+
+    def get_data(self, did):
+        return self._join(self._manifests[did]["pages"])
+
+    def get(self, did):
+        # -> (rom, data, status) als bytes, identisch zum gespeicherten Dump
+        manifest = self._manifests[did]
+        return (
+            bytes.fromhex(manifest["rom"]),
+            self._join(manifest["pages"]),
+            self._join(manifest["status"]),
+        )
+
+    def manifest(self, did):
+        return self._manifests[did]
+
+    def ids(self):
+        return list(self._manifests)
+
+    def find(self, prefix):
+        # Dump-ID per eindeutigem Anfang (wie bei git)
+        matches = [did for did in self._manifests if did.startswith(prefix)]
+        if len(matches) != 1:
+            raise KeyError(f"{len(matches)} Dumps passen zu '{prefix}'")
+        return matches[0]
+
+    def __contains__(self, did):
+        return did in self._manifests
+
+    def __len__(self):
+        return len(self._manifests)
+
+    def stats(self):
+        dumps = len(self._manifests)
+        logical = dumps * (DATA_SIZE + STATUS_SIZE)
+        pages_bytes = os.path.getsize(self.pages_file) if os.path.exists(self.pages_file) else 0
+        manifest_bytes = (
+            os.path.getsize(self.manifest_file) if os.path.exists(self.manifest_file) else 0
+        )
+        stored = pages_bytes + manifest_bytes
+        return {
+            "dumps": dumps,
+            "unique_pages": len(self._pages),
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "ratio": round(logical / stored, 1) if stored else 0.0,
+        }
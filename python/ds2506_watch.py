@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# Änderungen zwischen zwei Abfragen eines Geräts erkennen ('watch')
+#
+# PageWatcher hält den letzten Stand (Data Memory + Status Memory) und
+# zu jeder beobachteten Page ihren Hash. update() vergleicht einen neuen
+# Stand damit und liefert Ereignisse (dicts, eine JSON-Zeile je Ereignis):
+#
+#   {"ts", "poll", "event": "start", "pages", "used_pages"}
+#   {"ts", "poll", "event": "page", "page", "addr", "ranges", "old", "new"}
+#       ranges = geänderte Bytes als [[erste, letzte], ...] (absolute
+#       Adressen), old/new = die ganze Page als Hex
+#   {"ts", "poll", "event": "status", "addr", "old", "new",
+#    "cleared", "set", "field", "pages"}
+#       cleared/set = Bitnummern 1->0 bzw. 0->1 (EPROM: nur 1->0 ist
+#       Programmieren), field = "WP" (0x00..0x1F), "EPROM" (0x20..0x3F),
+#       "CP" (ab 0x100, heuristisch wie in status_protection_pages) oder
+#       "STATUS"; pages = betroffene Pages bei WP/CP (ds2506_diff.status_flips)
+#   {"ts", "poll", "event": "error", "message"}
+#
+# Ist der neue Stand bytegleich mit dem alten (der Normalfall), wird gar
+# nichts gehasht - ein Vergleich über 8 KB, fertig. Sonst werden nur die
+# beobachteten Pages neu gehasht und die mit anderem Hash verglichen.
+#
+# Beispiel:
+#   watcher = PageWatcher(pages=range(64))
+#   for event in watcher.update(data, status):
+#       print(json.dumps(event))
+import time
+
+from ds2506_diff import byte_ranges, status_flips
+from ds2506_store import page_hash
+
+PAGE_SIZE = 32
+PAGE_COUNT = 256
+
+
+class PageWatcher:
+    def __init__(self, pages=None, clock=time.time):
+        self.pages = sorted(set(range(PAGE_COUNT) if pages is None else pages))
+        self.clock = clock
+        self.poll = 0
+        self.data = None
+        self.status = None
+        self._hashes = {}
+
+    def _event(self, name, **fields):
+        event = {"ts": round(self.clock(), 3), "poll": self.poll, "event": name}
+        event.update(fields)
+        return event
+
+    def _hash_pages(self, data):
+        return {p: page_hash(data[p * PAGE_SIZE:(p + 1) * PAGE_SIZE]) for p in self.pages}
+
+    def error(self, message):
+        # zählt als Abfrage, der letzte gute Stand bleibt Vergleichsbasis
+        self.poll += 1
+        return self._event("error", message=message)
+
+    def update(self, data, status=None):
+        """Neuen Stand übernehmen; liefert die Ereignisse seit dem letzten."""
+        self.poll += 1
+        data = bytes(data)
+        status = bytes(status) if status is not None else None
+
+        if self.data is None:
+            self.data, self.status = data, status
+            self._hashes = self._hash_pages(data)
+            used = [p for p in self.pages
+                    if data[p * PAGE_SIZE:(p + 1) * PAGE_SIZE].count(0xFF) != PAGE_SIZE]
+            return [self._event("start", pages=len(self.pages), used_pages=used)]
+
+        events = []
+        if data != self.data:
+            hashes = self._hash_pages(data)
+            for page in self.pages:
+                if hashes[page] == self._hashes[page]:
+                    continue
+                start = page * PAGE_SIZE
+                old = self.data[start:start + PAGE_SIZE]
+                new = data[start:start + PAGE_SIZE]
+                events.append(self._event(
+                    "page", page=page, addr=start,
+                    ranges=byte_ranges(old, new, start),
+                    old=old.hex().upper(), new=new.hex().upper(),
+                ))
+            self.data, self._hashes = data, hashes
+
+        if status is not None:
+            if self.status is not None and status != self.status:
+                for flip in status_flips(self.status, status):
+                    events.append(self._event("status", **flip))
+            self.status = status
+        return events
@@ -1,121 +1,475 @@
 #!/usr/bin/env python3
-import serial
 import sys
 import time
 import os
+import threading
+import glob
+import json
+import csv
+import functools
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from ds2506_archive import ArchiveWriter, DumpArchive
+from ds2506_crc import Crc16, crc8, read_memory_crc16
+from ds2506_diff import FIELD_LABELS, diff_dumps, format_diff, page_jaccard, similar_pairs
+from ds2506_hexdump import hexdump_lines, write_hexdump
+from ds2506_index import DumpIndex, QUERY_FIELDS, occupancy_bitmap
+from ds2506_metrics import TransferMetrics, write_prometheus
+from ds2506_model import BLANK_PAGE, DS2506Model, encode_image, encode_page, parse_header
+from ds2506_protocol import (
+    BINARY_MARKERS, DUMPALL_FRAME_SIZE, DUMPALL_MARKERS, FAST_BAUDRATES, PAGE_COUNT,
+    PAGE_RECORD_SIZE, PAGE_SIZE, PAGES_MARKERS, PROMPT_LINE, RANGE_MARKERS,
+    READ_MEMORY_HEADER, STATUS_MARKERS, ReaderProtocol, baud_reply, decode_rom,
+)
+from ds2506_store import DumpStore
+from ds2506_watch import PageWatcher
+
+try:
+    import serial
+except ImportError:
+    # pyserial wird nur für den Live-Betrieb gebraucht, nicht für 'analyze'
+    serial = None
+
+
+# Port-Präfix für den simulierten Reader (ds2506_sim.py), z.B.
+# "sim://?latency=0.002&errors=1e-4" oder "sim://archiv/x_binary.bin"
+SIM_URL_PREFIX = "sim://"
+
+# Sparse-Profile: nur diese (logischen) Pages lesen, Rest bleibt 0xFF.
+# "emulator" = die 8 Pages des mitgelieferten Emulator-Abbilds.
+FF_PAGE = b"\xFF" * PAGE_SIZE
+
+SPARSE_PROFILES = {
+    "emulator": [0, 16, 30, 38, 48, 56, 63, 64],
+}
+
+# 'watch' läuft beliebig lange; so viele Operationen bleiben in metrics
+WATCH_KEEP_OPERATIONS = 1000
 
 
-class DS2506Reader:
-    def __init__(self, port, baudrate=115200):
+# -------------------------------------------------
+# Hintergrund-Empfänger
+#
+# Ein Thread liest alles, was vom Arduino kommt, in einen Puffer.
+# Daraus werden wahlweise Textzeilen (read_line) oder eine feste Anzahl
+# roher Bytes (read_exact, für Binärframes) entnommen. Gewartet wird
+# per Condition bis zur Deadline, nicht mehr per sleep()-Polling.
+class SerialRxThread(threading.Thread):
+    def __init__(self, ser):
+        super().__init__(daemon=True)
+        self.ser = ser
+        self.error = None
+        self._buf = bytearray()
+        self._cond = threading.Condition()
+        self._running = True
+
+    def run(self):
+        while self._running:
+            try:
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError, AttributeError) as e:
+                # Port geschlossen oder abgezogen
+                with self._cond:
+                    if self._running:
+                        self.error = e
+                    self._running = False
+                    self._cond.notify_all()
+                break
+            if chunk:
+                with self._cond:
+                    self._buf.extend(chunk)
+                    self._cond.notify_all()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        # blockierendes ser.read() im Thread sofort abbrechen
+        if hasattr(self.ser, "cancel_read"):
+            try:
+                self.ser.cancel_read()
+            except (serial.SerialException, OSError):
+                pass
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=2)
+
+    def clear(self):
+        with self._cond:
+            self._buf.clear()
+
+    def _wait(self, ready, deadline):
+        # Aufruf nur mit gehaltenem Lock; ready() True => erfüllt
+        while not ready():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._running:
+                return False
+            self._cond.wait(remaining)
+        return True
+
+    def read_line(self, deadline):
+        """Nächste Textzeile (ohne CR/LF) oder None bei Timeout."""
+        with self._cond:
+            if not self._wait(lambda: b"\n" in self._buf, deadline):
+                return None
+            idx = self._buf.index(b"\n")
+            raw = bytes(self._buf[:idx])
+            del self._buf[:idx + 1]
+        return raw.decode("utf-8", errors="ignore").rstrip("\r")
+
+    def read_exact(self, n, deadline, progress=None, sink=None, step=1):
+        """Genau n Bytes; bei Timeout das, was bis dahin da war.
+
+        sink(chunk) bekommt jedes Teilstück gleich beim Empfang
+        (z.B. Crc16.update für eine mitlaufende Prüfsumme). Mit step > 1
+        sind die Teilstücke immer ganze Vielfache von step (z.B. ganze
+        Pages); nur bei Timeout kommt ein angebrochener Rest.
+        """
+        data = bytearray()
+        while len(data) < n:
+            need = min(step, n - len(data))
+            with self._cond:
+                complete = self._wait(lambda: len(self._buf) >= need, deadline)
+                take = min(n - len(data), len(self._buf))
+                if complete:
+                    take -= take % need
+                chunk = bytes(self._buf[:take])
+                del self._buf[:take]
+            if chunk:
+                data.extend(chunk)
+                if sink:
+                    sink(chunk)
+                if progress:
+                    progress(len(data))
+            if not complete:
+                break
+        return bytes(data)
+
+
+# -------------------------------------------------
+# Reader-Methode als Operation in reader.metrics erfassen
+# (Dauer, Phasen, Erfolg; siehe ds2506_metrics.py)
+def timed_operation(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.operation(name, self.baudrate) as op:
+                result = func(self, *args, **kwargs)
+                op.ok = result is not None and result is not False
+                return result
+        return wrapper
+    return decorator
+
+
+class DS2506Reader(ReaderProtocol):
+    def __init__(self, port, baudrate=115200, fast_baudrates=FAST_BAUDRATES):
         self.port = port
         self.baudrate = baudrate
+        self.base_baudrate = baudrate
+        self.fast_baudrates = fast_baudrates
         self.ser = None
+        self.rx = None
         self.memory_size = 8192  # 8 kB Dumpgröße
+        self.connect_time = None
+        self.metrics = TransferMetrics(port)
+        self.has_ping = None     # PONG beim Handshake (None: noch nicht verbunden)
+        self.has_dumpall = None  # unbekannt, bis 'dumpall' versucht wurde
+
+        # Ausgabe: log(...) mit print-Signatur; progress=False
+        # unterdrückt die Fortschrittszeile (z.B. im Flotten-Modus)
+        self.log = print
+        self.progress = True
+
+    def _log(self, *args, **kwargs):
+        self.log(*args, **kwargs)
 
     # -------------------------------------------------
     # Serielle Verbindung aufbauen / schließen
-    def connect(self):
+    # reset=True: DTR beim Öffnen setzen -> Arduino startet neu (Auto-Reset).
+    # reset=False: DTR bleibt aus, ein laufender Reader antwortet sofort.
+    # In beiden Fällen wird per ping/PONG gewartet, bis der Sketch bereit ist.
+    @timed_operation("connect")
+    def connect(self, reset=False, timeout=5.0):
+        if serial is None:
+            self._log("pyserial fehlt: python -m pip install pyserial")
+            return False
         try:
-            self.ser = serial.Serial(self.port, self.baudrate, timeout=1)
-            print(f"Verbunden mit {self.port} @ {self.baudrate} baud")
-            time.sleep(2)
-
-            # Begrüßungslinien vom Arduino leerlesen
-            time.sleep(0.5)
-            while self.ser.in_waiting:
-                line = self.ser.readline().decode("utf-8", errors="ignore").rstrip()
-                if line:
-                    print(line)
+            if str(self.port).startswith(SIM_URL_PREFIX):
+                # simulierter Reader statt Arduino (ds2506_sim.py)
+                from ds2506_sim import SimSerial
+                self.ser = SimSerial()
+            else:
+                self.ser = serial.Serial()
+            self.ser.port = self.port
+            self.ser.baudrate = self.baudrate
+            self.ser.timeout = 1
+            self.ser.dtr = reset
+            t_open = time.monotonic()
+            self.ser.open()
+            self.metrics.add_phase("open", time.monotonic() - t_open)
+            self._log(f"Verbunden mit {self.port} @ {self.baudrate} baud")
+
+            self.rx = SerialRxThread(self.ser)
+            self.rx.start()
+
+            t0 = time.monotonic()
+            if not self._handshake(timeout):
+                self.metrics.add_phase("handshake", time.monotonic() - t0)
+                self.metrics.count("timeouts")
+                self._log(f"Reader antwortet nicht (kein PONG nach {timeout:.1f}s).")
+                self.disconnect()
+                return False
+            t_ready = time.monotonic()
+            self.metrics.add_phase("handshake", t_ready - t0)
+            self._log(f"Reader bereit nach {t_ready - t0:.2f}s")
+
+            if self.fast_baudrates:
+                self.negotiate_baudrate(self.fast_baudrates)
+                self.metrics.add_phase("baud", time.monotonic() - t_ready)
+            self.connect_time = time.monotonic() - t0
 
             return True
-        except serial.SerialException as e:
-            print(f"Fehler beim Verbinden: {e}")
+        except (serial.SerialException, ValueError, OSError) as e:
+            self._log(f"Fehler beim Verbinden: {e}")
             return False
 
+    # -------------------------------------------------
+    # Bereitschafts-Handshake
+    #
+    # Schickt 'ping' und wartet je Versuch kurz auf 'PONG'. Während der
+    # Arduino noch bootet, verwirft setup() die Eingaben; dann wird nach
+    # Ablauf des Versuchs (oder sobald die Begrüßung durch ist) erneut
+    # gepingt. Pro Versuch ist höchstens ein ping unterwegs, damit keine
+    # doppelte Antwort in das nächste Kommando läuft. Ältere Sketche ohne
+    # 'ping' antworten mit dem Prompt, das gilt ebenfalls als bereit.
+    def _handshake(self, timeout, attempt_timeout=0.3):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.ser.write(b"ping\n")
+            attempt_deadline = min(deadline, time.monotonic() + attempt_timeout)
+            while True:
+                line = self.rx.read_line(attempt_deadline)
+                if line is None:
+                    break
+                reply = self._handshake_line(line)
+                if reply == "ready":
+                    if self.has_ping:
+                        self._read_until_prompt(time.monotonic() + 0.5, echo=None)
+                    self.rx.clear()
+                    return True
+                # nach der Begrüßung bekommt der laufende ping noch ein
+                # volles Zeitfenster
+                if reply == "banner":
+                    attempt_deadline = min(deadline, time.monotonic() + attempt_timeout)
+        return False
+
+    # -------------------------------------------------
+    # Schnellere Baudrate aushandeln
+    #
+    # Ablauf je Rate: 'baud <rate>' -> BAUD_OK <rate> (alte Rate),
+    # beide Seiten schalten um, 'ping' -> PONG in der neuen Rate.
+    # Ohne PONG schaltet der Sketch nach 2 s selbst zurück; der PC
+    # wartet dann auf dessen Prompt in der alten Rate und probiert die
+    # nächste Rate. Liefert die aktive Baudrate.
+    #
+    # Nur wenn der Handshake ein PONG bekommen hat: ältere Sketche kennen
+    # 'baud' nicht und lesen "baud <rate>" als Hex-Adresse (strtol ->
+    # 0xBA) - das kostet je Rate einen Timeout und einen 1-Wire-Zugriff.
+    def negotiate_baudrate(self, rates):
+        if not self.has_ping:
+            self._log("Sketch ohne 'ping' (kein PONG), bleibe bei", self.baudrate)
+            return self.baudrate
+
+        for rate in rates:
+            if rate == self.baudrate:
+                break
+
+            lines = self.send_command(
+                f"baud {rate}", timeout=1.0, terminator=(f"BAUD_OK {rate}", PROMPT_LINE)
+            )
+            reply = baud_reply(lines, rate)
+            if reply == "unsupported":
+                self._log("Sketch kennt 'baud' nicht, bleibe bei", self.baudrate)
+                break
+            if reply != "ok":
+                continue
+
+            # Sketch schaltet nach dem Senden von BAUD_OK um
+            old_rate = self.baudrate
+            self.ser.baudrate = rate
+            self.rx.clear()
+
+            if self._confirm_baudrate():
+                self.baudrate = rate
+                self._log(f"Baudrate umgeschaltet: {old_rate} -> {rate}")
+                return rate
+
+            self._log(f"Baudrate {rate} nicht stabil, zurück auf {old_rate}")
+            self.ser.baudrate = old_rate
+            self.rx.clear()
+            # Sketch fällt nach 2 s zurück und meldet sich mit dem Prompt
+            self._read_until_prompt(time.monotonic() + 3, echo=None)
+            self.rx.clear()
+
+        return self.baudrate
+
+    def _confirm_baudrate(self, attempts=3):
+        for _ in range(attempts):
+            self.ser.write(b"ping\n")
+            deadline = time.monotonic() + 0.3
+            while True:
+                line = self.rx.read_line(deadline)
+                if line is None:
+                    break
+                if line.strip() == "PONG":
+                    self._read_until_prompt(time.monotonic() + 0.5, echo=None)
+                    self.rx.clear()
+                    return True
+        return False
+
+    # -------------------------------------------------
+    # Kurzer Überblick über die Sitzung
+    def session_summary(self):
+        summary = {
+            "port": self.port,
+            "baudrate": self.baudrate,
+            "baudrate_negotiated": self.baudrate != self.base_baudrate,
+            "connect_time_s": self.connect_time,
+        }
+        self._log("\n=== Sitzung ===")
+        self._log(f"Port:      {self.port}")
+        self._log(
+            f"Baudrate:  {self.baudrate}"
+            + (" (ausgehandelt)" if summary["baudrate_negotiated"] else "")
+        )
+        if self.connect_time is not None:
+            self._log(f"Verbinden: {self.connect_time:.2f}s")
+        for line in self.metrics.format_summary():
+            self._log(line)
+        summary["metrics"] = self.metrics.summary()
+        return summary
+
     def disconnect(self):
+        if self.rx:
+            self.rx.stop()
+            self.rx = None
         if self.ser and self.ser.is_open:
             self.ser.close()
-            print("Verbindung geschlossen")
+            self._log("Verbindung geschlossen")
+
+    def _is_connected(self):
+        if not self.ser or not self.ser.is_open or not self.rx:
+            self._log("Nicht verbunden!")
+            return False
+        if self.rx.error:
+            self._log(f"Serielle Verbindung unterbrochen: {self.rx.error}")
+            return False
+        return True
+
+    # -------------------------------------------------
+    # Text bis zum Prompt des Arduino einsammeln
+    #
+    # Liest Zeilen bis PROMPT_LINE oder Deadline. Optional wird ein
+    # Ende-Marker (BINARY_END, STATUS_END, ...) gemeldet.
+    def _read_until_prompt(self, deadline, end_marker=None, echo="< "):
+        t0 = time.monotonic()
+        lines = []
+        while True:
+            line = self.rx.read_line(deadline)
+            if line is None:
+                self.metrics.add_phase("trailer", time.monotonic() - t0)
+                self.metrics.count("timeouts")
+                return lines, False
+            line = line.strip()
+            if not line:
+                continue
+            if echo is not None:
+                self._log(f"{echo}{line}")
+            lines.append(line)
+            if end_marker and line == end_marker and echo is not None:
+                self._log("Ende-Marker erkannt:", end_marker)
+            if line == PROMPT_LINE:
+                self.metrics.add_phase("trailer", time.monotonic() - t0)
+                return lines, True
 
     # -------------------------------------------------
     # Roh-Kommando an den Arduino schicken + Text lesen
-    def send_command(self, cmd):
-        if not self.ser or not self.ser.is_open:
-            print("Nicht verbunden!")
+    #
+    # Kehrt zurück, sobald die Abschlusszeile (terminator, auch Tupel
+    # mehrerer Zeilen) kommt, spätestens nach timeout Sekunden.
+    # terminator=None liest bis zum Timeout.
+    @timed_operation("command")
+    def send_command(self, cmd, timeout=15.0, terminator=PROMPT_LINE):
+        if not self._is_connected():
             return None
+        if isinstance(terminator, str):
+            terminator = (terminator,)
 
+        self.rx.clear()
         self.ser.write(f"{cmd}\n".encode())
-        time.sleep(0.1)
+        t0 = time.monotonic()
+        deadline = t0 + timeout
 
         output = []
         while True:
-            if self.ser.in_waiting:
-                line = self.ser.readline().decode("utf-8", errors="ignore").rstrip()
-                if line:
-                    print(line)
-                    output.append(line)
-            else:
-                time.sleep(0.1)
-                if not self.ser.in_waiting:
+            line = self.rx.read_line(deadline)
+            if line is None:
+                if terminator:
+                    self.metrics.count("timeouts")
+                    self._log(f"Timeout: keine Abschlusszeile nach {timeout:.1f}s")
+                break
+            line = line.rstrip()
+            if line:
+                self._log(line)
+                output.append(line)
+                if terminator and line in terminator:
                     break
 
+        self.metrics.add_phase("response", time.monotonic() - t0)
         return output
 
-    # -------------------------------------------------
-    # CRC8 (Dallas/Maxim) für ROM-Code
-    def compute_crc8_maxim(self, data_bytes):
-        crc = 0
-        for byte in data_bytes:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x01:
-                    crc = (crc >> 1) ^ 0x8C
-                else:
-                    crc >>= 1
-            crc &= 0xFF
-        return crc
-
     def get_rom_info(self):
         lines = self.send_command("rom")
-        rom_bytes = []
-
-        for line in lines:
-            if line.startswith("ROM Code"):
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    hexlist = parts[1].strip().split()
-                else:
-                    hexlist = line.replace("ROM Code", "").strip().split()
-                for p in hexlist:
-                    try:
-                        rom_bytes.append(int(p, 16))
-                    except ValueError:
-                        pass
-
-        info = {}
-        print("\n=== ROM Code Analyse (Python) ===")
-        if len(rom_bytes) == 8:
-            calc_crc = self.compute_crc8_maxim(rom_bytes[:7])
-            chip_crc = rom_bytes[7]
-            crc_ok = (calc_crc == chip_crc)
-
-            print("ROM Bytes:", " ".join(f"{b:02X}" for b in rom_bytes))
-            print(f"Family Code: 0x{rom_bytes[0]:02X}")
-            print(f"CRC (Chip / Byte7): 0x{chip_crc:02X}")
-            print(f"CRC (berechnet):    0x{calc_crc:02X}")
-            print("CRC Status:", "OK" if crc_ok else "FEHLER!")
-
-            info = {
-                "rom_bytes": rom_bytes,
-                "family_code": rom_bytes[0],
-                "crc_chip": chip_crc,
-                "crc_calc": calc_crc,
-                "crc_ok": crc_ok,
-            }
-        else:
-            print("Konnte ROM Code nicht sauber parsen (nicht exakt 8 Bytes).")
+        return self.analyze_rom_bytes(self.parse_rom_lines(lines))
 
-        return info
+    # -------------------------------------------------
+    # Auf Start-Marker eines Binärblocks warten
+    #
+    # markers: {start_marker: end_marker}. Liefert das passende
+    # Marker-Paar oder (None, None) bei Fehler/Timeout.
+    def _wait_for_start_marker(self, markers, timeout=5.0):
+        t0 = time.monotonic()
+        deadline = t0 + timeout
+        try:
+            while True:
+                line = self.rx.read_line(deadline)
+                if line is None:
+                    self.metrics.count("timeouts")
+                    return None, None
+                pair = self._start_marker(line, markers)
+                if pair is not None:
+                    return pair
+        finally:
+            self.metrics.add_phase("marker", time.monotonic() - t0)
+
+    def _receive_payload(self, size, timeout, sink=None, step=1):
+        start_time = time.monotonic()
+
+        def progress(n):
+            if not self.progress:
+                return
+            elapsed = time.monotonic() - start_time
+            self._log(
+                f"\rFortschritt: {n * 100 // size}% ({n}/{size}) - {elapsed:.1f}s",
+                end="",
+            )
+
+        data = self.rx.read_exact(size, start_time + timeout, progress, sink, step)
+        self.metrics.add_phase("payload", time.monotonic() - start_time)
+        self.metrics.add_bytes(len(data))
+        if len(data) < size:
+            self.metrics.count("timeouts")
+        self._log("\nFertig! Länge empfangen:", len(data))
+        return data
 
     # -------------------------------------------------
     # 8 kB Data Memory holen
@@ -123,384 +477,467 @@ class DS2506Reader:
     # Arduino-Protokoll:
     #   BINARY_START (oder BIN_START)
     #   <8192 rohe Bytes via Serial.write()>
+    #   CRC16=XXXX   (CRC des Chips nach READ MEMORY, neuere Sketche)
     #   BINARY_END   (oder BIN_END)
     #
-    def read_binary_data(self):
-        if not self.ser or not self.ser.is_open:
-            print("Nicht verbunden!")
+    # Der Sketch liest pageweise vom Bus und schickt jede Page mit einem
+    # Serial.write(); entsprechend wird hier in ganzen Pages entnommen.
+    # Die CRC16 läuft dabei mit und wird am Ende mit der des Chips
+    # verglichen. on_page(page, data) sieht jede Page, sobald sie da ist.
+    @timed_operation("binary")
+    def read_binary_data(self, on_page=None):
+        if not self._is_connected():
             return None
 
-        print("Sende 'binary' Kommando...")
+        self._log("Sende 'binary' Kommando...")
+        self.rx.clear()
         self.ser.write(b"binary\n")
 
-        start_marker = None
-        end_marker = None
-        timeout = time.time() + 5
-
         # auf Start-Marker warten
-        while time.time() < timeout:
-            if self.ser.in_waiting:
-                line = self.ser.readline().decode("utf-8", errors="ignore").strip()
-                if line:
-                    print(f"< {line}")
-                if line == "BINARY_START":
-                    start_marker = "BINARY_START"
-                    end_marker = "BINARY_END"
-                    break
-                if line == "BIN_START":
-                    start_marker = "BIN_START"
-                    end_marker = "BIN_END"
-                    break
-                if "ERROR" in line:
-                    print("Fehler beim Lesen!")
-                    return None
-            else:
-                time.sleep(0.05)
-
+        start_marker, end_marker = self._wait_for_start_marker(BINARY_MARKERS)
         if start_marker is None:
-            print("Timeout/kein START-Marker erkannt (BINARY_START / BIN_START).")
+            self._log("Timeout/kein START-Marker erkannt (BINARY_START / BIN_START).")
             return None
 
-        print(f"Empfange Data Memory ({self.memory_size} Bytes)...")
-        data = bytearray()
-        start_time = time.time()
+        self._log(f"Empfange Data Memory ({self.memory_size} Bytes)...")
+        crc = Crc16(READ_MEMORY_HEADER)  # Kommando + Startadresse wie beim Chip
+        next_page = 0
 
-        while len(data) < self.memory_size:
-            chunk = self.ser.read(self.memory_size - len(data))
-            if chunk:
-                data.extend(chunk)
-
-            progress = len(data) * 100 // self.memory_size
-            elapsed = time.time() - start_time
-            print(
-                f"\rFortschritt: {progress}% ({len(data)}/{self.memory_size}) - {elapsed:.1f}s",
-                end="",
-            )
-
-        print("\nFertig! Länge empfangen:", len(data))
+        def sink(chunk):
+            nonlocal next_page
+            crc.update(chunk)
+            if on_page:
+                for off in range(0, len(chunk) - PAGE_SIZE + 1, PAGE_SIZE):
+                    on_page(next_page, chunk[off:off + PAGE_SIZE])
+                    next_page += 1
 
-        # Rest lesen bis END-Marker (optional)
-        timeout2 = time.time() + 2
-        while time.time() < timeout2 and self.ser.in_waiting == 0:
-            time.sleep(0.05)
+        data = self._receive_payload(self.memory_size, timeout=30.0, sink=sink, step=PAGE_SIZE)
 
-        while self.ser.in_waiting:
-            line = self.ser.readline().decode("utf-8", errors="ignore").strip()
-            if line:
-                print(f"< {line}")
-            if end_marker and line == end_marker:
-                print("Ende-Marker erkannt:", end_marker)
+        # Rest lesen bis END-Marker und Prompt
+        lines, _ = self._read_until_prompt(time.monotonic() + 2, end_marker)
 
         if len(data) != self.memory_size:
-            print(f"WARNUNG: Falsche Länge ({len(data)} statt {self.memory_size})")
+            self._log(f"WARNUNG: Falsche Länge ({len(data)} statt {self.memory_size})")
             return None
 
-        return bytes(data)
+        if not self._check_binary_crc(crc, lines):
+            return None
+        return data
 
     # -------------------------------------------------
     # 256 Byte Status Memory holen
     #
     # Arduino-Protokoll:
     #   STATUS_START (oder STATUS_BEGIN)
-    #   <256 rohe Bytes via Serial.write()>
+    #   <256 rohe Bytes, blockweise zu je 8 Bytes>
     #   STATUS_END
     #
+    @timed_operation("status")
     def read_status_data(self):
-        if not self.ser or not self.ser.is_open:
-            print("Nicht verbunden!")
+        if not self._is_connected():
             return None
 
-        print("Sende 'sendstatus' Kommando...")
+        self._log("Sende 'sendstatus' Kommando...")
+        self.rx.clear()
         self.ser.write(b"sendstatus\n")
 
-        start_marker = None
-        end_marker = "STATUS_END"
-        timeout = time.time() + 5
-
         # auf Startmarker warten
-        while time.time() < timeout:
-            if self.ser.in_waiting:
-                line = self.ser.readline().decode("utf-8", errors="ignore").strip()
-                if line:
-                    print(f"< {line}")
-                if line == "STATUS_START":
-                    start_marker = "STATUS_START"
-                    break
-                if line == "STATUS_BEGIN":
-                    start_marker = "STATUS_BEGIN"
-                    break
-                if "ERROR" in line:
-                    print("Fehler beim Lesen!")
-                    return None
-            else:
-                time.sleep(0.05)
+        start_marker, end_marker = self._wait_for_start_marker(STATUS_MARKERS)
+        if start_marker is None:
+            self._log("Timeout/kein STATUS_START (oder STATUS_BEGIN) erkannt.")
+            return None
+
+        self._log("Empfange Status Memory (256 Bytes)...")
+        data = self._receive_payload(256, timeout=10.0, step=8)
+
+        # END-Marker und Prompt einsammeln
+        self._read_until_prompt(time.monotonic() + 2, end_marker)
+
+        if len(data) != 256:
+            self._log(f"WARNUNG: Falsche Status-Länge ({len(data)} statt 256)")
+            return None
+
+        return data
+
+    # -------------------------------------------------
+    # ROM + Data + Status in einer Transaktion holen
+    #
+    # Arduino-Protokoll ('dumpall'):
+    #   DUMPALL_START
+    #   <Frame-Länge uint16 LE>
+    #   <8 Byte ROM><256 Page-Records (32 Byte + CRC16)><32 Status-Blöcke (8 Byte + CRC16)>
+    #   DUMPALL_END (oder DUMPALL_ERROR)
+    #
+    # Pages mit falscher CRC werden einzeln per 'crcpages' nachgeladen.
+    # Passt die ROM-CRC8 oder die CRC eines Status-Blocks nicht, wird der
+    # ganze Frame neu angefordert (bis zu retries Mal).
+    # Liefert (rom_info, data, status) oder None; has_dumpall sagt danach,
+    # ob der Sketch 'dumpall' überhaupt kann.
+    @timed_operation("dumpall")
+    def read_dump_all(self, retries=3):
+        if not self._is_connected():
+            return None
+
+        for attempt in range(retries + 1):
+            if attempt:
+                self.metrics.count("retries")
+                self._log(f"dumpall wird wiederholt - Versuch {attempt}/{retries}")
+            result = self._read_dump_all_frame()
+            if result is None:
+                return None
+            checked = self._split_dump_frame(result)
+            if checked is None:
+                continue
+
+            rom, records, status = checked
+            rom_info = self.analyze_rom_bytes(rom)
+            data, bad_pages = self._check_page_records(records)
+            if not self._repair_pages(data, bad_pages):
+                return None
+            return rom_info, bytes(data), status
 
+        self._log("FEHLER: ROM/Status Memory nach Wiederholungen weiterhin fehlerhaft")
+        return None
+
+    def _read_dump_all_frame(self):
+        # ein 'dumpall' senden; liefert den ungeprüften Frame
+        self._log("Sende 'dumpall' Kommando...")
+        self.rx.clear()
+        self.ser.write(b"dumpall\n")
+
+        start_marker, end_marker = self._wait_for_start_marker(DUMPALL_MARKERS)
         if start_marker is None:
-            print("Timeout/kein STATUS_START (oder STATUS_BEGIN) erkannt.")
+            self._log("Kein DUMPALL_START erkannt.")
             return None
 
-        print("Empfange Status Memory (256 Bytes)...")
-        data = bytearray()
-        start_time = time.time()
-        while len(data) < 256:
-            chunk = self.ser.read(256 - len(data))
-            if chunk:
-                data.extend(chunk)
+        # erst ein Frame in passender Länge zählt als 'dumpall' mit
+        # Status-CRC; ältere Sketche senden den Status ohne CRC-Bytes
+        frame = self._receive_frame(DUMPALL_FRAME_SIZE, timeout=30.0)
+        if frame is None:
+            return None
+        self.has_dumpall = True
 
-            progress = len(data) * 100 // 256
-            elapsed = time.time() - start_time
-            print(
-                f"\rFortschritt: {progress}% ({len(data)}/256) - {elapsed:.1f}s",
-                end="",
+        # Trailer folgt direkt auf den Frame
+        lines, _ = self._read_until_prompt(time.monotonic() + 2, end_marker)
+        if "DUMPALL_ERROR" in lines:
+            self._log("Fehler beim Lesen des Status Memory!")
+            return None
+        return frame
+
+    # -------------------------------------------------
+    # Längen-Präfix (uint16 LE) + Frame lesen
+    def _receive_frame(self, expected, timeout):
+        t0 = time.monotonic()
+        header = self.rx.read_exact(2, t0 + 2)
+        self.metrics.add_phase("header", time.monotonic() - t0)
+        if len(header) != 2:
+            self.metrics.count("timeouts")
+        frame_len = self._frame_length(header, expected)
+        if frame_len is None:
+            return None
+
+        self._log(f"Empfange Frame ({frame_len} Bytes)...")
+        frame = self._receive_payload(frame_len, timeout=timeout)
+        if len(frame) != frame_len:
+            self._log(f"WARNUNG: Frame unvollständig ({len(frame)} statt {frame_len})")
+            return None
+        return frame
+
+    # -------------------------------------------------
+    # Pages mit CRC holen ('crcpages <erste> <anzahl>')
+    #
+    # Arduino-Protokoll:
+    #   PAGES_START
+    #   <Frame-Länge uint16 LE = anzahl * 34>
+    #   <Page-Records (32 Byte + CRC16)>
+    #   PAGES_END
+    #
+    # Liefert (Daten, Liste der Pages mit CRC-Fehler) oder None.
+    @timed_operation("pages")
+    def read_pages(self, first_page, count):
+        if not self._is_connected():
+            return None
+
+        self.rx.clear()
+        self.ser.write(f"crcpages {first_page} {count}\n".encode())
+
+        start_marker, end_marker = self._wait_for_start_marker(PAGES_MARKERS)
+        if start_marker is None:
+            self._log(f"Kein PAGES_START für Pages {first_page}..{first_page + count - 1}.")
+            return None
+
+        raw = self._receive_frame(count * PAGE_RECORD_SIZE, timeout=30.0)
+        self._read_until_prompt(time.monotonic() + 2, end_marker, echo=None)
+        if raw is None:
+            return None
+        return self._check_page_records(raw, first_page)
+
+    # -------------------------------------------------
+    # Fehlerhafte Pages gezielt neu lesen (data wird in-place korrigiert)
+    def _repair_pages(self, data, bad_pages, retries=3):
+        attempt = 0
+        while bad_pages and attempt < retries:
+            attempt += 1
+            self._log(
+                f"CRC-Fehler in {len(bad_pages)} Page(s): "
+                f"{self._format_page_ranges(bad_pages)} - Versuch {attempt}/{retries}"
             )
+            still_bad = []
+            for page in bad_pages:
+                self.metrics.count("retries")
+                result = self.read_pages(page, 1)
+                if result is None or result[1]:
+                    still_bad.append(page)
+                    continue
+                data[page * PAGE_SIZE:(page + 1) * PAGE_SIZE] = result[0]
+            bad_pages = still_bad
 
-        print("\nFertig! Länge empfangen:", len(data))
+        if bad_pages:
+            self._log(
+                "FEHLER: Pages nach Wiederholungen weiterhin fehlerhaft: "
+                + self._format_page_ranges(bad_pages)
+            )
+            return False
+        if attempt:
+            self._log("Fehlerhafte Pages erfolgreich nachgeladen.")
+        return True
 
-        # END-Marker einsammeln (optional)
-        timeout2 = time.time() + 2
-        while time.time() < timeout2 and self.ser.in_waiting == 0:
-            time.sleep(0.05)
+    # -------------------------------------------------
+    # Komplettes Data Memory pageweise mit CRC-Prüfung holen
+    def read_binary_data_verified(self, retries=3):
+        self._log(f"Lese {PAGE_COUNT} Pages mit CRC-Prüfung...")
+        result = self.read_pages(0, PAGE_COUNT)
+        if result is None:
+            return None
+        data, bad_pages = result
+        if not self._repair_pages(data, bad_pages, retries):
+            return None
+        return bytes(data)
 
-        while self.ser.in_waiting:
-            line = self.ser.readline().decode("utf-8", errors="ignore").strip()
-            if line:
-                print(f"< {line}")
-            if line == end_marker:
-                print("Ende-Marker erkannt:", end_marker)
+    # -------------------------------------------------
+    # Beliebigen Adressbereich holen ('readrange <adresse> <länge>', hex)
+    #
+    # Arduino-Protokoll:
+    #   RANGE_START
+    #   <Länge uint16 LE>
+    #   <Daten>
+    #   RANGE_END
+    #
+    @timed_operation("range")
+    def read_range(self, addr, length):
+        if not self._is_connected():
+            return None
+        if addr < 0 or length <= 0 or addr + length > self.memory_size:
+            self._log(f"Ungültiger Bereich: 0x{addr:04X} + {length}")
+            return None
 
-        if len(data) != 256:
-            print(f"WARNUNG: Falsche Status-Länge ({len(data)} statt 256)")
+        self.rx.clear()
+        self.ser.write(f"readrange {addr:x} {length:x}\n".encode())
+
+        start_marker, end_marker = self._wait_for_start_marker(RANGE_MARKERS)
+        if start_marker is None:
+            self._log(f"Kein RANGE_START für 0x{addr:04X} + {length}.")
             return None
 
+        data = self._receive_frame(length, timeout=30.0)
+        self._read_until_prompt(time.monotonic() + 2, end_marker, echo=None)
+        return data
+
+    # -------------------------------------------------
+    # Nur die Pages eines Sparse-Profils holen, Rest mit 0xFF füllen
+    #
+    # profile: Name aus SPARSE_PROFILES oder Liste von Page-Nummern.
+    # Zusammenhängende Pages werden in einem readrange geholt.
+    def read_sparse(self, profile="emulator"):
+        if isinstance(profile, str):
+            if profile not in SPARSE_PROFILES:
+                self._log(
+                    f"Unbekanntes Sparse-Profil '{profile}' "
+                    f"(bekannt: {', '.join(SPARSE_PROFILES)})"
+                )
+                return None
+            pages = SPARSE_PROFILES[profile]
+        else:
+            pages = profile
+
+        self._log(f"Lese Sparse-Pages: {self._format_page_ranges(pages)}")
+        data = bytearray(b"\xFF" * self.memory_size)
+        for first, last in self._page_runs(pages):
+            chunk = self.read_range(first * PAGE_SIZE, (last - first + 1) * PAGE_SIZE)
+            if chunk is None:
+                return None
+            data[first * PAGE_SIZE:(last + 1) * PAGE_SIZE] = chunk
         return bytes(data)
 
+    # -------------------------------------------------
+    # Data Memory holen: bevorzugt CRC-geprüft, sonst 'binary'
+    def read_data_memory(self):
+        data = self.read_binary_data_verified()
+        if data is not None:
+            return data
+        self._log("CRC-geprüftes Lesen nicht möglich -> 'binary'")
+        return self.read_binary_data()
+
+    # -------------------------------------------------
+    # Alles holen: bevorzugt 'dumpall', sonst einzeln (ältere Sketche)
+    #
+    # Kann der Sketch 'dumpall', ist dessen Ergebnis endgültig: ein
+    # fehlerhafter Frame wird nicht durch die ungeprüften Einzelabfragen
+    # ersetzt, sondern liefert (None, None, None).
+    def read_full_dump(self):
+        result = self.read_dump_all()
+        if result is not None:
+            return result
+        if self.has_dumpall:
+            return None, None, None
+
+        self._log("dumpall nicht verfügbar -> Einzelabfragen")
+        rominfo = self.get_rom_info()
+        data = self.read_data_memory()
+        status = self.read_status_data()
+        return rominfo, data, status
+
+    # -------------------------------------------------
+    # Gerät laufend abfragen und Änderungen melden (siehe ds2506_watch.py)
+    #
+    # emit(event) bekommt jedes Ereignis als dict. Gelesen werden nur die
+    # beobachteten Pages (pages=None: alle), zusammenhängende in einem
+    # 'readrange'; scheitert das schon bei der ersten Abfrage (älterer
+    # Sketch), wird auf 'binary' ausgewichen. interval = Abstand der
+    # Abfragen in Sekunden (0 = so schnell wie der Bus erlaubt), count =
+    # Anzahl Abfragen (None = endlos). Liefert die Anzahl Ereignisse.
+    def watch(self, emit, interval=1.0, pages=None, status=True, count=None):
+        watcher = PageWatcher(pages)
+        use_range = True
+        polls = 0
+        events = 0
+        self.metrics.limit(WATCH_KEEP_OPERATIONS)
+
+        while count is None or polls < count:
+            t0 = time.monotonic()
+            polls += 1
+            data = self.read_sparse(watcher.pages) if use_range else None
+            if data is None and use_range and watcher.data is None:
+                self._log("readrange nicht verfügbar -> 'binary'")
+                use_range = False
+            if not use_range:
+                data = self.read_binary_data()
+            status_data = self.read_status_data() if status else None
+
+            if data is None or (status and status_data is None):
+                batch = [watcher.error("Lesefehler, Abfrage verworfen")]
+            else:
+                batch = watcher.update(data, status_data)
+            for event in batch:
+                emit(event)
+            events += len(batch)
+
+            if count is None or polls < count:
+                time.sleep(max(0.0, interval - (time.monotonic() - t0)))
+        return events
+
     # -------------------------------------------------
     # Dateien speichern (mit optional benanntem Dateinamen)
     def save_binary(self, data, filename="binary.bin"):
         with open(filename, "wb") as f:
             f.write(data)
-        print(f"✓ Gespeichert: {filename} ({len(data)} bytes)")
+        self._log(f"✓ Gespeichert: {filename} ({len(data)} bytes)")
         return filename
 
     def save_status(self, data, filename="status.bin"):
         with open(filename, "wb") as f:
             f.write(data)
-        print(f"✓ Gespeichert: {filename} ({len(data)} bytes)")
+        self._log(f"✓ Gespeichert: {filename} ({len(data)} bytes)")
         return filename
 
     def save_hexdump(self, data, filename="hexdump.hex"):
+        # data: Bytes oder DumpAnalysis (dann wird deren Hexdump benutzt;
+        # die Datei hat Adresse und Hex klein, die ASCII-Spalte bleibt)
         with open(filename, "w") as f:
-            for addr in range(0, len(data), 16):
-                chunk = data[addr:addr + 16]
-                hex_str = " ".join(f"{b:02x}" for b in chunk)
-                ascii_str = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
-                f.write(f"{addr:04x}: {hex_str:<48} {ascii_str}\n")
-        print(f"✓ Gespeichert: {filename}")
+            if isinstance(data, DumpAnalysis):
+                f.writelines(line + "\n" for line in data.data_hexdump_lower)
+            else:
+                write_hexdump(f, data, upper=False)
+        self._log(f"✓ Gespeichert: {filename}")
         return filename
 
     # -------------------------------------------------
     # Helfer für Analyse / Report
+    def _analysis(self, data=None, status=None):
+        # Bytes -> DumpAnalysis; eine vorhandene DumpAnalysis bleibt
+        if isinstance(data, DumpAnalysis):
+            return data
+        if isinstance(status, DumpAnalysis):
+            return status
+        return DumpAnalysis(data, status)
+
+    def _page_runs(self, pages):
+        return page_runs(pages)
+
     def _format_page_ranges(self, pages):
-        if not pages:
-            return "(keine)"
-        pages = sorted(pages)
-        ranges = []
-        start = pages[0]
-        last = pages[0]
-        for p in pages[1:]:
-            if p == last + 1:
-                last = p
-            else:
-                ranges.append((start, last))
-                start = p
-                last = p
-        ranges.append((start, last))
-
-        out = []
-        for a, b in ranges:
-            if a == b:
-                out.append(str(a))
-            else:
-                out.append(f"{a}-{b}")
-        return ",".join(out)
+        return format_page_ranges(pages)
 
+    # Hexdump-Zeilen: siehe ds2506_hexdump.py
     def _hexdump_lines(self, data, start_addr=0):
-        lines = []
-        for offs in range(0, len(data), 16):
-            chunk = data[offs:offs + 16]
-            hex_str = " ".join(f"{b:02X}" for b in chunk)
-            ascii_str = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
-            lines.append(f"{start_addr+offs:04X}: {hex_str:<48} {ascii_str}")
-        return lines
+        return list(hexdump_lines(data, start_addr))
 
     def _hexdump_page_32bytes(self, data, start_addr):
-        lines = []
-        for offs in range(0, 32, 16):
-            addr = start_addr + offs
-            chunk = data[start_addr + offs:start_addr + offs + 16]
-            hex_str = " ".join(f"{b:02X}" for b in chunk)
-            ascii_str = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
-            lines.append(f"  {addr:04X}: {hex_str:<48} {ascii_str}")
-        return lines
+        return list(hexdump_lines(data[start_addr:start_addr + 32], start_addr, indent="  "))
+
+    # -------------------------------------------------
+    # Status-Bitmaps dekodieren, siehe status_protection_pages()
+    def status_protection_pages(self, data):
+        return status_protection_pages(data)
 
     # -------------------------------------------------
     # Status interpretieren (Schreibschutz usw.)
+    # data: Status-Bytes oder DumpAnalysis (Text siehe DumpAnalysis.status_text)
     def analyze_status(self, data):
-        lines_out = []
-
-        def add(msg=""):
-            print(msg)
-            lines_out.append(msg)
-
-        add("\n=== Status Memory Analyse (Python) ===")
-
-        # Write Protect Bits (Byte 0x00..0x1F, Bit = 0 => gesperrt)
-        wp_pages = []
-        for page in range(256):
-            byte_i = page // 8
-            bit_i = page % 8
-            if byte_i < 0x20:
-                if not (data[byte_i] & (1 << bit_i)):
-                    wp_pages.append(page)
-
-        add(f"Write-Protected Pages: {len(wp_pages)}/256")
-        add("  Seiten gesperrt: " + self._format_page_ranges(wp_pages))
-
-        # Redirection/EPROM Info 0x20..0x3F
-        eprom_bytes = data[0x20:0x40]
-        eprom_count = sum(1 for b in eprom_bytes if b != 0xFF)
-        add(f"EPROM/Redirection gesetzt (Bytes 0x20-0x3F != FF): {eprom_count}/32")
-        add("  Redirection/EPROM Bytes:")
-        add("   " + " ".join(f"{b:02X}" for b in eprom_bytes))
-
-        # Copy-Protect Bits (heuristisch) ab 0x100
-        cp_pages = []
-        for page in range(256):
-            byte_i = 0x100 + (page // 8)
-            bit_i = page % 8
-            if byte_i < len(data):
-                if not (data[byte_i] & (1 << bit_i)):
-                    cp_pages.append(page)
-
-        add(f"Copy-Protected Pages: {len(cp_pages)}/256")
-        add("  Copy-geschützt: " + self._format_page_ranges(cp_pages))
-
-        add("=== Ende Status Analyse ===")
-        add()
-        return "\n".join(lines_out)
+        text = self._analysis(status=data).status_text
+        for line in text.split("\n"):
+            self._log(line)
+        return text
 
     # -------------------------------------------------
     # Belegte Pages (Data Memory) bestimmen
+    # data: Bytes oder DumpAnalysis; liefert (used_pages, {page: hexdump})
     def calc_used_pages_from_binary(self, data):
-        PAGE_SIZE = 32
-        TOTAL_SIZE = len(data)
-        page_count = TOTAL_SIZE // PAGE_SIZE
+        analysis = self._analysis(data)
+        used_pages = analysis.used_pages
+        page_hexdump_map = analysis.page_hexdumps
+        page_count = len(analysis.data) // PAGE_SIZE
 
-        used_pages = []
-        page_hexdump_map = {}
+        self._log("\n=== PAGE BELEGUNG (Python) ===")
 
-        print("\n=== PAGE BELEGUNG (Python) ===")
+        for page in used_pages:
+            range_start = page * PAGE_SIZE
+            range_end = range_start + PAGE_SIZE - 1
+            self._log(f"Page {page:03d} (0x{range_start:04X} - 0x{range_end:04X}) belegt")
+            for line in page_hexdump_map[page]:
+                self._log(line)
 
-        for page in range(page_count):
-            start = page * PAGE_SIZE
-            end = start + PAGE_SIZE
-            chunk = data[start:end]
-
-            if any(b != 0xFF for b in chunk):
-                used_pages.append(page)
-
-                range_start = start
-                range_end = start + PAGE_SIZE - 1
-
-                if page < 10:
-                    page_str = f"00{page}"
-                elif page < 100:
-                    page_str = f"0{page}"
-                else:
-                    page_str = f"{page}"
-
-                print(f"Page {page_str} (0x{range_start:04X} - 0x{range_end:04X}) belegt")
-
-                page_lines = self._hexdump_page_32bytes(data, range_start)
-                for line in page_lines:
-                    print(line)
-
-                page_hexdump_map[page] = page_lines
-
-        print()
-        print(f"Insgesamt {len(used_pages)} belegte Pages von {page_count}")
-        print("=== ENDE PAGE BELEGUNG (Python) ===\n")
+        self._log()
+        self._log(f"Insgesamt {len(used_pages)} belegte Pages von {page_count}")
+        self._log("=== ENDE PAGE BELEGUNG (Python) ===\n")
 
         return used_pages, page_hexdump_map
 
     # -------------------------------------------------
     # Präfix für Dateinamen bauen
     #
-    # Format endgültig:
     #   <Geraetenummer_bereinigt>_<UserTag>_<Zulassungsnummer_DEC>
     #
-    # Geraetenummer:
-    #   Bytes 0x07EC..0x07EF als ASCII.
-    #   Sonderfall:
-    #     Wenn Byte 0x07EC == 'G' (0x47), diese führende 'G' NICHT übernehmen.
-    #     Dann nur 07ED..07EF (3 Zeichen) nehmen.
-    #   Sonst alle 4 Bytes nehmen.
-    #   0x00 / 0xFF werden ignoriert.
-    #   Undruckbares -> "_".
-    #   Leer -> "UNKDEV".
-    #
-    # UserTag:
-    #   vom Benutzer eingegeben; nur [A-Za-z0-9_-] bleibt.
-    #   Rest wird "_".
-    #
-    # Zulassungsnummer:
-    #   Bytes 0x07F2..0x07F5 als BIG-ENDIAN 32-bit Integer
-    #   (b0<<24 | b1<<16 | b2<<8 | b3), dann dezimal.
-    #   Wenn alles 0x00 oder alles 0xFF -> "UNKZUL".
-    #
-    def build_prefix(self, binary_data, user_tag):
-        if not binary_data or len(binary_data) <= 0x07F5:
-            print("WARNUNG: Dump zu klein, kann Prefix nicht bilden.")
-            dev_ascii = "UNKDEV"
-            zul_str = "UNKZUL"
-        else:
-            # Gerätenummer: 0x07EC..0x07EF
-            raw_dev_all4 = binary_data[0x07EC:0x07F0]  # 4 Bytes
+    # Gerätenummer und Zulassungsnummer siehe decode_prefix_fields().
+    # UserTag: vom Benutzer eingegeben; nur [A-Za-z0-9_-.] bleibt,
+    # Rest wird "_". binary_data: Bytes oder DumpAnalysis.
+    def decode_prefix_fields(self, binary_data):
+        return decode_prefix_fields(binary_data)
 
-            if len(raw_dev_all4) == 4 and raw_dev_all4[0] == 0x47:  # 'G'?
-                relevant_bytes = raw_dev_all4[1:4]  # nur die letzten 3
-            else:
-                relevant_bytes = raw_dev_all4[:]    # alle 4
-
-            dev_chars = []
-            for b in relevant_bytes:
-                if b == 0x00 or b == 0xFF:
-                    # Füllbytes ignorieren
-                    continue
-                if 32 <= b <= 126:
-                    dev_chars.append(chr(b))
-                else:
-                    dev_chars.append("_")
-
-            dev_ascii = "".join(dev_chars).strip()
-            if dev_ascii == "":
-                dev_ascii = "UNKDEV"
-
-            # Zulassungsnummer (0x07F2..0x07F5), Big Endian -> Dezimal
-            zul_raw = binary_data[0x07F2:0x07F6]  # 4 Bytes
-            if len(zul_raw) == 4:
-                if all(b == 0xFF for b in zul_raw) or all(b == 0x00 for b in zul_raw):
-                    zul_str = "UNKZUL"
-                else:
-                    zul_val = (
-                        ((zul_raw[0] & 0xFF) << 24)
-                        | ((zul_raw[1] & 0xFF) << 16)
-                        | ((zul_raw[2] & 0xFF) << 8)
-                        | (zul_raw[3] & 0xFF)
-                    )
-                    zul_str = str(zul_val)
-            else:
-                zul_str = "UNKZUL"
+    def build_prefix(self, binary_data, user_tag):
+        analysis = self._analysis(binary_data)
+        if not analysis.data or len(analysis.data) <= 0x07F5:
+            self._log("WARNUNG: Dump zu klein, kann Prefix nicht bilden.")
+        dev_ascii, zul_str = analysis.prefix_fields
 
         # User-Tag bereinigen
         safe_tag = "".join(
@@ -517,184 +954,577 @@ class DS2506Reader:
         # <geraet>_<tag>_<zulassung>
         prefix = f"{dev_ascii}_{safe_tag}_{zul_str}"
 
-        print(f"Datei-Präfix: {prefix}")
+        self._log(f"Datei-Präfix: {prefix}")
         return prefix
 
     # -------------------------------------------------
-    # Report-/Analyse-Datei schreiben
-    def save_full_report(
-        self,
-        rom_info,
-        binary_data,
-        status_data,
-        status_analysis_text,
-        used_pages=None,
-        page_hexdump_map=None,
-        filename="dump_report.txt",
-    ):
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    # Report-/Analyse-Datei schreiben (Inhalt siehe write_report)
+    def save_full_report(self, analysis, filename="dump_report.txt"):
+        write_report(analysis, filename)
+        self._log(f"✓ Gespeichert: {filename}")
+        return filename
 
-        with open(filename, "w") as f:
-            f.write("DS2506 Dump Report\n")
-            f.write(f"Erstellt: {timestamp}\n\n")
+    # -------------------------------------------------
+    # ds2506_image.h erzeugen (Text siehe format_header)
+    def generate_ds2506_header(self, analysis, filename="ds2506_image.h"):
+        if not analysis.data or len(analysis.data) != 8192:
+            self._log("generate_ds2506_header: binary_data fehlt oder hat nicht 8192 Bytes.")
+            return None
+        if not analysis.status or len(analysis.status) != 256:
+            self._log("generate_ds2506_header: status_data fehlt oder hat nicht 256 Bytes.")
+            return None
 
-            # ROM Info
-            f.write("=== ROM Code ===\n")
-            if rom_info and "rom_bytes" in rom_info:
-                f.write(
-                    "ROM Bytes: "
-                    + " ".join(f"{b:02X}" for b in rom_info["rom_bytes"])
-                    + "\n"
-                )
-                f.write(f"Family Code: 0x{rom_info['family_code']:02X}\n")
-                f.write(f"CRC (Chip):      0x{rom_info['crc_chip']:02X}\n")
-                f.write(f"CRC (berechnet): 0x{rom_info['crc_calc']:02X}\n")
-                f.write(
-                    "CRC Status: "
-                    + ("OK" if rom_info["crc_ok"] else "FEHLER!")
-                    + "\n"
-                )
-            else:
-                f.write("ROM Code konnte nicht ermittelt werden.\n")
+        used_pages = analysis.used_pages
+        total_pages = len(analysis.data) // PAGE_SIZE
+        write_header(analysis, filename)
 
-            f.write("\n")
+        self._log(f"✓ Header-Datei '{filename}' erzeugt.")
+        self._log(f"  Enthält {len(used_pages)} belegte Pages von {total_pages} insgesamt.")
+        if used_pages:
+            self._log("  Arrays: image_blob, page_index, status_mem")
+        else:
+            self._log("  Arrays: image_blob (leer, keine belegten Pages gefunden?), page_index, status_mem")
 
-            # belegte Pages
-            if binary_data and used_pages is not None:
-                f.write("=== BELEGTE PAGES (mind. 1 Byte != FF) ===\n")
-                for page in used_pages:
-                    start = page * 32
-                    end = start + 31
-                    f.write(
-                        f"Page {page:03d} (0x{start:04X} - 0x{end:04X}) belegt\n"
-                    )
-                    if page_hexdump_map and page in page_hexdump_map:
-                        for line in page_hexdump_map[page]:
-                            f.write(line + "\n")
-                    f.write("\n")
-                f.write(
-                    f"Insgesamt {len(used_pages)} belegte Pages von {len(binary_data)//32}\n\n"
-                )
+        return filename
 
-            # kompletter Datenspeicher (Hexdump)
-            if binary_data:
-                f.write("=== DATA MEMORY HEXDUMP (8192 Bytes) ===\n")
-                for line in self._hexdump_lines(binary_data, start_addr=0):
-                    f.write(line + "\n")
-                f.write("\n")
+
+# -------------------------------------------------
+# Dump-Auswertung ohne Reader
+#
+# Reine Funktionen über Bytes; DumpAnalysis, die gleichnamigen
+# DS2506Reader-Methoden und die Offline-Befehle (analyze, emucheck,
+# index, archive, diff) rufen sie auf - ohne Reader und ohne Ausgabe.
+def page_runs(pages):
+    # zusammenhängende Pages -> [(erste, letzte), ...]
+    pages = sorted(set(pages))
+    if not pages:
+        return []
+    ranges = []
+    start = pages[0]
+    last = pages[0]
+    for p in pages[1:]:
+        if p == last + 1:
+            last = p
+        else:
+            ranges.append((start, last))
+            start = p
+            last = p
+    ranges.append((start, last))
+    return ranges
+
+
+def format_page_ranges(pages):
+    if not pages:
+        return "(keine)"
+
+    out = []
+    for a, b in page_runs(pages):
+        if a == b:
+            out.append(str(a))
+        else:
+            out.append(f"{a}-{b}")
+    return ",".join(out)
+
+
+# -------------------------------------------------
+# Status-Bitmaps dekodieren
+#
+# Liefert (write-protected Pages, EPROM/Redirection-Bytes 0x20..0x3F,
+# copy-protected Pages). Bit = 0 bedeutet jeweils gesetzt/gesperrt.
+def status_protection_pages(data):
+    # Write Protect Bits (Byte 0x00..0x1F, Bit = 0 => gesperrt)
+    wp_pages = []
+    for page in range(256):
+        byte_i = page // 8
+        bit_i = page % 8
+        if byte_i < 0x20:
+            if not (data[byte_i] & (1 << bit_i)):
+                wp_pages.append(page)
+
+    # Redirection/EPROM Info 0x20..0x3F
+    eprom_bytes = bytes(data[0x20:0x40])
+
+    # Copy-Protect Bits (heuristisch) ab 0x100
+    cp_pages = []
+    for page in range(256):
+        byte_i = 0x100 + (page // 8)
+        bit_i = page % 8
+        if byte_i < len(data):
+            if not (data[byte_i] & (1 << bit_i)):
+                cp_pages.append(page)
+
+    return wp_pages, eprom_bytes, cp_pages
+
+
+# -------------------------------------------------
+# Felder für das Dateinamen-Präfix (siehe DS2506Reader.build_prefix)
+#
+# Geraetenummer:
+#   Bytes 0x07EC..0x07EF als ASCII.
+#   Sonderfall:
+#     Wenn Byte 0x07EC == 'G' (0x47), diese führende 'G' NICHT übernehmen.
+#     Dann nur 07ED..07EF (3 Zeichen) nehmen.
+#   Sonst alle 4 Bytes nehmen.
+#   0x00 / 0xFF werden ignoriert.
+#   Undruckbares -> "_".
+#   Leer -> "UNKDEV".
+#
+# Zulassungsnummer:
+#   Bytes 0x07F2..0x07F5 als BIG-ENDIAN 32-bit Integer
+#   (b0<<24 | b1<<16 | b2<<8 | b3), dann dezimal.
+#   Wenn alles 0x00 oder alles 0xFF -> "UNKZUL".
+#
+def decode_prefix_fields(binary_data):
+    # (Gerätenummer, Zulassungsnummer) wie oben beschrieben
+    if not binary_data or len(binary_data) <= 0x07F5:
+        dev_ascii = "UNKDEV"
+        zul_str = "UNKZUL"
+    else:
+        # Gerätenummer: 0x07EC..0x07EF
+        raw_dev_all4 = binary_data[0x07EC:0x07F0]  # 4 Bytes
+
+        if len(raw_dev_all4) == 4 and raw_dev_all4[0] == 0x47:  # 'G'?
+            relevant_bytes = raw_dev_all4[1:4]  # nur die letzten 3
+        else:
+            relevant_bytes = raw_dev_all4[:]    # alle 4
+
+        dev_chars = []
+        for b in relevant_bytes:
+            if b == 0x00 or b == 0xFF:
+                # Füllbytes ignorieren
+                continue
+            if 32 <= b <= 126:
+                dev_chars.append(chr(b))
             else:
-                f.write("Keine Data Memory Daten verfügbar.\n\n")
+                dev_chars.append("_")
 
-            # Statusspeicher (Hexdump)
-            if status_data:
-                f.write("=== STATUS MEMORY HEXDUMP (256 Bytes) ===\n")
-                for line in self._hexdump_lines(status_data, start_addr=0):
-                    f.write(line + "\n")
-                f.write("\n")
+        dev_ascii = "".join(dev_chars).strip()
+        if dev_ascii == "":
+            dev_ascii = "UNKDEV"
+
+        # Zulassungsnummer (0x07F2..0x07F5), Big Endian -> Dezimal
+        zul_raw = binary_data[0x07F2:0x07F6]  # 4 Bytes
+        if len(zul_raw) == 4:
+            if all(b == 0xFF for b in zul_raw) or all(b == 0x00 for b in zul_raw):
+                zul_str = "UNKZUL"
             else:
-                f.write("Keine Status Memory Daten verfügbar.\n\n")
+                zul_val = (
+                    ((zul_raw[0] & 0xFF) << 24)
+                    | ((zul_raw[1] & 0xFF) << 16)
+                    | ((zul_raw[2] & 0xFF) << 8)
+                    | (zul_raw[3] & 0xFF)
+                )
+                zul_str = str(zul_val)
+        else:
+            zul_str = "UNKZUL"
 
-            if status_analysis_text:
-                f.write(status_analysis_text)
-                f.write("\n")
+    return dev_ascii, zul_str
 
-        print(f"✓ Gespeichert: {filename}")
-        return filename
 
-    # -------------------------------------------------
-    # ds2506_image.h erzeugen
-    def _format_c_array_page(self, name, chunk, start_addr):
-        lines_out = []
-        lines_out.append(f"// Page @ 0x{start_addr:04X} - 0x{start_addr+31:04X}")
-        lines_out.append(f"const uint8_t {name}[32] PROGMEM = {{")
-        for i in range(0, 32, 8):
-            part = chunk[i:i + 8]
-            byte_str = ",".join(f"0x{b:02X}" for b in part)
-            lines_out.append(f"  {byte_str},")
-        lines_out.append("};")
-        lines_out.append("")
-        return "\n".join(lines_out)
-
-    def _format_c_array_status(self, status_data):
-        out_lines = []
-        out_lines.append("// Status Memory (256 Bytes)")
-        out_lines.append("const uint8_t status_mem[256] PROGMEM = {")
-        for base in range(0, 256, 16):
-            chunk = status_data[base:base + 16]
-            byte_str = ",".join(f"0x{b:02X}" for b in chunk)
-            out_lines.append(f"  // 0x{base:04X}")
-            out_lines.append(f"  {byte_str},")
-        out_lines.append("};")
-        out_lines.append("")
-        return "\n".join(out_lines)
-
-    def generate_ds2506_header(self, rom_info, binary_data, status_data, filename="ds2506_image.h"):
-        if not binary_data or len(binary_data) != 8192:
-            print("generate_ds2506_header: binary_data fehlt oder hat nicht 8192 Bytes.")
-            return None
-        if not status_data or len(status_data) != 256:
-            print("generate_ds2506_header: status_data fehlt oder hat nicht 256 Bytes.")
-            return None
+# -------------------------------------------------
+# Text der ds2506_image.h
+def format_c_status(status_data):
+    out_lines = []
+    out_lines.append("// Status Memory (256 Bytes)")
+    out_lines.append("const uint8_t status_mem[256] PROGMEM = {")
+    for base in range(0, 256, 16):
+        chunk = status_data[base:base + 16]
+        byte_str = ",".join(f"0x{b:02X}" for b in chunk)
+        out_lines.append(f"  // 0x{base:04X}")
+        out_lines.append(f"  {byte_str},")
+    out_lines.append("};")
+    out_lines.append("")
+    return "\n".join(out_lines)
+
+
+def format_c_image(binary_data):
+    # Data Memory für DS2506_Custom: jede Page kodiert in image_blob
+    # (0xFF-Läufe zusammengefasst, Kodierung siehe ds2506_model),
+    # gleiche Pages nur einmal; page_index[page] zeigt auf den Anfang,
+    # 0xFFFF = Page nur 0xFF (steht gar nicht im Blob)
+    blob, index = encode_image(binary_data)
+    size = max(len(blob), 1)         # C kennt keine Arrays der Länge 0
+    used = sum(offset != BLANK_PAGE for offset in index)
+    out_lines = []
+    out_lines.append(f"// Data Memory: {used} belegte Pages, {len(blob)} Bytes kodiert")
+    out_lines.append("// pro Page Steuerbytes c: c < 0x80 -> c+1 Bytes folgen, c >= 0x80 -> (c & 0x7F)+1 mal 0xFF")
+    out_lines.append(f"#define DS2506_IMAGE_BLOB_SIZE {size}")
+    out_lines.append(f"const uint8_t image_blob[{size}] PROGMEM = {{")
+    emitted = set()
+    for page, offset in enumerate(index):
+        if offset == BLANK_PAGE or offset in emitted:
+            continue
+        emitted.add(offset)
+        code = encode_page(binary_data[page * PAGE_SIZE:(page + 1) * PAGE_SIZE])
+        out_lines.append(f"  // Page {page} @ 0x{page * PAGE_SIZE:04X}")
+        for i in range(0, len(code), 16):
+            out_lines.append("  " + ",".join(f"0x{b:02X}" for b in code[i:i + 16]) + ",")
+    if not blob:
+        out_lines.append("  0xFF,   // Platzhalter, keine belegte Page")
+    out_lines.append("};")
+    out_lines.append("")
+    out_lines.append("// Page -> Offset in image_blob (0xFFFF = Page nur 0xFF)")
+    out_lines.append(f"const uint16_t page_index[{len(index)}] PROGMEM = {{")
+    for base in range(0, len(index), 16):
+        out_lines.append(f"  // Page {base:3d}")
+        out_lines.append("  " + ",".join(f"0x{o:04X}" for o in index[base:base + 16]) + ",")
+    out_lines.append("};")
+    out_lines.append("")
+    return "\n".join(out_lines)
+
+
+# Header-Text für DumpAnalysis.header_text (Data/Status sind geprüft)
+def format_header(analysis):
+    rom_info = analysis.rom_info
+    binary_data = analysis.data
+
+    header_lines = []
+    header_lines.append("// AUTOMATISCH GENERIERT von read_ds2506.py")
+    header_lines.append("// Datei für den Emulator (DS2506_Custom).")
+    header_lines.append("// WARNUNG: Manuelle Änderungen werden beim nächsten Export überschrieben.\n")
+    header_lines.append("#pragma once")
+    header_lines.append("#include <Arduino.h>")
+    header_lines.append("#include <avr/pgmspace.h>\n")
+
+    # ROM Info Kommentar (wenn verfügbar)
+    rb = None
+    if rom_info and "rom_bytes" in rom_info:
+        rb = rom_info["rom_bytes"]
+    if rb and len(rb) == 8:
+        rom_hex = " ".join(f"{b:02X}" for b in rb)
+        header_lines.append(f"// ROM Code: {rom_hex}")
+        header_lines.append(f"// Family Code: 0x{rb[0]:02X}")
+        header_lines.append(f"// CRC Chip:    0x{rb[7]:02X}")
+        calc_crc = crc8(rb[:7])
+        header_lines.append(
+            f"// CRC Calc:    0x{calc_crc:02X} "
+            + ("(OK)" if calc_crc == rb[7] else "(MISMATCH)")
+        )
+        # Family + Seriennummer für den Konstruktor, die CRC rechnet der Hub
+        header_lines.append("#define DS2506_ROM_ID " + ",".join(f"0x{b:02X}" for b in rb[:7]))
+        header_lines.append("")
+
+    # Data Memory komprimiert exportieren
+    header_lines.append(format_c_image(binary_data))
 
-        PAGE_SIZE = 32
-        total_pages = len(binary_data) // PAGE_SIZE
+    # Status anhängen
+    status_txt = format_c_status(analysis.status)
+    header_lines.append(status_txt)
 
-        header_lines = []
-        header_lines.append("// AUTOMATISCH GENERIERT von read_ds2506.py")
-        header_lines.append("// Datei für den Emulator (DS2506_Custom).")
-        header_lines.append("// WARNUNG: Manuelle Änderungen werden beim nächsten Export überschrieben.\n")
-        header_lines.append("#pragma once")
-        header_lines.append("#include <Arduino.h>")
-        header_lines.append("#include <avr/pgmspace.h>\n")
+    return "\n".join(header_lines)
 
-        # ROM Info Kommentar (wenn verfügbar)
-        rb = None
+
+# -------------------------------------------------
+# Report-/Analyse-Datei schreiben (ohne Ausgabe)
+def write_report(analysis, filename="dump_report.txt"):
+    rom_info = analysis.rom_info
+    binary_data = analysis.data
+    status_data = analysis.status
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    with open(filename, "w") as f:
+        f.write("DS2506 Dump Report\n")
+        f.write(f"Erstellt: {timestamp}\n\n")
+
+        # ROM Info
+        f.write("=== ROM Code ===\n")
         if rom_info and "rom_bytes" in rom_info:
-            rb = rom_info["rom_bytes"]
-        if rb and len(rb) == 8:
-            rom_hex = " ".join(f"{b:02X}" for b in rb)
-            header_lines.append(f"// ROM Code: {rom_hex}")
-            header_lines.append(f"// Family Code: 0x{rb[0]:02X}")
-            header_lines.append(f"// CRC Chip:    0x{rb[7]:02X}")
-            calc_crc = self.compute_crc8_maxim(rb[:7])
-            header_lines.append(
-                f"// CRC Calc:    0x{calc_crc:02X} "
-                + ("(OK)" if calc_crc == rb[7] else "(MISMATCH)")
+            f.write(
+                "ROM Bytes: "
+                + " ".join(f"{b:02X}" for b in rom_info["rom_bytes"])
+                + "\n"
+            )
+            f.write(f"Family Code: 0x{rom_info['family_code']:02X}\n")
+            f.write(f"CRC (Chip):      0x{rom_info['crc_chip']:02X}\n")
+            f.write(f"CRC (berechnet): 0x{rom_info['crc_calc']:02X}\n")
+            f.write(
+                "CRC Status: "
+                + ("OK" if rom_info["crc_ok"] else "FEHLER!")
+                + "\n"
             )
-            header_lines.append("")
-
-        # belegte Pages exportieren
-        used_pages = []
-        for page_index in range(total_pages):
-            start = page_index * PAGE_SIZE
-            end = start + PAGE_SIZE
-            chunk = binary_data[start:end]
-
-            if any(b != 0xFF for b in chunk):
-                used_pages.append(page_index)
-                array_name = f"page_{start:04X}"
-                arr_txt = self._format_c_array_page(array_name, chunk, start)
-                header_lines.append(arr_txt)
-
-        # Status anhängen
-        status_txt = self._format_c_array_status(status_data)
-        header_lines.append(status_txt)
-
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("\n".join(header_lines))
-
-        print(f"✓ Header-Datei '{filename}' erzeugt.")
-        print(f"  Enthält {len(used_pages)} belegte Pages von {total_pages} insgesamt.")
-        if used_pages:
-            print("  Arrays: " + ", ".join(f"page_{p*PAGE_SIZE:04X}" for p in used_pages) + ", status_mem")
         else:
-            print("  Arrays: status_mem (keine belegten Pages gefunden?)")
+            f.write("ROM Code konnte nicht ermittelt werden.\n")
+
+        f.write("\n")
+
+        # belegte Pages
+        if binary_data:
+            used_pages = analysis.used_pages
+            page_hexdump_map = analysis.page_hexdumps
+            f.write("=== BELEGTE PAGES (mind. 1 Byte != FF) ===\n")
+            for page in used_pages:
+                start = page * 32
+                end = start + 31
+                f.write(
+                    f"Page {page:03d} (0x{start:04X} - 0x{end:04X}) belegt\n"
+                )
+                for line in page_hexdump_map[page]:
+                    f.write(line + "\n")
+                f.write("\n")
+            f.write(
+                f"Insgesamt {len(used_pages)} belegte Pages von {len(binary_data)//32}\n\n"
+            )
+            f.write(
+                "CRC16 (READ MEMORY ab 0x0000, wie vom Chip gesendet): "
+                f"0x{read_memory_crc16(binary_data):04X}\n\n"
+            )
 
-        return filename
+        # kompletter Datenspeicher (Hexdump)
+        if binary_data:
+            f.write("=== DATA MEMORY HEXDUMP (8192 Bytes) ===\n")
+            f.writelines(line + "\n" for line in analysis.data_hexdump)
+            f.write("\n")
+        else:
+            f.write("Keine Data Memory Daten verfügbar.\n\n")
+
+        # Statusspeicher (Hexdump)
+        if status_data:
+            f.write("=== STATUS MEMORY HEXDUMP (256 Bytes) ===\n")
+            f.writelines(line + "\n" for line in analysis.status_hexdump)
+            f.write("\n")
+        else:
+            f.write("Keine Status Memory Daten verfügbar.\n\n")
+
+        if analysis.status_text:
+            f.write(analysis.status_text)
+            f.write("\n")
+
+    return filename
 
 
 # -------------------------------------------------
-def interactive_mode(reader):
+# ds2506_image.h schreiben; None, wenn Data/Status nicht vollständig sind
+def write_header(analysis, filename="ds2506_image.h"):
+    if not analysis.data or len(analysis.data) != 8192:
+        return None
+    if not analysis.status or len(analysis.status) != 256:
+        return None
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(analysis.header_text)
+    return filename
+
+
+# -------------------------------------------------
+# Auswertung eines Dumps, jedes Teil höchstens einmal berechnet
+#
+# Hält ROM-Info, Data und Status Memory und rechnet belegte Pages,
+# Hexdumps, Status-Auswertung, Präfix-Felder und Header-Text erst beim
+# ersten Zugriff aus - danach kommt der gemerkte Wert. Report, Hexdump,
+# Header und Index nehmen alle dasselbe Objekt, so wird ein Dump nur
+# einmal durchsucht und einmal formatiert.
+#
+# Die Rechnungen selbst sind still; geloggt wird weiter von den
+# DS2506Reader-Methoden, die das Objekt benutzen. data/status dürfen
+# auch memoryviews sein (z.B. direkt aus einem ds2506_archive-Archiv).
+class DumpAnalysis:
+    __slots__ = (
+        "rom_info", "data", "status",
+        "_used_pages", "_data_hexdump", "_data_hexdump_lower", "_page_hexdumps", "_status_hexdump",
+        "_protection", "_status_text", "_prefix_fields", "_header_text",
+    )
+
+    def __init__(self, data=None, status=None, rom_info=None):
+        self.rom_info = rom_info or {}
+        self.data = data
+        self.status = status
+        self._used_pages = None
+        self._data_hexdump = None
+        self._data_hexdump_lower = None
+        self._page_hexdumps = None
+        self._status_hexdump = None
+        self._protection = None
+        self._status_text = None
+        self._prefix_fields = None
+        self._header_text = None
+
+    @property
+    def used_pages(self):
+        # Pages mit mindestens einem Byte != FF
+        if self._used_pages is None:
+            data = self.data or b""
+            self._used_pages = [
+                p for p in range(len(data) // PAGE_SIZE)
+                if data[p * PAGE_SIZE:(p + 1) * PAGE_SIZE] != FF_PAGE
+            ]
+        return self._used_pages
+
+    @property
+    def data_hexdump(self):
+        # ganzer Data-Memory-Hexdump (Großbuchstaben) als Zeilen
+        if self._data_hexdump is None:
+            self._data_hexdump = list(hexdump_lines(self.data or b""))
+        return self._data_hexdump
+
+    @property
+    def data_hexdump_lower(self):
+        # dasselbe mit Adresse und Hex klein (hexdump.hex), ASCII bleibt
+        if self._data_hexdump_lower is None:
+            self._data_hexdump_lower = list(hexdump_lines(self.data or b"", upper=False))
+        return self._data_hexdump_lower
+
+    @property
+    def page_hexdumps(self):
+        # {page: [2 Zeilen]} für belegte Pages; nur diese werden formatiert,
+        # es sei denn, data_hexdump liegt schon vor
+        if self._page_hexdumps is None:
+            lines = self._data_hexdump
+            per_page = PAGE_SIZE // 16
+            if lines is not None:
+                self._page_hexdumps = {
+                    p: ["  " + line for line in lines[p * per_page:(p + 1) * per_page]]
+                    for p in self.used_pages
+                }
+            else:
+                data = self.data
+                self._page_hexdumps = {
+                    p: list(hexdump_lines(
+                        data[p * PAGE_SIZE:(p + 1) * PAGE_SIZE], p * PAGE_SIZE, indent="  "
+                    ))
+                    for p in self.used_pages
+                }
+        return self._page_hexdumps
+
+    @property
+    def status_hexdump(self):
+        if self._status_hexdump is None:
+            self._status_hexdump = list(hexdump_lines(self.status or b""))
+        return self._status_hexdump
+
+    @property
+    def protection(self):
+        # (wp_pages, eprom_bytes, cp_pages), siehe status_protection_pages
+        if self._protection is None:
+            self._protection = status_protection_pages(self.status)
+        return self._protection
+
+    @property
+    def status_text(self):
+        # Text der Status-Analyse wie von analyze_status (None ohne Status)
+        if self._status_text is None and self.status:
+            wp_pages, eprom_bytes, cp_pages = self.protection
+            fmt = format_page_ranges
+            eprom_count = sum(1 for b in eprom_bytes if b != 0xFF)
+            self._status_text = "\n".join([
+                "\n=== Status Memory Analyse (Python) ===",
+                f"Write-Protected Pages: {len(wp_pages)}/256",
+                "  Seiten gesperrt: " + fmt(wp_pages),
+                f"EPROM/Redirection gesetzt (Bytes 0x20-0x3F != FF): {eprom_count}/32",
+                "  Redirection/EPROM Bytes:",
+                "   " + " ".join(f"{b:02X}" for b in eprom_bytes),
+                f"Copy-Protected Pages: {len(cp_pages)}/256",
+                "  Copy-geschützt: " + fmt(cp_pages),
+                "=== Ende Status Analyse ===",
+                "",
+            ])
+        return self._status_text
+
+    @property
+    def prefix_fields(self):
+        # (Gerätenummer, Zulassungsnummer), siehe decode_prefix_fields
+        if self._prefix_fields is None:
+            self._prefix_fields = decode_prefix_fields(self.data)
+        return self._prefix_fields
+
+    @property
+    def header_text(self):
+        # Inhalt der ds2506_image.h; None, wenn Data/Status nicht vollständig
+        if self._header_text is None:
+            if not self.data or len(self.data) != 8192:
+                return None
+            if not self.status or len(self.status) != 256:
+                return None
+            self._header_text = format_header(self)
+        return self._header_text
+
+
+# -------------------------------------------------
+# Felder für den SQLite-Index (ds2506_index.py)
+def dump_index_fields(analysis):
+    device, zulassung = analysis.prefix_fields
+    wp_pages, _eprom_bytes, cp_pages = analysis.protection
+    return {
+        "rom": analysis.rom_info.get("rom_bytes"),
+        "device": device,
+        "zulassung": zulassung,
+        "layout": occupancy_bitmap(analysis.used_pages).hex(),
+        "used_pages": len(analysis.used_pages),
+        "wp_pages": len(wp_pages),
+        "cp_pages": len(cp_pages),
+    }
+
+
+def index_files(index, analysis, prefix, files, dump_id=""):
+    # files: Pfade wie von save_all_files bzw. find_dump_pairs
+    st = os.stat(files["binary"])
+    index.record(
+        os.path.abspath(files["binary"]),
+        prefix=prefix,
+        binary=os.path.abspath(files["binary"]),
+        status=os.path.abspath(files["status"]) if files.get("status") else None,
+        report=os.path.abspath(files["report"]) if files.get("report") else None,
+        header=os.path.abspath(files["header"]) if files.get("header") else None,
+        dump_id=dump_id,
+        mtime=st.st_mtime,
+        size=st.st_size,
+        **dump_index_fields(analysis),
+    )
+
+
+# -------------------------------------------------
+# Alle Dateien eines Dumps mit Präfix schreiben (saveall)
+#
+# Ohne outdir landen die Dateien im aktuellen Verzeichnis, sonst in
+# einem eigenen Unterordner <outdir>/<präfix> pro Gerät. Ist der Ordner
+# schon belegt (gleiches Präfix), wird die Port-Kennung angehängt.
+# analysis: DumpAnalysis des Dumps; prefix: schon gebautes Präfix
+# (sonst aus user_tag). Liefert (präfix, verzeichnis, [dateien]).
+def save_all_files(reader, analysis, user_tag, outdir=None, index=None, dump_id="",
+                   prefix=None):
+    reader.calc_used_pages_from_binary(analysis)
+    reader.analyze_status(analysis)
+
+    # Präfix bauen
+    if prefix is None:
+        prefix = reader.build_prefix(analysis, user_tag)
+
+    directory = "."
+    if outdir is not None:
+        directory = os.path.join(outdir, prefix)
+        try:
+            os.makedirs(directory)
+        except FileExistsError:
+            port_tag = "".join(ch if ch.isalnum() else "_" for ch in str(reader.port))
+            directory = os.path.join(outdir, f"{prefix}_{port_tag}")
+            os.makedirs(directory, exist_ok=True)
+
+    # Dateinamen erzeugen
+    fname_bin = os.path.join(directory, f"{prefix}_binary.bin")
+    fname_hex = os.path.join(directory, f"{prefix}_hexdump.hex")
+    fname_stat = os.path.join(directory, f"{prefix}_status.bin")
+    fname_rep = os.path.join(directory, f"{prefix}_dump_report.txt")
+    fname_hdr = os.path.join(directory, f"{prefix}_ds2506_image.h")
+
+    # Dateien schreiben
+    reader.save_binary(analysis.data, fname_bin)
+    reader.save_hexdump(analysis, fname_hex)
+    reader.save_status(analysis.status, fname_stat)
+    reader.save_full_report(analysis, fname_rep)
+    header = reader.generate_ds2506_header(analysis, fname_hdr)
+
+    files = [fname_bin, fname_hex, fname_stat, fname_rep]
+    if header:
+        files.append(header)
+
+    if index is not None:
+        index_files(index, analysis, prefix, {
+            "binary": fname_bin, "status": fname_stat,
+            "report": fname_rep, "header": header,
+        }, dump_id)
+    return prefix, directory, files
+
+
+# -------------------------------------------------
+def interactive_mode(reader, index=None):
     print("\n=== Interaktiver Modus ===")
     print("Kommandos (gehen direkt an den Arduino):")
     print("  all         - Gesamtspeicher anzeigen (Arduino-Ausgabe)")
@@ -708,6 +1538,7 @@ def interactive_mode(reader):
     print("")
     print("Kommandos (Python-Auswertung):")
     print("  savebin     - 8KB holen, binary.bin schreiben")
+    print("  savesparse [profil] - nur Profil-Pages holen (Rest FF), binary.bin schreiben")
     print("  savehex     - 8KB holen, hexdump.hex schreiben")
     print("  savestatus  - 256B holen, status.bin schreiben + Analyse")
     print("  savefull    - Alles holen, dump_report.txt schreiben")
@@ -729,12 +1560,19 @@ def interactive_mode(reader):
                 break
 
             if cl == "savebin":
-                data = reader.read_binary_data()
+                data = reader.read_data_memory()
+                if data:
+                    reader.save_binary(data)
+
+            elif cl.split()[0] == "savesparse":
+                parts = cmd.split()
+                profile = parts[1] if len(parts) > 1 else "emulator"
+                data = reader.read_sparse(profile)
                 if data:
                     reader.save_binary(data)
 
             elif cl == "savehex":
-                data = reader.read_binary_data()
+                data = reader.read_data_memory()
                 if data:
                     reader.save_hexdump(data)
 
@@ -745,50 +1583,33 @@ def interactive_mode(reader):
                     reader.analyze_status(status)
 
             elif cl == "pypages":
-                data = reader.read_binary_data()
+                data = reader.read_data_memory()
                 if data:
                     reader.calc_used_pages_from_binary(data)
 
             elif cl == "makeds2506":
                 print("\n=== ds2506_image.h Generator ===")
-                rominfo = reader.get_rom_info()
-                data = reader.read_binary_data()
-                status = reader.read_status_data()
+                rominfo, data, status = reader.read_full_dump()
                 if data and status:
                     reader.generate_ds2506_header(
-                        rom_info=rominfo,
-                        binary_data=data,
-                        status_data=status,
-                        filename="ds2506_image.h",
+                        DumpAnalysis(data, status, rominfo), "ds2506_image.h"
                     )
 
             elif cl == "savefull":
                 print("\n=== Kompletter Backup ===")
-                rominfo = reader.get_rom_info()
+                rominfo, data, status = reader.read_full_dump()
+                analysis = DumpAnalysis(data, status, rominfo)
 
-                data = reader.read_binary_data()
-                used_pages = None
-                page_hexdump_map = None
                 if data:
                     reader.save_binary(data, "binary.bin")
-                    reader.save_hexdump(data, "hexdump.hex")
-                    used_pages, page_hexdump_map = reader.calc_used_pages_from_binary(data)
+                    reader.save_hexdump(analysis, "hexdump.hex")
+                    reader.calc_used_pages_from_binary(analysis)
 
-                status = reader.read_status_data()
-                status_analysis_text = ""
                 if status:
                     reader.save_status(status, "status.bin")
-                    status_analysis_text = reader.analyze_status(status)
-
-                reader.save_full_report(
-                    rom_info=rominfo,
-                    binary_data=data,
-                    status_data=status,
-                    status_analysis_text=status_analysis_text,
-                    used_pages=used_pages,
-                    page_hexdump_map=page_hexdump_map,
-                    filename="dump_report.txt",
-                )
+                    reader.analyze_status(analysis)
+
+                reader.save_full_report(analysis, "dump_report.txt")
 
                 print("\n✓ Kompletter Backup abgeschlossen!")
 
@@ -797,9 +1618,7 @@ def interactive_mode(reader):
                 user_tag = input("Bitte Kennstring (String1) eingeben: ").strip()
 
                 # 1. alles holen
-                rominfo = reader.get_rom_info()
-                data = reader.read_binary_data()
-                status = reader.read_status_data()
+                rominfo, data, status = reader.read_full_dump()
 
                 if not data or len(data) != 8192:
                     print("Abbruch: 8KB Dump ungültig oder unvollständig.")
@@ -808,41 +1627,7 @@ def interactive_mode(reader):
                     print("Abbruch: Statusdump ungültig oder unvollständig.")
                     continue
 
-                used_pages, page_hexdump_map = reader.calc_used_pages_from_binary(data)
-                status_analysis_text = reader.analyze_status(status)
-
-                # 2. Präfix bauen
-                prefix = reader.build_prefix(data, user_tag)
-
-                # 3. Dateinamen erzeugen
-                fname_bin = f"{prefix}_binary.bin"
-                fname_hex = f"{prefix}_hexdump.hex"
-                fname_stat = f"{prefix}_status.bin"
-                fname_rep = f"{prefix}_dump_report.txt"
-                fname_hdr = f"{prefix}_ds2506_image.h"
-
-                # 4. Dateien schreiben
-                reader.save_binary(data, fname_bin)
-                reader.save_hexdump(data, fname_hex)
-                reader.save_status(status, fname_stat)
-
-                reader.save_full_report(
-                    rom_info=rominfo,
-                    binary_data=data,
-                    status_data=status,
-                    status_analysis_text=status_analysis_text,
-                    used_pages=used_pages,
-                    page_hexdump_map=page_hexdump_map,
-                    filename=fname_rep,
-                )
-
-                reader.generate_ds2506_header(
-                    rom_info=rominfo,
-                    binary_data=data,
-                    status_data=status,
-                    filename=fname_hdr,
-                )
-
+                save_all_files(reader, DumpAnalysis(data, status, rominfo), user_tag, index=index)
                 print("\n✓ Alle Dateien erzeugt.")
 
             else:
@@ -856,26 +1641,1206 @@ def interactive_mode(reader):
             print(f"Fehler: {e}")
 
 
+# -------------------------------------------------
+# Flotten-Modus: viele Reader parallel auslesen
+#
+# Pro Port läuft ein DS2506Reader in einem eigenen Thread. Die Ausgabe
+# jedes Readers wird gesammelt und als session.log in seinen Ordner
+# geschrieben; auf der Konsole erscheint nur eine Zeile pro Gerät.
+# Am Ende: fleet_summary.json / fleet_summary.csv im Ausgabeordner.
+# Mit --store DIR landet jeder Dump zusätzlich im Page-deduplizierten
+# Dump-Speicher (ds2506_store.py); dump_id steht in der Summary.
+# Mit --index DB wird jeder Dump gleich im SQLite-Index eingetragen.
+# Die Phasen-Messung aller Reader (ds2506_metrics.py) landet pro
+# Operation in fleet_metrics.jsonl und als Prometheus-Textfile in
+# fleet_metrics.prom; die Summen pro Port stehen in der Summary.
+FLEET_FIELDS = [
+    "port", "ok", "prefix", "directory", "baudrate",
+    "connect_s", "dump_s", "save_s", "total_s",
+    "marker_s", "payload_s", "trailer_s", "payload_bps", "retries", "timeouts",
+    "dump_id", "error",
+]
+
+
+def expand_ports(patterns):
+    ports = []
+    for pat in patterns:
+        if any(ch in pat for ch in "*?[") and not pat.startswith(SIM_URL_PREFIX):
+            ports.extend(sorted(glob.glob(pat)))
+        else:
+            ports.append(pat)
+    # Reihenfolge erhalten, Doppelte raus
+    return list(dict.fromkeys(ports))
+
+
+def fleet_dump_one(port, user_tag, outdir, reset=False, fast_baudrates=FAST_BAUDRATES,
+                   store=None, index=None, metrics=None):
+    log_lines = []
+
+    def log(*args, sep=" ", end="\n", **_kwargs):
+        log_lines.append(sep.join(str(a) for a in args) + end)
+
+    result = dict.fromkeys(FLEET_FIELDS, "")
+    result.update(port=port, ok=False)
+
+    reader = DS2506Reader(port, fast_baudrates=fast_baudrates)
+    reader.log = log
+    reader.progress = False
+    if metrics is not None:
+        metrics.append(reader.metrics)
+
+    t0 = time.monotonic()
+    directory = None
+    try:
+        if not reader.connect(reset=reset):
+            result["error"] = "Verbindung fehlgeschlagen"
+            return result
+        t1 = time.monotonic()
+        result["connect_s"] = round(t1 - t0, 3)
+        result["baudrate"] = reader.baudrate
+
+        rominfo, data, status = reader.read_full_dump()
+        t2 = time.monotonic()
+        result["dump_s"] = round(t2 - t1, 3)
+        if not data or len(data) != 8192:
+            result["error"] = "8KB Dump ungültig oder unvollständig"
+            return result
+        if not status or len(status) != 256:
+            result["error"] = "Statusdump ungültig oder unvollständig"
+            return result
+
+        analysis = DumpAnalysis(data, status, rominfo)
+        prefix = reader.build_prefix(analysis, user_tag)
+        if store is not None:
+            result["dump_id"] = store.put(
+                data, status, rominfo.get("rom_bytes") if rominfo else None, prefix
+            )
+        prefix, directory, _files = save_all_files(
+            reader, analysis, user_tag, outdir, index, result["dump_id"], prefix
+        )
+        result["save_s"] = round(time.monotonic() - t2, 3)
+        result.update(ok=True, prefix=prefix, directory=directory)
+        return result
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    finally:
+        reader.disconnect()
+        result["total_s"] = round(time.monotonic() - t0, 3)
+        result.update(reader.metrics.totals())
+        if directory is None:
+            port_tag = "".join(ch if ch.isalnum() else "_" for ch in port)
+            log_name = os.path.join(outdir, f"failed_{port_tag}.log")
+        else:
+            log_name = os.path.join(directory, "session.log")
+        with open(log_name, "w", encoding="utf-8") as f:
+            f.writelines(log_lines)
+
+
+def write_fleet_summary(results, outdir):
+    json_name = os.path.join(outdir, "fleet_summary.json")
+    csv_name = os.path.join(outdir, "fleet_summary.csv")
+
+    with open(json_name, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    with open(csv_name, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FLEET_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    return json_name, csv_name
+
+
+def fleet_mode(ports, user_tag, outdir="fleet_out", reset=False, fast_baudrates=FAST_BAUDRATES,
+               store=None, index=None):
+    if not ports:
+        print("Keine Ports gefunden.")
+        return []
+
+    os.makedirs(outdir, exist_ok=True)
+    print(f"\n=== Flotten-Modus: {len(ports)} Reader -> {outdir} ===")
+
+    t0 = time.monotonic()
+    results = []
+    metrics = []
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        futures = [
+            pool.submit(fleet_dump_one, port, user_tag, outdir, reset, fast_baudrates,
+                        store, index, metrics)
+            for port in ports
+        ]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            if res["ok"]:
+                print(f"✓ {res['port']}: {res['prefix']} ({res['total_s']:.1f}s)")
+            else:
+                print(f"✗ {res['port']}: {res['error']} ({res['total_s']:.1f}s)")
+
+    # Summary in Port-Reihenfolge
+    order = {port: i for i, port in enumerate(ports)}
+    results.sort(key=lambda r: order[r["port"]])
+    json_name, csv_name = write_fleet_summary(results, outdir)
+
+    metrics.sort(key=lambda m: order[m.port])
+    jsonl_name = os.path.join(outdir, "fleet_metrics.jsonl")
+    with open(jsonl_name, "w", encoding="utf-8"):
+        pass
+    for m in metrics:
+        m.write_jsonl(jsonl_name)
+    prom_name = write_prometheus(os.path.join(outdir, "fleet_metrics.prom"), metrics)
+
+    ok_count = sum(1 for r in results if r["ok"])
+    print(f"\n{ok_count}/{len(results)} Geräte erfolgreich in {time.monotonic() - t0:.1f}s")
+    print(f"✓ Gespeichert: {json_name}, {csv_name}, {jsonl_name}, {prom_name}")
+    if store is not None:
+        print(f"✓ Dump-Speicher {store.root}: {len(store)} Dumps, "
+              f"{store.stats()['unique_pages']} eindeutige Pages")
+    return results
+
+
+def fleet_main(args):
+    # fleet <kennstring> <port|glob> ... [--out DIR] [--store DIR] [--index DB] [--reset] [--slow]
+    outdir = "fleet_out"
+    store = None
+    index = None
+    reset = False
+    fast = FAST_BAUDRATES
+    rest = []
+    i = 0
+    while i < len(args):
+        if args[i] == "--out" and i + 1 < len(args):
+            outdir = args[i + 1]
+            i += 2
+            continue
+        if args[i] == "--store" and i + 1 < len(args):
+            store = DumpStore(args[i + 1])
+            i += 2
+            continue
+        if args[i] == "--index" and i + 1 < len(args):
+            index = DumpIndex(args[i + 1])
+            i += 2
+            continue
+        if args[i] == "--reset":
+            reset = True
+        elif args[i] == "--slow":
+            fast = ()
+        else:
+            rest.append(args[i])
+        i += 1
+
+    if len(rest) < 2:
+        print("Nutzung: python read_ds2506.py fleet <kennstring> <port|glob> ... "
+              "[--out DIR] [--store DIR] [--index DB] [--reset] [--slow]")
+        sys.exit(1)
+
+    results = fleet_mode(expand_ports(rest[1:]), rest[0], outdir, reset, fast, store, index)
+    sys.exit(0 if results and all(r["ok"] for r in results) else 1)
+
+
+# -------------------------------------------------
+# Gerät beobachten ('watch', siehe DS2506Reader.watch)
+#
+#   watch PORT [--interval S] [--pages 0-63,128|PROFIL] [--no-status]
+#              [--count N] [--out DATEI] [--reset] [--slow] [--verbose]
+#
+# Ereignisse als JSON-Zeilen auf stdout (bzw. angehängt an DATEI), jede
+# Zeile sofort geschrieben. Das Reader-Log geht nur mit --verbose nach
+# stderr. Ende mit Ctrl+C oder nach N Abfragen.
+def parse_page_spec(spec):
+    # "0-63,128" oder Name eines Sparse-Profils -> Liste von Pages
+    if spec in SPARSE_PROFILES:
+        return list(SPARSE_PROFILES[spec])
+    pages = set()
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        first = int(first, 0)
+        last = int(last, 0) if last else first
+        if not 0 <= first <= last < PAGE_COUNT:
+            raise ValueError(f"Ungültige Pages: {part}")
+        pages.update(range(first, last + 1))
+    return sorted(pages)
+
+
+def watch_main(args):
+    usage = ("Nutzung: python read_ds2506.py watch <port> [--interval S] "
+             "[--pages 0-63,128|profil] [--no-status] [--count N] [--out DATEI] "
+             "[--reset] [--slow] [--verbose]")
+    options = {"--interval": "1.0", "--pages": None, "--count": None, "--out": None}
+    flags = set()
+    rest = []
+    i = 0
+    while i < len(args):
+        if args[i] in options and i + 1 < len(args):
+            options[args[i]] = args[i + 1]
+            i += 2
+            continue
+        if args[i] in ("--no-status", "--reset", "--slow", "--verbose"):
+            flags.add(args[i])
+        else:
+            rest.append(args[i])
+        i += 1
+
+    if len(rest) != 1:
+        print(usage)
+        sys.exit(1)
+    try:
+        interval = float(options["--interval"])
+        count = int(options["--count"]) if options["--count"] else None
+        pages = parse_page_spec(options["--pages"]) if options["--pages"] else None
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        sys.exit(1)
+
+    reader = DS2506Reader(rest[0], fast_baudrates=() if "--slow" in flags else FAST_BAUDRATES)
+    reader.progress = False
+    if "--verbose" in flags:
+        reader.log = functools.partial(print, file=sys.stderr)
+    else:
+        reader.log = lambda *args, **kwargs: None
+    if not reader.connect(reset="--reset" in flags):
+        print(f"Keine Verbindung zu {rest[0]}", file=sys.stderr)
+        sys.exit(1)
+
+    out = open(options["--out"], "a", encoding="utf-8") if options["--out"] else sys.stdout
+
+    def emit(event):
+        out.write(json.dumps(event, ensure_ascii=False) + "\n")
+        out.flush()
+
+    try:
+        reader.watch(emit, interval, pages, "--no-status" not in flags, count)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.disconnect()
+        if out is not sys.stdout:
+            out.close()
+
+
+# -------------------------------------------------
+# Offline-Auswertung gespeicherter Dumps ('analyze')
+#
+# Sucht rekursiv nach *binary.bin, nimmt das passende *status.bin aus
+# demselben Ordner dazu und erzeugt Report und Header neu - ohne
+# seriellen Port und ohne pyserial, verteilt auf alle Kerne. Den ROM
+# Code kennt die .bin-Datei nicht; er wird, falls vorhanden, aus dem
+# alten *dump_report.txt übernommen.
+# Statt eines Ordners geht auch eine Archivdatei (siehe 'archive'); dann
+# gibt es pro Record einen Unterordner <nr>_<schlüssel> im Zielordner.
+# Ergebnisübersicht: analyze_index.json / analyze_index.csv im Zielordner.
+ANALYZE_FIELDS = [
+    "prefix", "binary", "status", "report", "header", "ok", "error",
+    "device", "zulassung", "rom", "used_pages", "used_page_list",
+    "wp_pages", "cp_pages", "eprom_bytes_set", "data_crc16", "seconds",
+]
+
+
+def find_dump_pairs(root):
+    pairs = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        names = set(filenames)
+        for name in sorted(filenames):
+            if not name.endswith("binary.bin"):
+                continue
+            stem = name[:-len("binary.bin")]
+            status_name = stem + "status.bin"
+            pairs.append({
+                "stem": stem,
+                "dir": dirpath,
+                "binary": os.path.join(dirpath, name),
+                "status": os.path.join(dirpath, status_name) if status_name in names else None,
+                "old_report": os.path.join(dirpath, stem + "dump_report.txt")
+                if stem + "dump_report.txt" in names else None,
+            })
+    return pairs
+
+
+def read_rom_from_report(filename):
+    # "ROM Bytes: 8B 52 EB ..." aus einem früheren Report
+    with open(filename, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.startswith("ROM Bytes:"):
+                try:
+                    return [int(p, 16) for p in line.split(":", 1)[1].split()]
+                except ValueError:
+                    return None
+    return None
+
+
+# Archivdateien (ds2506_archive.py) werden pro Worker-Prozess einmal
+# geöffnet und bleiben offen; die Records kommen als memoryviews.
+_ARCHIVES = {}
+
+
+def open_archive(path):
+    if path not in _ARCHIVES:
+        _ARCHIVES[path] = DumpArchive(path)
+    return _ARCHIVES[path]
+
+
+def find_archive_records(path):
+    # wie find_dump_pairs, nur ein Eintrag pro Record der Archivdatei
+    with DumpArchive(path) as arch:
+        keys = arch.keys()
+    return [
+        {
+            "stem": key + "_" if key else "",
+            "dir": f"{i:05d}_{key}" if key else f"{i:05d}",
+            "binary": f"{path}#{i}",
+            "status": f"{path}#{i}",
+            "old_report": None,
+            "archive": path,
+            "record": i,
+        }
+        for i, key in enumerate(keys)
+    ]
+
+
+def analyze_dump_pair(job):
+    # läuft im Worker-Prozess; job = (pair, root, outdir)
+    pair, root, outdir = job
+    t0 = time.monotonic()
+    row = dict.fromkeys(ANALYZE_FIELDS, "")
+    row.update(prefix=pair["stem"].rstrip("_"), binary=pair["binary"],
+               status=pair["status"] or "", ok=False)
+
+    record = None
+    try:
+        analysis, record = load_dump_pair(pair)
+        if record is not None:
+            target = os.path.join(outdir or ".", pair["dir"])
+        elif outdir is not None:
+            target = os.path.join(outdir, os.path.relpath(pair["dir"], root))
+        else:
+            target = pair["dir"]
+        os.makedirs(target, exist_ok=True)
+        return analyze_fill_row(row, analysis, target, pair["stem"])
+    except (OSError, ValueError) as e:
+        row["error"] = f"{type(e).__name__}: {e}" if isinstance(e, OSError) else str(e)
+        return row
+    finally:
+        if record is not None:
+            record.release()
+        row["seconds"] = round(time.monotonic() - t0, 3)
+
+
+def load_dump_pair(pair):
+    # Dump aus find_dump_pairs/find_archive_records laden -> (DumpAnalysis,
+    # Archiv-Record oder None; der Record muss danach release()t werden).
+    # Unbrauchbare Dateien: ValueError mit Klartext.
+    if pair.get("archive"):
+        # Record aus einer Archivdatei: Views direkt aus dem mmap
+        record = open_archive(pair["archive"])[pair["record"]]
+        rominfo = decode_rom(record.rom_bytes)
+        return DumpAnalysis(record.data, record.status, rominfo), record
+
+    with open(pair["binary"], "rb") as f:
+        data = f.read()
+    if len(data) != 8192:
+        raise ValueError(f"binary.bin hat {len(data)} statt 8192 Bytes")
+    if not pair["status"]:
+        raise ValueError("kein passendes status.bin")
+    with open(pair["status"], "rb") as f:
+        status = f.read()
+    if len(status) != 256:
+        raise ValueError(f"status.bin hat {len(status)} statt 256 Bytes")
+
+    rominfo = {}
+    if pair["old_report"]:
+        rom_bytes = read_rom_from_report(pair["old_report"])
+        rominfo = decode_rom(rom_bytes)
+    return DumpAnalysis(data, status, rominfo), None
+
+
+def analyze_fill_row(row, analysis, target, stem):
+    # Report + Header schreiben und die Index-Zeile füllen
+    report = write_report(analysis, os.path.join(target, stem + "dump_report.txt"))
+    header = write_header(analysis, os.path.join(target, stem + "ds2506_image.h"))
+
+    rominfo = analysis.rom_info
+    used_pages = analysis.used_pages
+    device, zulassung = analysis.prefix_fields
+    wp_pages, eprom_bytes, cp_pages = analysis.protection
+    row.update(
+        ok=True,
+        report=report,
+        header=header or "",
+        device=device,
+        zulassung=zulassung,
+        rom=" ".join(f"{b:02X}" for b in rominfo["rom_bytes"]) if rominfo else "",
+        used_pages=len(used_pages),
+        used_page_list=format_page_ranges(used_pages),
+        wp_pages=len(wp_pages),
+        cp_pages=len(cp_pages),
+        eprom_bytes_set=sum(1 for b in eprom_bytes if b != 0xFF),
+        data_crc16=f"{read_memory_crc16(analysis.data):04X}",
+    )
+    return row
+
+
+def analyze_archive(root, outdir="analyze_out", jobs=None):
+    if os.path.isfile(root):
+        pairs = find_archive_records(root)
+        outdir = outdir if outdir is not None else "analyze_out"
+    else:
+        pairs = find_dump_pairs(root)
+    if not pairs:
+        print(f"Keine *binary.bin unter {root} gefunden.")
+        return []
+
+    index_dir = outdir if outdir is not None else root
+    os.makedirs(index_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    print(f"\n=== Offline-Analyse: {len(pairs)} Dumps, {jobs} Prozesse ===")
+
+    t0 = time.monotonic()
+    rows = []
+    work = [(pair, root, outdir) for pair in pairs]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(work) // (jobs * 8))
+        for i, row in enumerate(pool.map(analyze_dump_pair, work, chunksize=chunksize), 1):
+            rows.append(row)
+            if not row["ok"]:
+                print(f"✗ {row['binary']}: {row['error']}")
+            if i % 100 == 0 or i == len(work):
+                print(f"\r{i}/{len(work)} Dumps verarbeitet", end="")
+    print()
+
+    json_name = os.path.join(index_dir, "analyze_index.json")
+    csv_name = os.path.join(index_dir, "analyze_index.csv")
+    with open(json_name, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2, ensure_ascii=False)
+    with open(csv_name, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=ANALYZE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    ok_count = sum(1 for r in rows if r["ok"])
+    print(f"{ok_count}/{len(rows)} Dumps ausgewertet in {time.monotonic() - t0:.1f}s")
+    print(f"✓ Gespeichert: {json_name}, {csv_name}")
+    return rows
+
+
+def analyze_main(args):
+    # analyze <verzeichnis> [--out DIR | --inplace] [--jobs N]
+    outdir = "analyze_out"
+    jobs = None
+    rest = []
+    i = 0
+    while i < len(args):
+        if args[i] == "--out" and i + 1 < len(args):
+            outdir = args[i + 1]
+            i += 2
+            continue
+        if args[i] == "--jobs" and i + 1 < len(args):
+            jobs = int(args[i + 1])
+            i += 2
+            continue
+        if args[i] == "--inplace":
+            outdir = None
+        else:
+            rest.append(args[i])
+        i += 1
+
+    if len(rest) != 1:
+        print("Nutzung: python read_ds2506.py analyze <verzeichnis> [--out DIR | --inplace] [--jobs N]")
+        sys.exit(1)
+
+    rows = analyze_archive(rest[0], outdir, jobs)
+    sys.exit(0 if rows and all(r["ok"] for r in rows) else 1)
+
+
+# -------------------------------------------------
+# Emulator-Abgleich ('emucheck', siehe ds2506_model.py)
+#
+# Pro Dump den Header laden - die *ds2506_image.h daneben, sonst so
+# erzeugt, wie saveall/analyze ihn schreiben würden - ins Python-Modell
+# von DS2506_Custom stecken und prüfen, ob der Emulator den Dump
+# bitgenau ausliefert (Pages, Status Memory, CRC16 beim vollen Lesen).
+# missing_pages = im Dump belegt, aber nicht im Page-Mapping des
+# Headers (ältere Header ohne page_lut: feste pageMap). Ergebnis: emucheck.json / emucheck.csv im Zielordner.
+EMUCHECK_FIELDS = [
+    "prefix", "binary", "header", "ok", "error", "used_pages",
+    "missing_pages", "wrong_pages", "status_bytes_diff", "crc_ok", "seconds",
+]
+
+
+def emucheck_dump_pair(pair):
+    t0 = time.monotonic()
+    row = dict.fromkeys(EMUCHECK_FIELDS, "")
+    row.update(prefix=pair["stem"].rstrip("_"), binary=pair["binary"], ok=False)
+
+    record = None
+    try:
+        analysis, record = load_dump_pair(pair)
+        header = os.path.join(pair["dir"], pair["stem"] + "ds2506_image.h")
+        if record is None and os.path.exists(header):
+            model = DS2506Model.from_header(header)
+            row["header"] = header
+        else:
+            model = DS2506Model.from_header(parse_header(analysis.header_text))
+            row["header"] = "(erzeugt)"
+
+        result = model.compare(analysis.data, analysis.status)
+        row.update(
+            ok=result["ok"],
+            used_pages=len(analysis.used_pages),
+            missing_pages=format_page_ranges(result["missing_pages"])
+            if result["missing_pages"] else "",
+            wrong_pages=format_page_ranges(result["wrong_pages"])
+            if result["wrong_pages"] else "",
+            status_bytes_diff=len(result["status_diff"]),
+            crc_ok=result["crc_ok"],
+        )
+        return row
+    except (OSError, ValueError) as e:
+        row["error"] = f"{type(e).__name__}: {e}" if isinstance(e, OSError) else str(e)
+        return row
+    finally:
+        if record is not None:
+            record.release()
+        row["seconds"] = round(time.monotonic() - t0, 4)
+
+
+def emucheck_archive(root, outdir=".", jobs=None):
+    pairs = find_archive_records(root) if os.path.isfile(root) else find_dump_pairs(root)
+    if not pairs:
+        print(f"Keine *binary.bin unter {root} gefunden.")
+        return []
+
+    os.makedirs(outdir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    print(f"\n=== Emulator-Abgleich: {len(pairs)} Dumps, {jobs} Prozesse ===")
+
+    t0 = time.monotonic()
+    rows = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(pairs) // (jobs * 8))
+        for row in pool.map(emucheck_dump_pair, pairs, chunksize=chunksize):
+            rows.append(row)
+            if row["error"]:
+                print(f"✗ {row['binary']}: {row['error']}")
+            elif not row["ok"]:
+                problems = []
+                if row["missing_pages"]:
+                    problems.append(f"nicht gemappt: {row['missing_pages']}")
+                if row["wrong_pages"]:
+                    problems.append(f"falscher Inhalt: {row['wrong_pages']}")
+                if row["status_bytes_diff"]:
+                    problems.append(f"{row['status_bytes_diff']} Status-Bytes anders")
+                print(f"✗ {row['binary']}: " + ", ".join(problems or ["CRC16 falsch"]))
+
+    json_name = os.path.join(outdir, "emucheck.json")
+    csv_name = os.path.join(outdir, "emucheck.csv")
+    with open(json_name, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2, ensure_ascii=False)
+    with open(csv_name, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=EMUCHECK_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    ok_count = sum(1 for r in rows if r["ok"])
+    print(f"{ok_count}/{len(rows)} Dumps würde der Emulator bitgenau liefern "
+          f"({time.monotonic() - t0:.1f}s)")
+    print(f"✓ Gespeichert: {json_name}, {csv_name}")
+    return rows
+
+
+def emucheck_main(args):
+    # emucheck <verzeichnis|archivdatei> [--out DIR] [--jobs N]
+    outdir = "."
+    jobs = None
+    rest = []
+    i = 0
+    while i < len(args):
+        if args[i] == "--out" and i + 1 < len(args):
+            outdir = args[i + 1]
+            i += 2
+            continue
+        if args[i] == "--jobs" and i + 1 < len(args):
+            jobs = int(args[i + 1])
+            i += 2
+            continue
+        rest.append(args[i])
+        i += 1
+
+    if len(rest) != 1:
+        print("Nutzung: python read_ds2506.py emucheck <verzeichnis|archivdatei> "
+              "[--out DIR] [--jobs N]")
+        sys.exit(1)
+
+    rows = emucheck_archive(rest[0], outdir, jobs)
+    sys.exit(0 if rows and all(r["ok"] for r in rows) else 1)
+
+
+# -------------------------------------------------
+# Dump-Speicher verwalten ('store', siehe ds2506_store.py)
+#
+#   store DIR import ARCHIV   vorhandene *binary.bin/*status.bin übernehmen
+#   store DIR list            alle Dumps (ID, Kennung, ROM)
+#   store DIR export ID ZIEL  Dump bitgenau als *_binary.bin/*_status.bin
+#                             zurückschreiben (ID darf abgekürzt sein);
+#                             Report/Header danach per 'analyze --inplace'
+#   store DIR stats           Größe ohne/mit Deduplizierung
+#   store DIR repair          abgeschnittenes Ende nach einem Absturz
+#                             entfernen (macht put/import sonst selbst)
+def store_import(store, root):
+    added = skipped = 0
+    for pair in find_dump_pairs(root):
+        if not pair["status"]:
+            print(f"✗ {pair['binary']}: kein passendes status.bin")
+            skipped += 1
+            continue
+        with open(pair["binary"], "rb") as f:
+            data = f.read()
+        with open(pair["status"], "rb") as f:
+            status = f.read()
+        rom = read_rom_from_report(pair["old_report"]) if pair["old_report"] else None
+        before = len(store)
+        try:
+            store.put(data, status, rom if rom and len(rom) == 8 else None,
+                      pair["stem"].rstrip("_"))
+        except ValueError as e:
+            print(f"✗ {pair['binary']}: {e}")
+            skipped += 1
+            continue
+        added += len(store) - before
+    return added, skipped
+
+
+def store_export(store, did, outdir):
+    manifest = store.manifest(did)
+    rom, data, status = store.get(did)
+    prefix = manifest["tag"] or did[:12]
+    os.makedirs(outdir, exist_ok=True)
+    files = [os.path.join(outdir, f"{prefix}_binary.bin"),
+             os.path.join(outdir, f"{prefix}_status.bin")]
+    for name, blob in zip(files, (data, status)):
+        with open(name, "wb") as f:
+            f.write(blob)
+    if rom:
+        # Mini-Report, damit 'analyze' den ROM Code wiederfindet
+        files.append(os.path.join(outdir, f"{prefix}_dump_report.txt"))
+        with open(files[-1], "w", encoding="utf-8") as f:
+            f.write("ROM Bytes: " + " ".join(f"{b:02X}" for b in rom) + "\n")
+    return files
+
+
+def store_main(args):
+    usage = ("Nutzung: python read_ds2506.py store <dir> import <archiv> | list | "
+             "export <id> <ziel> | stats | repair")
+    if len(args) < 2:
+        print(usage)
+        sys.exit(1)
+
+    store = DumpStore(args[0])
+    action, rest = args[1], args[2:]
+
+    if action == "import" and len(rest) == 1:
+        t0 = time.monotonic()
+        added, skipped = store_import(store, rest[0])
+        print(f"{added} neue Dumps übernommen, {skipped} übersprungen "
+              f"({time.monotonic() - t0:.1f}s)")
+        action = "stats"
+
+    elif action == "list":
+        for did in store.ids():
+            manifest = store.manifest(did)
+            rom = " ".join(manifest["rom"][i:i + 2] for i in range(0, len(manifest["rom"]), 2))
+            print(f"{did}  {manifest['saved']}  {manifest['tag']:<40}  {rom}")
+        return
+
+    elif action == "export" and len(rest) == 2:
+        try:
+            did = store.find(rest[0])
+        except KeyError as e:
+            print(f"Fehler: {e.args[0]}")
+            sys.exit(1)
+        for name in store_export(store, did, rest[1]):
+            print(f"✓ {name}")
+        return
+
+    elif action == "repair":
+        print(f"{store.repair()} Bytes entfernt")
+        return
+
+    elif action != "stats":
+        print(usage)
+        sys.exit(1)
+
+    st = store.stats()
+    print(f"{st['dumps']} Dumps, {st['unique_pages']} eindeutige Pages")
+    print(f"Roh: {st['logical_bytes']} Bytes, gespeichert: {st['stored_bytes']} Bytes "
+          f"(Faktor {st['ratio']})")
+
+
+# -------------------------------------------------
+# SQLite-Index ('index', siehe ds2506_index.py)
+#
+#   index DB build ARCHIV          Archiv (nach)indizieren; unveränderte
+#                                  Dateien werden übersprungen
+#   index DB query [--rom X] [--device X] [--zulassung X] [--layout HEX]
+#   index DB same BINARY FELD      Dumps mit gleichem rom/device/
+#                                  zulassung/layout wie BINARY
+#   index DB groups FELD           Werte, die sich mehrere Dumps teilen
+#
+# Neue Dumps trägt saveall (python read_ds2506.py PORT --index DB) bzw.
+# fleet --index DB selbst ein.
+INDEX_COLUMNS = ["prefix", "device", "zulassung", "rom", "used_pages", "wp_pages",
+                 "cp_pages", "binary"]
+
+
+def index_build(index, root):
+    pairs = find_dump_pairs(root)
+    added = skipped = 0
+    for pair in pairs:
+        key = os.path.abspath(pair["binary"])
+        st = os.stat(pair["binary"])
+        if index.is_current(key, st.st_mtime, st.st_size):
+            skipped += 1
+            continue
+        with open(pair["binary"], "rb") as f:
+            data = f.read()
+        status = b""
+        if pair["status"]:
+            with open(pair["status"], "rb") as f:
+                status = f.read()
+        if len(data) != 8192 or len(status) != 256:
+            print(f"✗ {pair['binary']}: unvollständiges binary/status-Paar")
+            continue
+        rominfo = {}
+        if pair["old_report"]:
+            rom_bytes = read_rom_from_report(pair["old_report"])
+            if rom_bytes and len(rom_bytes) == 8:
+                rominfo = {"rom_bytes": rom_bytes}
+        header = os.path.join(pair["dir"], pair["stem"] + "ds2506_image.h")
+        analysis = DumpAnalysis(data, status, rominfo)
+        index_files(index, analysis, pair["stem"].rstrip("_"), {
+            "binary": pair["binary"],
+            "status": pair["status"],
+            "report": pair["old_report"],
+            "header": header if os.path.exists(header) else None,
+        })
+        added += 1
+    removed = index.forget_missing(
+        os.path.abspath(root), (os.path.abspath(p["binary"]) for p in pairs)
+    )
+    return added, skipped, removed
+
+
+def print_index_rows(rows, as_json=False):
+    if as_json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+    writer = csv.DictWriter(sys.stdout, fieldnames=INDEX_COLUMNS, extrasaction="ignore",
+                            delimiter="\t")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def index_main(args):
+    usage = ("Nutzung: python read_ds2506.py index <db> build <archiv> | "
+             "query [--rom X] [--device X] [--zulassung X] [--layout HEX] [--json] | "
+             "same <binary> <feld> | groups <feld>")
+    if len(args) < 2:
+        print(usage)
+        sys.exit(1)
+
+    as_json = "--json" in args
+    args = [a for a in args if a != "--json"]
+    index = DumpIndex(args[0])
+    action, rest = args[1], args[2:]
+    t0 = time.perf_counter()
+
+    try:
+        if action == "build" and len(rest) == 1:
+            added, skipped, removed = index_build(index, rest[0])
+            print(f"{added} Dumps eingetragen, {skipped} unverändert, "
+                  f"{removed} entfernt ({time.perf_counter() - t0:.1f}s)")
+            return
+
+        if action == "query" and len(rest) % 2 == 0:
+            criteria = {}
+            for opt, value in zip(rest[::2], rest[1::2]):
+                if not opt.startswith("--") or opt[2:] not in QUERY_FIELDS:
+                    print(usage)
+                    sys.exit(1)
+                criteria[opt[2:]] = value
+            rows = index.query(**criteria)
+        elif action == "same" and len(rest) == 2:
+            rows = index.same(os.path.abspath(rest[0]), rest[1])
+        elif action == "groups" and len(rest) == 1:
+            for value, count in index.groups(rest[0]):
+                print(f"{count:6d}  {value}")
+            return
+        else:
+            print(usage)
+            sys.exit(1)
+    except (KeyError, ValueError) as e:
+        print(f"Fehler: {e.args[0]}")
+        sys.exit(1)
+    finally:
+        index.close()
+
+    print_index_rows(rows, as_json)
+    print(f"{len(rows)} Treffer ({(time.perf_counter() - t0) * 1000:.1f} ms)", file=sys.stderr)
+
+
+# -------------------------------------------------
+# Archivdatei ('archive', siehe ds2506_archive.py)
+#
+#   archive DATEI pack ORDNER      *binary.bin/*status.bin-Paare anhängen
+#                                  (Präfixe, die schon drin sind, nicht)
+#   archive DATEI list             Records (Nr, Schlüssel, Gerät, Zulassung)
+#   archive DATEI extract NR ZIEL  Record als *_binary.bin/*_status.bin
+#   archive DATEI verify           CRC32 aller Records prüfen
+#   archive DATEI repair           Index nach abgebrochenem pack neu
+#                                  schreiben (macht pack sonst selbst)
+#
+# Auswerten: python read_ds2506.py analyze DATEI --out DIR
+def archive_pack(path, root):
+    added = 0
+    with ArchiveWriter(path, append=True) as writer:
+        if writer.recovered:
+            print(f"WARNUNG: {path} hatte keinen Index (pack abgebrochen?), "
+                  f"{len(writer)} Records übernommen")
+        known = set(writer.keys())
+        for pair in find_dump_pairs(root):
+            if pair["stem"].rstrip("_") in known:
+                continue
+            if not pair["status"]:
+                print(f"✗ {pair['binary']}: kein passendes status.bin")
+                continue
+            with open(pair["binary"], "rb") as f:
+                data = f.read()
+            with open(pair["status"], "rb") as f:
+                status = f.read()
+            rom = read_rom_from_report(pair["old_report"]) if pair["old_report"] else None
+            try:
+                writer.add(data, status, rom if rom and len(rom) == 8 else None,
+                           pair["stem"].rstrip("_"),
+                           {"source": os.path.relpath(pair["binary"], root),
+                            "packed": time.strftime("%Y-%m-%dT%H:%M:%S")})
+            except ValueError as e:
+                print(f"✗ {pair['binary']}: {e}")
+                continue
+            added += 1
+        total = len(writer)
+    return added, total
+
+
+def archive_main(args):
+    usage = ("Nutzung: python read_ds2506.py archive <datei> pack <ordner> | list | "
+             "extract <nr> <ziel> | verify | repair")
+    if len(args) < 2:
+        print(usage)
+        sys.exit(1)
+
+    path, action, rest = args[0], args[1], args[2:]
+    t0 = time.perf_counter()
+
+    if action == "pack" and len(rest) == 1:
+        added, total = archive_pack(path, rest[0])
+        print(f"{added} Dumps angehängt, {total} im Archiv ({time.perf_counter() - t0:.1f}s)")
+        return
+
+    if action == "repair" and not rest:
+        try:
+            with ArchiveWriter(path, append=True) as writer:
+                recovered = writer.recovered
+                count = writer.repair()
+        except (OSError, ValueError) as e:
+            print(f"Fehler: {e}")
+            sys.exit(1)
+        print(f"Index für {count} Records neu geschrieben" if recovered
+              else f"Index war in Ordnung ({count} Records)")
+        return
+
+    try:
+        arch = DumpArchive(path)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}")
+        sys.exit(1)
+
+    if arch.recovered:
+        print(f"WARNUNG: {path} hat keinen Index (pack abgebrochen?), CRC32 nicht "
+              f"prüfbar; 'archive {path} repair' schreibt ihn neu", file=sys.stderr)
+    with arch:
+        if action == "list" and not rest:
+            for rec in arch:
+                device, zulassung = decode_prefix_fields(rec.data)
+                rom = " ".join(f"{b:02X}" for b in rec.rom_bytes or [])
+                print(f"{rec.number:6d}  {rec.key:<40}  {device:<6} {zulassung:>12}  {rom}")
+                rec.release()
+        elif action == "extract" and len(rest) == 2:
+            rec = arch[int(rest[0])]
+            prefix = rec.key or f"{rec.number:05d}"
+            os.makedirs(rest[1], exist_ok=True)
+            for name, blob in (("binary", rec.data), ("status", rec.status)):
+                with open(os.path.join(rest[1], f"{prefix}_{name}.bin"), "wb") as f:
+                    f.write(blob)
+            if rec.rom_bytes:
+                # Mini-Report, damit 'analyze' den ROM Code wiederfindet
+                with open(os.path.join(rest[1], f"{prefix}_dump_report.txt"), "w",
+                          encoding="utf-8") as f:
+                    f.write("ROM Bytes: " + " ".join(f"{b:02X}" for b in rec.rom_bytes) + "\n")
+            print(f"✓ {prefix} -> {rest[1]}")
+            rec.release()
+        elif action == "verify" and not rest:
+            bad = [i for i in range(len(arch)) if not arch.verify(i)]
+            for i in bad:
+                print(f"✗ Record {i} ({arch.key(i)}): CRC32 falsch")
+            print(f"{len(arch) - len(bad)}/{len(arch)} Records OK "
+                  f"({time.perf_counter() - t0:.2f}s)")
+            if bad:
+                sys.exit(1)
+        else:
+            print(usage)
+            sys.exit(1)
+
+
+# -------------------------------------------------
+# Dumps vergleichen ('diff', siehe ds2506_diff.py)
+#
+#   diff A B [--json]                  zwei Dumps: geänderte Pages/Bytes,
+#                                      WP/CP, Gerätenummer, Zulassung
+#   diff A SAMMLUNG [--top K] [--json] ein Dump gegen alle in SAMMLUNG,
+#                                      die ähnlichsten zuerst
+#   diff SAMMLUNG --matrix [--min J] [--top K] [--out DIR]
+#                                      alle gegen alle (Page-Hash-Jaccard),
+#                                      Paare als similar_pairs.json/.csv
+#
+# Ein Dump ist ein *binary.bin (mit *status.bin daneben) oder ARCHIV#NR,
+# eine Sammlung ein Ordner oder eine Archivdatei. 1:N und N x N brauchen
+# NumPy.
+DIFF_PAIR_FIELDS = ["a", "b", "a_name", "b_name", "jaccard", "shared_pages"]
+
+
+def diff_sources(spec):
+    # -> Einträge wie bei find_dump_pairs / find_archive_records
+    path, _, number = spec.rpartition("#")
+    if path and number.isdigit() and os.path.isfile(path):
+        pairs = find_archive_records(path)
+        if int(number) >= len(pairs):
+            raise ValueError(f"{path}: kein Record {number} ({len(pairs)} Records)")
+        return [pairs[int(number)]]
+    if os.path.isdir(spec):
+        return find_dump_pairs(spec)
+    if os.path.isfile(spec) and spec.endswith("binary.bin"):
+        directory, name = os.path.split(spec)
+        stem = name[:-len("binary.bin")]
+        status = os.path.join(directory, stem + "status.bin")
+        return [{
+            "stem": stem,
+            "dir": directory,
+            "binary": spec,
+            "status": status if os.path.isfile(status) else None,
+            "old_report": None,
+        }]
+    if os.path.isfile(spec):
+        return find_archive_records(spec)
+    raise ValueError(f"{spec}: weder Dump noch Ordner noch Archivdatei")
+
+
+def load_diff_dumps(pairs, records):
+    # -> [(Name, Data, Status)]; Archiv-Records landen in records (release!)
+    dumps = []
+    for pair in pairs:
+        name = pair["dir"] if pair.get("archive") else (pair["stem"].rstrip("_") or pair["binary"])
+        try:
+            analysis, record = load_dump_pair(pair)
+        except (OSError, ValueError) as e:
+            print(f"✗ {name}: {e}", file=sys.stderr)
+            continue
+        if record is not None:
+            records.append(record)
+        dumps.append((name, analysis.data, analysis.status))
+    return dumps
+
+
+def diff_one_to_one(a, b, as_json):
+    jaccard, shared = page_jaccard(a[1], b[1])
+    diff = diff_dumps(a[1], a[2], b[1], b[2], prefix_fields=decode_prefix_fields)
+    if as_json:
+        result = {"a": a[0], "b": b[0], "jaccard": round(jaccard, 4), "shared_pages": shared}
+        result.update(diff)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    print(f"A: {a[0]}")
+    print(f"B: {b[0]}")
+    print(f"Page-Hash-Jaccard: {jaccard:.3f} ({shared} gemeinsame Pages)")
+    for line in format_diff(diff):
+        print(line)
+
+
+def diff_one_to_many(a, dumps, top, as_json):
+    data = [a[1]] + [d for _name, d, _status in dumps]
+    rows = []
+    for _i, j, jaccard, shared in similar_pairs(data, top=top, rows=[0]):
+        name, b_data, b_status = dumps[j - 1]
+        diff = diff_dumps(a[1], a[2], b_data, b_status, prefix_fields=decode_prefix_fields)
+        rows.append({"b": name, "jaccard": round(jaccard, 4), "shared_pages": shared, **diff})
+    if as_json:
+        print(json.dumps({"a": a[0], "matches": rows}, ensure_ascii=False, indent=2))
+        return
+    print(f"{a[0]} gegen {len(dumps)} Dumps, die {len(rows)} ähnlichsten:")
+    print(f"  {'Jaccard':>7} {'gemeinsam':>9} {'geändert':>8} {'WP +/-':>7}  Name")
+    for row in rows:
+        wp = f"{len(row['wp']['added'])}/{len(row['wp']['removed'])}"
+        fields = "; ".join(
+            f"{FIELD_LABELS[k]} {old} -> {new}" for k, (old, new) in row["fields"].items()
+        )
+        print(f"  {row['jaccard']:7.3f} {row['shared_pages']:9d} {len(row['pages']):8d} {wp:>7}  "
+              f"{row['b']}" + (f"  ({fields})" if fields else ""))
+
+
+def diff_matrix(dumps, outdir, min_jaccard, top):
+    t0 = time.perf_counter()
+    names = [name for name, _data, _status in dumps]
+    rows = [
+        {"a": i, "b": j, "a_name": names[i], "b_name": names[j],
+         "jaccard": round(jaccard, 4), "shared_pages": shared}
+        for i, j, jaccard, shared in similar_pairs(
+            [data for _name, data, _status in dumps], min_jaccard, top)
+    ]
+    os.makedirs(outdir, exist_ok=True)
+    with open(os.path.join(outdir, "similar_pairs.json"), "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=1)
+    with open(os.path.join(outdir, "similar_pairs.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=DIFF_PAIR_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"{len(dumps)} Dumps, {len(rows)} Paare mit Jaccard >= {min_jaccard} "
+          f"({time.perf_counter() - t0:.1f}s) -> {outdir}/similar_pairs.json, .csv")
+
+
+def diff_main(args):
+    usage = ("Nutzung: python read_ds2506.py diff <a> <b> [--json] | "
+             "<a> <sammlung> [--top K] [--json] | "
+             "<sammlung> --matrix [--min J] [--top K] [--out DIR]")
+    options = {"--top": None, "--min": "0.8", "--out": "diff_out"}
+    flags = set()
+    rest = []
+    i = 0
+    while i < len(args):
+        if args[i] in options and i + 1 < len(args):
+            options[args[i]] = args[i + 1]
+            i += 2
+            continue
+        if args[i] in ("--json", "--matrix"):
+            flags.add(args[i])
+        else:
+            rest.append(args[i])
+        i += 1
+
+    records = []
+    try:
+        top = int(options["--top"]) if options["--top"] else None
+        if "--matrix" in flags and len(rest) == 1:
+            dumps = load_diff_dumps(diff_sources(rest[0]), records)
+            diff_matrix(dumps, options["--out"], float(options["--min"]), top)
+        elif "--matrix" not in flags and len(rest) == 2:
+            a = load_diff_dumps(diff_sources(rest[0]), records)
+            b = load_diff_dumps(diff_sources(rest[1]), records)
+            if len(a) != 1 or not b:
+                print(usage)
+                sys.exit(1)
+            if len(b) == 1:
+                diff_one_to_one(a[0], b[0], "--json" in flags)
+            else:
+                diff_one_to_many(a[0], b, top or 10, "--json" in flags)
+        else:
+            print(usage)
+            sys.exit(1)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Fehler: {e}")
+        sys.exit(1)
+    finally:
+        for record in records:
+            record.release()
+
+
 # -------------------------------------------------
 def main():
     if len(sys.argv) < 2:
         print("Nutzung:")
         print("  python read_ds2506_final.py COM7")
         print("  python read_ds2506_final.py /dev/ttyUSB0")
+        print("  python read_ds2506_final.py COM7 --reset   (Arduino beim Verbinden neu starten)")
+        print("  python read_ds2506_final.py COM7 --slow    (keine Baudraten-Aushandlung, 115200)")
+        print("  python read_ds2506_final.py fleet TAG /dev/ttyUSB* COM8 [--out DIR]")
+        print("        (alle Reader parallel auslesen, ein Ordner pro Gerät)")
+        print("  python read_ds2506_final.py watch COM7 [--interval S] [--pages 0-63] [--out DATEI]")
+        print("        (Gerät laufend abfragen, Page-/Status-Änderungen als JSON-Zeilen)")
+        print("  python read_ds2506_final.py analyze ARCHIV [--out DIR | --inplace] [--jobs N]")
+        print("        (gespeicherte Dumps offline neu auswerten, ohne Port)")
+        print("  python read_ds2506_final.py emucheck ARCHIV [--out DIR] [--jobs N]")
+        print("        (würde der Emulator jeden Dump bitgenau liefern? Python-Modell, ohne Arduino)")
+        print("  python read_ds2506_final.py store DIR import|list|export|stats ...")
+        print("        (Page-deduplizierter Dump-Speicher)")
+        print("  python read_ds2506_final.py index DB build|query|same|groups ...")
+        print("        (SQLite-Index: Suche nach ROM, Gerätenummer, Zulassung, Page-Belegung)")
+        print("  python read_ds2506_final.py COM7 --index DB  (saveall trägt in den Index ein)")
+        print("  python read_ds2506_final.py COM7 --metrics BASIS")
+        print("        (Phasen-Messung am Ende als BASIS.jsonl + BASIS.prom)")
+        print("  python read_ds2506_final.py archive DATEI pack|list|extract|verify ...")
+        print("        (viele Dumps in einer Archivdatei; analyze DATEI wertet sie aus)")
+        print("  python read_ds2506_final.py diff A B | A SAMMLUNG | SAMMLUNG --matrix ...")
+        print("        (Dumps vergleichen: Pages, WP/CP, Gerät/Zulassung; Ähnlichkeit N x N)")
         print()
         print("DS2506/DS2433 Reader (8KB)")
         sys.exit(1)
 
+    if sys.argv[1] == "fleet":
+        fleet_main(sys.argv[2:])
+        return
+    if sys.argv[1] == "watch":
+        watch_main(sys.argv[2:])
+        return
+    if sys.argv[1] == "analyze":
+        analyze_main(sys.argv[2:])
+        return
+    if sys.argv[1] == "emucheck":
+        emucheck_main(sys.argv[2:])
+        return
+    if sys.argv[1] == "store":
+        store_main(sys.argv[2:])
+        return
+    if sys.argv[1] == "index":
+        index_main(sys.argv[2:])
+        return
+    if sys.argv[1] == "archive":
+        archive_main(sys.argv[2:])
+        return
+    if sys.argv[1] == "diff":
+        diff_main(sys.argv[2:])
+        return
+
     port = sys.argv[1]
-    reader = DS2506Reader(port)
+    fast = () if "--slow" in sys.argv[2:] else FAST_BAUDRATES
+    reader = DS2506Reader(port, fast_baudrates=fast)
+
+    index = None
+    if "--index" in sys.argv[2:-1]:
+        index = DumpIndex(sys.argv[sys.argv.index("--index") + 1])
 
-    if not reader.connect():
+    if not reader.connect(reset="--reset" in sys.argv[2:]):
         sys.exit(1)
 
     try:
-        interactive_mode(reader)
+        interactive_mode(reader, index)
     finally:
+        reader.session_summary()
         reader.disconnect()
+        if index is not None:
+            index.close()
+        if "--metrics" in sys.argv[2:-1]:
+            base = sys.argv[sys.argv.index("--metrics") + 1]
+            reader.metrics.write_jsonl(base + ".jsonl")
+            write_prometheus(base + ".prom", [reader.metrics])
+            print(f"✓ Messwerte: {base}.jsonl, {base}.prom")
 
 
 if __name__ == "__main__":